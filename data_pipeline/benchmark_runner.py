@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Build and run the generated micro-benchmarks (zlib/benchmarks/bench_<module>_<function>.c).
+
+The /zlib build carries Mull and coverage instrumentation, so benchmarks are built in a
+separate, uninstrumented -O2 copy of the tree inside the container. Each benchmark runs
+pinned to one CPU; its `BENCH key=value ...` lines are appended to benchmark_results.txt.
+With profile_allocations, each benchmark is rebuilt with the counting allocator of
+harness/alloc_profile.c after the timed run and its zlib heap usage is recorded as well.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from test_container_one_mull import (
+    SCRIPT_DIR, CPU_POOL, install_harness_files, start_container, stop_container, run_in_container,
+    parse_alloc_profile, append_alloc_profile
+)
+
+BENCH_BUILD_DIR = "/tmp/zlib-bench"
+BENCH_CFLAGS = "-O2"
+BENCH_TIMEOUT = 120  # seconds per benchmark binary
+BENCH_RESULTS_FILE = "benchmark_results.txt"
+BENCH_FIELDS = ("case", "bytes", "calls", "ns_per_call", "mb_per_s")
+BENCH_LINE_PATTERN = re.compile(r'^BENCH\s+(.*)$', re.MULTILINE)
+
+BENCH_PROGS = ["adler32", "crc32", "deflate", "inflate", "compress", "uncompr"]
+
+
+def prepare_bench_build():
+    """Copy /zlib to BENCH_BUILD_DIR in the container and build an uninstrumented libz.a there."""
+    print(f"  Preparing uninstrumented build in {BENCH_BUILD_DIR} (CFLAGS={BENCH_CFLAGS})...")
+    cmd = (f"rm -rf {BENCH_BUILD_DIR} && mkdir -p {BENCH_BUILD_DIR} && "
+           f"rsync -a --exclude '*.o' --exclude '*.a' --exclude 'tests_*' --exclude mull-reports "
+           f"/zlib/ {BENCH_BUILD_DIR}/ && cd {BENCH_BUILD_DIR} && "
+           f"(make distclean > /dev/null 2>&1 || true) && "
+           f"CC=clang-14 CFLAGS='{BENCH_CFLAGS}' ./configure --static > /dev/null && make -j$(nproc) libz.a")
+    r = run_in_container(cmd, show_output=False, timeout=600)
+    if r.returncode != 0:
+        print(f"  ✗ Uninstrumented build failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    print("  ✓ Uninstrumented libz.a built")
+    return True
+
+
+def parse_bench_output(stdout):
+    """Parse `BENCH case=... bytes=... calls=... ns_per_call=... mb_per_s=...` lines into dicts."""
+    records = []
+    for m in BENCH_LINE_PATTERN.finditer(stdout or ""):
+        fields = dict(pair.split("=", 1) for pair in m.group(1).split() if "=" in pair)
+        if "case" not in fields:
+            continue
+        record = {"case": fields["case"]}
+        for key in BENCH_FIELDS[1:]:
+            convert = int if key in ("bytes", "calls") else float
+            try:
+                record[key] = convert(float(fields[key]))
+            except (KeyError, ValueError):
+                record[key] = None
+        records.append(record)
+    return records
+
+
+def run_benchmark(bench_name):
+    """Build and run one benchmark in the uninstrumented tree. Returns (ok, records, output)."""
+    # timed binaries never carry the counting allocator, even if the container enables it
+    r = run_in_container(f"make -C {BENCH_BUILD_DIR} ALLOC_PROFILE= {bench_name}", show_output=False, timeout=300)
+    if r.returncode != 0:
+        print(f"  ✗ Build failed for {bench_name}")
+        return False, [], r.stdout or ""
+    with CPU_POOL.pinned(1) as cpus:
+        r = run_in_container(f"{BENCH_BUILD_DIR}/{bench_name}", show_output=False, timeout=BENCH_TIMEOUT, cpus=cpus)
+    records = parse_bench_output(r.stdout)
+    if r.returncode != 0 or not records:
+        print(f"  ✗ {bench_name} failed or reported no results (return code {r.returncode})")
+        return False, records, r.stdout or ""
+    for record in records:
+        print(f"    {record['case']}: {record['ns_per_call']} ns/call, {record['mb_per_s']} MB/s")
+    return True, records, r.stdout or ""
+
+
+def profile_benchmark_allocations(bench_name):
+    """Rebuild one benchmark with the counting allocator, run it once and return its ALLOC records."""
+    binary = f"{BENCH_BUILD_DIR}/{bench_name}"
+    r = run_in_container(f"rm -f {binary} && make -C {BENCH_BUILD_DIR} ALLOC_PROFILE=1 {bench_name} > /dev/null && "
+                         f"{binary}; rc=$?; rm -f {binary}; exit $rc",
+                         show_output=False, timeout=BENCH_TIMEOUT + 300)
+    records = parse_alloc_profile(r.stdout)
+    if r.returncode != 0 or not records:
+        print(f"  ✗ Allocation profile of {bench_name} failed (return code {r.returncode})")
+        return []
+    total = records[-1]
+    print(f"    zlib heap: {total['allocs']} allocations, peak {total['peak_bytes'] / 1024:.1f} KiB")
+    return records
+
+
+def run_benchmarks_for_one_zlib_program(program_name, HOST_ZLIB_PATH=None, prepared=False, profile_allocations=False):
+    """
+    Run every generated benchmark of a module (from injectable_functions/<program>_benchmarks.json)
+    and append the results to BENCH_RESULTS_FILE. Returns the list of result records.
+    profile_allocations also records each benchmark's zlib heap usage in ALLOC_RESULTS_FILE.
+    """
+    HOST_ZLIB_PATH = HOST_ZLIB_PATH or os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+    benchmarks_json = os.path.join(HOST_ZLIB_PATH, 'injectable_functions', f"{program_name}_benchmarks.json")
+    if not os.path.exists(benchmarks_json):
+        print(f"No benchmarks JSON found: {benchmarks_json}")
+        return []
+    with open(benchmarks_json, 'r', encoding='utf-8') as f:
+        benchmarks = [b for b in json.load(f) if b.get("bench_filename")]
+
+    if not prepared and not prepare_bench_build():
+        return []
+
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    results = []
+    for bench in benchmarks:
+        bench_name = bench["bench_filename"].split(".")[0]
+        print(f"\n  Benchmark: {bench_name}")
+        ok, records, _ = run_benchmark(bench_name)
+        if profile_allocations:
+            append_alloc_profile("bench", program_name, bench["function_name"],
+                                 profile_benchmark_allocations(bench_name))
+        for record in records:
+            results.append({"program_name": program_name, "function_name": bench["function_name"],
+                            "timestamp": timestamp, "ok": ok, **record})
+
+    header_needed = not os.path.exists(BENCH_RESULTS_FILE)
+    with open(BENCH_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("timestamp,program_name,function_name,case,bytes,calls,ns_per_call,mb_per_s\n")
+        for r in results:
+            f.write(f"{r['timestamp']},{r['program_name']},{r['function_name']},{r['case']},"
+                    f"{r['bytes']},{r['calls']},{r['ns_per_call']},{r['mb_per_s']}\n")
+    print(f"  ✓ {len(results)} benchmark results for {program_name} appended to {BENCH_RESULTS_FILE}")
+    return results
+
+
+if __name__ == "__main__":
+    # the harness files are installed into a temporary copy, never into the zlib checkout
+    temp_dir = tempfile.mkdtemp(prefix='zlib_tmp_')
+    HOST_ZLIB_PATH = os.path.join(temp_dir, 'zlib')
+    shutil.copytree(os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib')), HOST_ZLIB_PATH, symlinks=True)
+    try:
+        install_harness_files(HOST_ZLIB_PATH)
+        if not start_container(HOST_ZLIB_PATH):
+            raise SystemExit("Failed to start container")
+        try:
+            if prepare_bench_build():
+                for program_name in BENCH_PROGS:
+                    print(f"\n{'='*70}\nBenchmarks for {program_name}\n{'='*70}")
+                    run_benchmarks_for_one_zlib_program(program_name, HOST_ZLIB_PATH, prepared=True)
+        finally:
+            stop_container()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Best-of-N test generation.
+
+GPT-5 samples at temperature 1.0, so two requests for the same function can give one suite that
+does not build and another that kills most mutants. For each function of a module this draws N
+candidate suites (concurrent requests, DSPy's response cache off), then evaluates them together
+in the container:
+
+- every candidate is prechecked on the host and all of them are built with one `make -jN -k`
+  against the module source with only the function's own wrapper injected, as the per-function
+  pipeline builds it (a candidate calling another function's test_ wrapper does not build)
+- the built candidates are run and scored with the "quick" mutation profile concurrently
+  (test runs are pinned to one CPU each, Mull runs share the CPU pool)
+- the best candidate (passing, then quick mutation score, then killed mutants) becomes
+  zlib/tests/tests_<module>_<function>.c (copied back with the run's results) and is listed
+  in the module's injectable JSON
+
+A token budget (prompt + completion tokens over the whole run) caps generation: N is reduced
+for the remaining functions once the average cost per candidate says the budget cannot cover
+N more, and functions left when it is spent get no tests. Usage is 0 in replay mode.
+One row per function is appended to best_of_n_results.txt; candidate logs and Mull outputs
+are copied back to zlib/mull-reports/.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tree_sitter import Language, Parser
+import tree_sitter_c as tsc
+
+from precheck_tests import precheck_test_file
+from test_container_one_mull import (
+    SCRIPT_DIR, append_log, build_programs_batch, copy_results_back, install_harness_files, log_tail, mutation_settings, new_result_entry, run_built_function, start_container,
+    stop_container, write_host_file, write_mull_config
+)
+from test_gpt5_generation import (
+    LLM_ARCHIVE_PATH, LLM_MODE, create_global_wrapper_functions, generate_unity_tests_with_llm, get_function_info,
+    initialize_llm, llm_history_length, llm_usage_since
+)
+
+BEST_OF_N = int(os.environ.get("BEST_OF_N", "4"))  # candidates per function
+TOKEN_BUDGET = int(os.environ["LLM_TOKEN_BUDGET"]) if os.environ.get("LLM_TOKEN_BUDGET") else None  # None: unlimited
+CANDIDATE_WORKERS = 4   # concurrent LLM requests and candidate evaluations
+SCORING_PROFILE = "quick"
+BEST_OF_N_RESULTS_FILE = "best_of_n_results.txt"
+
+RESULT_COLUMNS = ("program_name", "function_name", "candidates", "built", "passed", "best_candidate",
+                  "best_score", "scores", "tokens")
+
+
+def candidate_rank(entry):
+    """Sort key of an evaluated candidate; higher is better."""
+    passed_cases = sum(1 for c in entry["test_cases"] if c["status"] == "PASS")
+    return (entry["test"], entry["mull_score"] if entry["mull_score"] is not None else -1,
+            entry["mull_killed"], entry["build"], passed_cases)
+
+
+def generate_candidates(converter, module_name, module_code, function_signature, n):
+    """n independent test suites for one function (failed requests are dropped)."""
+    with ThreadPoolExecutor(max_workers=min(n, CANDIDATE_WORKERS)) as pool:
+        futures = [pool.submit(generate_unity_tests_with_llm, converter, module_name, module_code, function_signature)
+                   for _ in range(n)]
+        return [tests_c for tests_c in (f.result() for f in futures) if tests_c]
+
+
+def evaluate_candidates(program_name, function_name, candidates, module_code, HOST_ZLIB_PATH, build_jobs=None):
+    """
+    Precheck, build, run and quick-score the candidates of one function against module_code
+    (<program>.c with the function's own wrapper). Returns one result entry per candidate, in
+    candidate order.
+    """
+    write_host_file(os.path.join(HOST_ZLIB_PATH, f"{program_name}.c"), module_code)
+    base = re.sub(r'[^0-9a-zA-Z_]', '_', function_name)
+    targets = [f"tests_{program_name}_{base}_cand{k}" for k in range(1, len(candidates) + 1)]
+    entries, to_build = {}, []
+    for target, tests_c in zip(targets, candidates):
+        test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{target}.c")
+        write_host_file(test_path, tests_c)
+        prechecked, precheck_output = precheck_test_file(test_path, module_code, HOST_ZLIB_PATH)
+        if prechecked:
+            to_build.append(target)
+        else:
+            entries[target] = new_result_entry(target, test_filename=target, precheck=False,
+                                               build_output=log_tail(precheck_output),
+                                               log=append_log(HOST_ZLIB_PATH, target, "precheck", precheck_output))
+
+    builds = build_programs_batch(to_build, build_jobs)
+    mutation = mutation_settings(profile=SCORING_PROFILE)
+    with ThreadPoolExecutor(max_workers=CANDIDATE_WORKERS) as pool:
+        # the candidate target doubles as the function name, so each Mull output gets its own file
+        futures = {target: pool.submit(run_built_function, program_name, target, target, *builds[target],
+                                       HOST_ZLIB_PATH, True, True, mutation)
+                   for target in to_build}
+        for target, future in futures.items():
+            entries[target] = future.result()
+    # candidates must not be copied back to zlib/tests/ with the run's other test files
+    for target in targets:
+        os.remove(os.path.join(HOST_ZLIB_PATH, 'tests', f"{target}.c"))
+    return [entries[target] for target in targets]
+
+
+def tokens_used(history_start):
+    """Prompt + completion tokens of the LM requests made after history_start."""
+    usage = llm_usage_since(history_start)
+    return usage["prompt_tokens"] + usage["completion_tokens"]
+
+
+def append_results(rows):
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    header_needed = not os.path.exists(BEST_OF_N_RESULTS_FILE)
+    with open(BEST_OF_N_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("timestamp," + ",".join(RESULT_COLUMNS) + "\n")
+        for row in rows:
+            f.write(f"{timestamp}," + ",".join(str(row[c]) for c in RESULT_COLUMNS) + "\n")
+
+
+def best_of_n_for_one_zlib_program(program_name, n=BEST_OF_N, token_budget=TOKEN_BUDGET, llm_mode=LLM_MODE,
+                                   llm_archive_path=LLM_ARCHIVE_PATH, build_jobs=None, use_ccache=True):
+    """
+    Generate N candidate suites per function of <program_name>.c and keep the best one.
+    Returns the per-function result rows.
+    """
+    original_zlib_path = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+    src_c_path = os.path.join(original_zlib_path, f"{program_name}.c")
+    if not os.path.exists(src_c_path):
+        raise FileNotFoundError(f"Required source file does not exist: {src_c_path}")
+    injectable_dir = os.path.join(original_zlib_path, 'injectable_functions')
+    os.makedirs(injectable_dir, exist_ok=True)
+    injectable_json_path = os.path.join(injectable_dir, f"{program_name}_injectable_functions.json")
+
+    with open(src_c_path, 'r') as f:
+        original_code = f.read()
+    function_info = get_function_info(src_c_path, Parser(Language(tsc.language())))
+    # without the cache, repeating a request samples a new candidate instead of returning the first
+    converter = initialize_llm(llm_mode, llm_archive_path, cache=False)
+
+    temp_dir = tempfile.mkdtemp(prefix='zlib_tmp_')
+    HOST_ZLIB_PATH = os.path.join(temp_dir, 'zlib')
+    print(f"Creating temporary copy: {HOST_ZLIB_PATH}")
+    run_started = time.time()
+    shutil.copytree(original_zlib_path, HOST_ZLIB_PATH, symlinks=True)
+
+    history_start = llm_history_length()
+    candidates_drawn = 0
+    injectable_functions, rows = [], []
+    try:
+        install_harness_files(HOST_ZLIB_PATH)
+        if not start_container(HOST_ZLIB_PATH, use_ccache=use_ccache):
+            raise SystemExit("Failed to start container")
+        # candidates are scored on the quick profile, which the Mull frontend reads at compile time
+        write_mull_config(program_name, HOST_ZLIB_PATH, SCORING_PROFILE)
+
+        for i, func in enumerate(function_info, 1):
+            function_name = func['name']
+            used = tokens_used(history_start)
+            count = n
+            if token_budget is not None:
+                per_candidate = used / candidates_drawn if candidates_drawn else 0
+                remaining = token_budget - used
+                if remaining <= 0:
+                    print(f"\nToken budget of {token_budget} spent ({used} used); "
+                          f"{len(function_info) - i + 1} functions left without tests")
+                    break
+                if per_candidate:
+                    count = max(1, min(n, int(remaining // per_candidate)))
+            print("\n" + "-"*60)
+            print(f"[{i}/{len(function_info)}] {function_name}: {count} candidates "
+                  f"({used} tokens used{f' of {token_budget}' if token_budget is not None else ''})")
+
+            module_code = create_global_wrapper_functions(original_code, func['signature'])
+            candidates = generate_candidates(converter, program_name, module_code, func['signature'], count)
+            candidates_drawn += count
+            function_tokens = tokens_used(history_start) - used
+            entries = evaluate_candidates(program_name, function_name, candidates, module_code, HOST_ZLIB_PATH,
+                                          build_jobs) if candidates else []
+
+            test_filename = f"tests_{program_name}_{re.sub(r'[^0-9a-zA-Z_]', '_', function_name)}.c"
+            best = max(range(len(entries)), key=lambda k: candidate_rank(entries[k]), default=None)
+            if best is not None and entries[best]["build"]:
+                write_host_file(os.path.join(HOST_ZLIB_PATH, 'tests', test_filename), candidates[best])
+                score = entries[best]["mull_score"]
+                print(f"  ✓ Kept candidate {best + 1}/{len(entries)} for {function_name} "
+                      f"(test={'✓' if entries[best]['test'] else '✗'}, "
+                      f"{SCORING_PROFILE} mull_score={score if score is not None else 'N/A'})")
+            else:
+                best = None
+                print(f"  ✗ No candidate builds for {function_name}")
+
+            injectable_functions.append({
+                "function_name": function_name,
+                "function_signature": func['signature'],
+                "test_filename": test_filename if best is not None else None
+            })
+            with open(injectable_json_path, "w") as f:
+                json.dump(injectable_functions, f, indent=2)
+
+            rows.append({
+                "program_name": program_name,
+                "function_name": function_name,
+                "candidates": len(entries),
+                "built": sum(1 for e in entries if e["build"]),
+                "passed": sum(1 for e in entries if e["test"]),
+                "best_candidate": best + 1 if best is not None else "N/A",
+                "best_score": (entries[best]["mull_score"] if best is not None
+                               and entries[best]["mull_score"] is not None else "N/A"),
+                "scores": "|".join(str(e["mull_score"]) if e["mull_score"] is not None else "-" for e in entries),
+                "tokens": function_tokens,
+            })
+    finally:
+        stop_container()
+        copy_results_back(HOST_ZLIB_PATH, original_zlib_path, since=run_started)
+        print(f"Removing temporary directory: {temp_dir}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    append_results(rows)
+    usage = llm_usage_since(history_start)
+    print("\n" + "="*40)
+    print(f"BEST-OF-{n} SUMMARY for {program_name}:")
+    print(f"  Functions with a kept suite: {sum(1 for r in rows if r['best_candidate'] != 'N/A')}/{len(function_info)}")
+    print(f"  Candidates: {sum(r['candidates'] for r in rows)} drawn, {sum(r['built'] for r in rows)} built, "
+          f"{sum(r['passed'] for r in rows)} passed")
+    print(f"  Tokens: {usage['prompt_tokens']} prompt ({usage['cached_tokens']} cached), "
+          f"{usage['completion_tokens']} completion")
+    print("="*40)
+    return rows
+
+
+if __name__ == "__main__":
+    program_name = "trees"  # change as needed
+    best_of_n_for_one_zlib_program(program_name)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Drop-in implementation comparison (e.g. zlib-ng in zlib-compat mode).
+
+Builds the reference zlib (the uninstrumented -O2 copy from benchmark_runner.py) and an
+alternative zlib-API source tree side by side in the container, then builds every generated
+Unity suite and micro-benchmark against both libraries and runs them:
+
+- behavioral mismatches: test cases whose Unity status differs between the two builds, and
+  suites that only build or only run cleanly against one of them
+- speed: ns/call of each benchmark case on both builds and the speedup of the alternative
+
+Tests of `local` functions call the test_<name> wrappers injected into the reference source
+and tests that include zlib's internal headers depend on its private structures; neither can
+be built against another implementation, so they are reported as not applicable.
+Results are appended to compat_results.txt and compat_bench_results.txt.
+"""
+
+import json
+import os
+import re
+import time
+
+from benchmark_runner import BENCH_BUILD_DIR, BENCH_CFLAGS, BENCH_PROGS, prepare_bench_build, parse_bench_output
+from test_container_one_mull import (
+    SCRIPT_DIR, CPU_POOL, TEST_MEMORY_MB, start_container, stop_container, run_in_container, parse_unity_results
+)
+
+HOST_ZLIB_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+ALT_NAME = "zlib-ng"
+ALT_ZLIB_PATH = None                # host path of the alternative source tree
+ALT_MOUNT = "/alt-src"
+ALT_BUILD_DIR = "/tmp/zlib-alt"
+# run in a copy of the alternative tree; must leave a static libz.a with the zlib API in its top directory
+ALT_BUILD_COMMAND = (f"CC=clang-14 CFLAGS='{BENCH_CFLAGS}' ./configure --zlib-compat --static > /dev/null && "
+                     f"make -j$(nproc) libz.a")
+COMPAT_UNITY_OBJECT = "/tmp/unity_compat.o"
+COMPAT_BIN_DIR = "/tmp/compat-bin"
+COMPAT_RESULTS_FILE = "compat_results.txt"
+COMPAT_BENCH_RESULTS_FILE = "compat_bench_results.txt"
+COMPAT_TIMEOUT = 120  # seconds per test or benchmark run
+
+# headers of the reference implementation's internals, absent or different in other implementations
+INTERNAL_HEADERS = ("zutil.h", "deflate.h", "inflate.h", "inftrees.h", "inffast.h", "trees.h", "crc32.h", "gzguts.h")
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
+
+RESULT_COLUMNS = ("program_name", "function_name", "status", "ref_passed", "alt_passed", "cases", "mismatched_cases")
+
+
+def not_applicable_reason(func, test_code):
+    """Why a generated test cannot run against another implementation, or None if it can."""
+    signature = func.get("function_signature", "")
+    if "ZEXPORT" not in signature or signature.startswith("local"):
+        return "not a public zlib function"
+    if re.search(rf'\btest_{re.escape(func["function_name"])}\s*\(', test_code):
+        return "calls an injected test_ wrapper"
+    internal = [h for h in INCLUDE_PATTERN.findall(test_code) if os.path.basename(h) in INTERNAL_HEADERS]
+    if internal:
+        return f"includes internal headers ({', '.join(internal)})"
+    return None
+
+
+def prepare_builds():
+    """Build the reference and the alternative libz.a and a timed Unity object in the container."""
+    if not prepare_bench_build():
+        return False
+    print(f"  Building {ALT_NAME} in {ALT_BUILD_DIR}...")
+    cmd = (f"rm -rf {ALT_BUILD_DIR} && mkdir -p {ALT_BUILD_DIR} && rsync -a {ALT_MOUNT}/ {ALT_BUILD_DIR}/ && "
+           f"cd {ALT_BUILD_DIR} && {ALT_BUILD_COMMAND}")
+    r = run_in_container(cmd, show_output=False, timeout=900)
+    if r.returncode != 0:
+        print(f"  ✗ {ALT_NAME} build failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    r = run_in_container(f"mkdir -p {COMPAT_BIN_DIR} && clang-14 -c {BENCH_CFLAGS} -DUNITY_INCLUDE_EXEC_TIME "
+                         f"-Iunity -o {COMPAT_UNITY_OBJECT} unity/unity.c", show_output=False, timeout=120)
+    if r.returncode != 0:
+        print(f"  ✗ Building Unity failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    print(f"  ✓ Reference and {ALT_NAME} libraries built")
+    return True
+
+
+def build_against(source, build_dir, output, extra_objects=""):
+    """Compile one test or benchmark source against the libz.a and zlib.h in build_dir."""
+    # build_dir first, so its zlib.h/zconf.h win over the ones in /zlib (which only provides unity/)
+    r = run_in_container(f"clang-14 {BENCH_CFLAGS} -DUNITY_INCLUDE_EXEC_TIME -I{build_dir} -I/zlib "
+                         f"-o {COMPAT_BIN_DIR}/{output} {source} {extra_objects} {build_dir}/libz.a",
+                         show_output=False, timeout=300)
+    return r.returncode == 0, r.stdout or ""
+
+
+def run_binary(output):
+    with CPU_POOL.pinned(1) as cpus:
+        return run_in_container(f"{COMPAT_BIN_DIR}/{output}", show_output=False, timeout=COMPAT_TIMEOUT,
+                                cpus=cpus, memory_mb=TEST_MEMORY_MB)
+
+
+def run_suite(test_filename, build_dir, suffix):
+    """Build and run one Unity suite against build_dir; returns (built, passed, {case: status})."""
+    output = f"{test_filename[:-2]}_{suffix}"
+    built, _ = build_against(f"/zlib/tests/{test_filename}", build_dir, output, COMPAT_UNITY_OBJECT)
+    if not built:
+        return False, False, {}
+    r = run_binary(output)
+    cases = {c["name"]: c["status"] for c in parse_unity_results(r.stdout)}
+    passed = r.returncode == 0 and "FAIL" not in cases.values()
+    return True, passed, cases
+
+
+def compare_suite(program_name, func):
+    """Run one function's suite against both builds; returns a result record."""
+    test_filename = func["test_filename"]
+    record = {"program_name": program_name, "function_name": func["function_name"], "ref_passed": None,
+              "alt_passed": None, "cases": 0, "mismatched_cases": ""}
+    with open(os.path.join(HOST_ZLIB_PATH, "tests", test_filename), 'r', encoding='utf-8') as f:
+        reason = not_applicable_reason(func, f.read())
+    if reason:
+        print(f"  - {func['function_name']}: not applicable ({reason})")
+        return {**record, "status": "not_applicable"}
+
+    ref_built, ref_passed, ref_cases = run_suite(test_filename, BENCH_BUILD_DIR, "ref")
+    if not ref_built:
+        print(f"  - {func['function_name']}: does not build against the reference")
+        return {**record, "status": "ref_build_failed"}
+    alt_built, alt_passed, alt_cases = run_suite(test_filename, ALT_BUILD_DIR, "alt")
+    record.update(ref_passed=ref_passed, alt_passed=alt_passed if alt_built else None, cases=len(ref_cases))
+    if not alt_built:
+        print(f"  ✗ {func['function_name']}: does not build against {ALT_NAME}")
+        return {**record, "status": "alt_build_failed"}
+
+    mismatched = sorted(name for name in set(ref_cases) | set(alt_cases)
+                        if ref_cases.get(name) != alt_cases.get(name))
+    record["mismatched_cases"] = ";".join(f"{name}:{ref_cases.get(name, 'missing')}->{alt_cases.get(name, 'missing')}"
+                                          for name in mismatched)
+    if mismatched or ref_passed != alt_passed:
+        print(f"  ✗ {func['function_name']}: {len(mismatched)} mismatched case(s)"
+              + (f", suite {'passes' if ref_passed else 'fails'} on reference but "
+                 f"{'passes' if alt_passed else 'fails'} on {ALT_NAME}" if ref_passed != alt_passed else ""))
+        for name in mismatched:
+            print(f"      {name}: {ref_cases.get(name, 'missing')} -> {alt_cases.get(name, 'missing')}")
+        return {**record, "status": "mismatch"}
+    print(f"  ✓ {func['function_name']}: {len(ref_cases)} case(s) agree")
+    return {**record, "status": "match"}
+
+
+def compare_benchmark(program_name, bench):
+    """Run one benchmark against both builds; returns one record per case present in both."""
+    bench_name = bench["bench_filename"].split(".")[0]
+    source = f"/zlib/benchmarks/{bench['bench_filename']}"
+    results = {}
+    for suffix, build_dir in (("ref", BENCH_BUILD_DIR), ("alt", ALT_BUILD_DIR)):
+        built, _ = build_against(source, build_dir, f"{bench_name}_{suffix}")
+        if not built:
+            print(f"  ✗ {bench_name} does not build against {ALT_NAME if suffix == 'alt' else 'the reference'}")
+            return []
+        r = run_binary(f"{bench_name}_{suffix}")
+        if r.returncode != 0:
+            print(f"  ✗ {bench_name}_{suffix} failed (return code {r.returncode})")
+            return []
+        results[suffix] = {record["case"]: record for record in parse_bench_output(r.stdout)}
+
+    records = []
+    for case, ref in results["ref"].items():
+        alt = results["alt"].get(case)
+        if alt is None or not ref["ns_per_call"] or not alt["ns_per_call"]:
+            continue
+        speedup = ref["ns_per_call"] / alt["ns_per_call"]
+        print(f"    {bench_name} {case}: {ref['ns_per_call']:.1f} vs {alt['ns_per_call']:.1f} ns/call ({speedup:.2f}x)")
+        records.append({"program_name": program_name, "function_name": bench["function_name"], "case": case,
+                        "ref_ns_per_call": ref["ns_per_call"], "alt_ns_per_call": alt["ns_per_call"],
+                        "speedup": round(speedup, 3)})
+    return records
+
+
+def load_injectable(program_name, suffix):
+    path = os.path.join(HOST_ZLIB_PATH, 'injectable_functions', f"{program_name}_{suffix}.json")
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def append_rows(path, columns, rows, timestamp):
+    header_needed = not os.path.exists(path)
+    with open(path, "a") as f:
+        if header_needed:
+            f.write("timestamp,implementation," + ",".join(columns) + "\n")
+        for row in rows:
+            f.write(f"{timestamp},{ALT_NAME}," + ",".join(str(row[c]) for c in columns) + "\n")
+
+
+def compare_implementations(programs=BENCH_PROGS, run_benchmarks=True):
+    """
+    Run the generated suites (and benchmarks) of each module against the reference and the
+    alternative build. The container must be running with ALT_ZLIB_PATH mounted at ALT_MOUNT.
+    Returns (suite records, benchmark records).
+    """
+    if not prepare_builds():
+        return [], []
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    suites, benchmarks = [], []
+    for program_name in programs:
+        print(f"\n{'='*70}\n{program_name}: reference vs {ALT_NAME}\n{'='*70}")
+        for func in load_injectable(program_name, "injectable_functions"):
+            if func.get("test_filename"):
+                suites.append(compare_suite(program_name, func))
+        if run_benchmarks:
+            for bench in load_injectable(program_name, "benchmarks"):
+                if bench.get("bench_filename"):
+                    benchmarks.extend(compare_benchmark(program_name, bench))
+
+    counts = {}
+    for record in suites:
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+    print("\nSuites: " + ", ".join(f"{status} {n}" for status, n in sorted(counts.items())))
+    if benchmarks:
+        speedups = sorted(b["speedup"] for b in benchmarks)
+        print(f"Benchmarks: {len(benchmarks)} cases, median speedup of {ALT_NAME} "
+              f"{speedups[len(speedups) // 2]:.2f}x (min {speedups[0]:.2f}x, max {speedups[-1]:.2f}x)")
+    append_rows(COMPAT_RESULTS_FILE, RESULT_COLUMNS, suites, timestamp)
+    append_rows(COMPAT_BENCH_RESULTS_FILE, ("program_name", "function_name", "case", "ref_ns_per_call",
+                                            "alt_ns_per_call", "speedup"), benchmarks, timestamp)
+    print(f"  ✓ Results appended to {COMPAT_RESULTS_FILE} and {COMPAT_BENCH_RESULTS_FILE}")
+    return suites, benchmarks
+
+
+if __name__ == "__main__":
+    ALT_ZLIB_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..', 'zlib-ng'))
+    if not start_container(HOST_ZLIB_PATH, extra_volumes={ALT_ZLIB_PATH: ALT_MOUNT}):
+        raise SystemExit("Failed to start container")
+    try:
+        compare_implementations()
+    finally:
+        stop_container()
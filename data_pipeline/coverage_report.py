@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Source-based coverage of the generated suites.
+
+The instrumented build compiles with -fprofile-instr-generate -fcoverage-mapping, and run_tests
+writes one raw profile per test run to PROFILES_DIR in the container (<test>-<pid>.profraw).
+After a module's tests have run, the raw profiles of each suite are merged with
+llvm-profdata-14 (one merge per suite, in parallel), and the suites are merged into one
+module profile. llvm-cov-14 export then gives per-function execution counts, region coverage
+and line coverage (from the innermost code region of every line):
+
+- per function, from its own suite: stored in the function's result entry (`coverage`)
+- per function of <module>.c, from all of the module's suites together: which functions
+  the generated tests really exercise, including the ones without a suite of their own
+
+Both are written to mull-reports/coverage_<module>.json and one row per function is
+appended to coverage_results.txt.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from test_container_one_mull import CPU_POOL, PROFILES_DIR, run_in_container, write_host_file
+
+COVERAGE_DIR = "/tmp/coverage"  # in-container merged .profdata files
+COVERAGE_RESULTS_FILE = "coverage_results.txt"
+# drop the test harnesses, Unity and the pipeline's C support files from the export
+IGNORE_FILENAME_REGEX = "(tests|unity|harness)/"
+CODE_REGION = 0  # llvm-cov export region kind; expansion, skipped and gap regions are ignored
+
+RESULT_COLUMNS = ("program_name", "function_name", "has_suite", "count", "regions_covered", "regions",
+                  "lines_covered", "lines", "own_lines_covered", "own_lines")
+
+
+def merge_profiles(program_name, test_names, jobs):
+    """
+    Merge each suite's raw profiles into COVERAGE_DIR/<test>.profdata (in parallel) and all of
+    them into COVERAGE_DIR/<program>.profdata. Returns the names of the suites with a profile.
+    """
+    names = " ".join(test_names)
+    cmd = (f"rm -rf {COVERAGE_DIR} && mkdir -p {COVERAGE_DIR} && cd {PROFILES_DIR} && "
+           f"printf '%s\\n' {names} | xargs -P {jobs} -I{{}} sh -c "
+           f"'ls {{}}-*.profraw > /dev/null 2>&1 && "
+           f"llvm-profdata-14 merge -sparse -o {COVERAGE_DIR}/{{}}.profdata {{}}-*.profraw || true' && "
+           f"cd {COVERAGE_DIR} && ls *.profdata && "
+           f"llvm-profdata-14 merge -sparse -num-threads={jobs} -o {COVERAGE_DIR}/{program_name}.profdata "
+           f"tests_*.profdata")
+    r = run_in_container(cmd, show_output=False, timeout=600)
+    if r.returncode != 0:
+        print(f"  ✗ Merging profiles failed:\n{(r.stdout or '')[-1000:]}")
+        return []
+    merged = {line.strip()[:-len(".profdata")] for line in (r.stdout or "").splitlines()
+              if line.strip().endswith(".profdata")}
+    return [name for name in test_names if name in merged]
+
+
+def export_coverage(binary, profdata):
+    """llvm-cov export of one binary against a profile, as parsed JSON (None on failure)."""
+    with CPU_POOL.pinned(1) as cpus:
+        # stderr (hash-mismatch warnings for rebuilt binaries) would corrupt the JSON
+        r = run_in_container(f"llvm-cov-14 export -format=text -skip-expansions "
+                             f"-ignore-filename-regex='{IGNORE_FILENAME_REGEX}' -instr-profile={profdata} "
+                             f"{binary} 2> /dev/null", show_output=False, timeout=600, cpus=cpus)
+    if r.returncode != 0:
+        return None
+    try:
+        return json.loads(r.stdout)
+    except json.JSONDecodeError:
+        return None
+
+
+def function_coverage(export, source_file):
+    """
+    {function name: {count, regions_covered, regions, lines_covered, lines}} for the functions
+    defined in source_file. Static functions are exported as "<file>:<name>".
+    """
+    stats = {}
+    for data in (export or {}).get("data", []):
+        for func in data.get("functions", []):
+            filenames = func.get("filenames") or [""]
+            if os.path.basename(filenames[0]) != source_file:
+                continue
+            name = func["name"].split(":")[-1]
+            # [line_start, col_start, line_end, col_end, count, file_id, expanded_file_id, kind]
+            regions = [r for r in func.get("regions", []) if r[7] == CODE_REGION and r[5] == 0]
+            line_counts = {}
+            # regions nested in another start after it, so the innermost region's count wins per line
+            for r in sorted(regions, key=lambda r: (r[0], r[1])):
+                for line in range(r[0], r[2] + 1):
+                    line_counts[line] = r[4]
+            entry = {
+                "count": func.get("count", 0),
+                "regions_covered": sum(1 for r in regions if r[4] > 0),
+                "regions": len(regions),
+                "lines_covered": sum(1 for count in line_counts.values() if count > 0),
+                "lines": len(line_counts),
+            }
+            if name not in stats or entry["count"] > stats[name]["count"]:
+                stats[name] = entry
+    return stats
+
+
+def collect_coverage_for_program(program_name, HOST_ZLIB_PATH, results, jobs=None):
+    """
+    Merge the module's test profiles, join per-function coverage to the result entries
+    (entry["coverage"]) and write the module report. Returns {function: module-wide coverage}.
+    """
+    jobs = jobs or len(CPU_POOL.cpus)
+    source_file = f"{program_name}.c"
+    suites = {r["test_filename"]: r for r in results if r.get("build") and r.get("test_filename")}
+    print(f"\n  Collecting coverage of {len(suites)} suites for {program_name}...")
+    profiled = merge_profiles(program_name, list(suites), jobs)
+    if not profiled:
+        print("  ✗ No test profiles to report")
+        return {}
+
+    def own_coverage(test_name):
+        export = export_coverage(f"/zlib/{test_name}", f"{COVERAGE_DIR}/{test_name}.profdata")
+        return test_name, function_coverage(export, source_file).get(suites[test_name]["function"])
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for test_name, coverage in pool.map(own_coverage, profiled):
+            suites[test_name]["coverage"] = coverage
+
+    # every test binary links the whole library, so any of them maps the module's functions
+    module = function_coverage(export_coverage(f"/zlib/{profiled[0]}", f"{COVERAGE_DIR}/{program_name}.profdata"),
+                               source_file)
+    own = {r["function"]: r["coverage"] for r in suites.values()}
+    report = {name: {**stats, "has_suite": name in own, "own_suite": own.get(name)}
+              for name, stats in sorted(module.items()) if not name.startswith("test_")}
+    write_host_file(os.path.join(HOST_ZLIB_PATH, "mull-reports", f"coverage_{program_name}.json"),
+                    json.dumps(report, indent=2))
+
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    header_needed = not os.path.exists(COVERAGE_RESULTS_FILE)
+    with open(COVERAGE_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("timestamp," + ",".join(RESULT_COLUMNS) + "\n")
+        for name, stats in report.items():
+            own_stats = stats["own_suite"] or {}
+            row = {"program_name": program_name, "function_name": name, **stats,
+                   "own_lines_covered": own_stats.get("lines_covered", "N/A"),
+                   "own_lines": own_stats.get("lines", "N/A")}
+            f.write(f"{timestamp}," + ",".join(str(row[c]) for c in RESULT_COLUMNS) + "\n")
+
+    executed = [name for name, stats in report.items() if stats["count"] > 0]
+    lines = sum(stats["lines"] for stats in report.values())
+    covered = sum(stats["lines_covered"] for stats in report.values())
+    print(f"  ✓ {len(executed)}/{len(report)} functions of {source_file} executed, "
+          f"{covered}/{lines} lines ({100 * covered / lines if lines else 0:.1f}%) covered by the suites")
+    never = [name for name in report if name not in executed]
+    if never:
+        print(f"    never executed: {', '.join(never)}")
+    return report
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Corpus-driven deflate/inflate parameter matrix.
+
+Runs every combination of deflateInit2_ level / windowBits / memLevel / strategy (and optional
+deflateTune settings) over a generated corpus (harness/make_corpus.py) through
+harness/zlib_matrix_bench.c, built against the uninstrumented -O2 library from
+benchmark_runner.py. Reports compress/decompress MB/s, ratio and peak zlib memory as a table,
+and appends the rows to deflate_matrix_results.txt.
+"""
+
+import itertools
+import os
+import re
+import shutil
+import tempfile
+
+from benchmark_runner import BENCH_BUILD_DIR, prepare_bench_build
+from test_container_one_mull import (
+    SCRIPT_DIR, CPU_POOL, install_harness_files, start_container, stop_container, run_in_container
+)
+
+CORPUS_DIR = "/tmp/zlib-corpus"
+CORPUS_KINDS = ("text", "binary", "compressed", "repetitive")
+MATRIX_BINARY = f"{BENCH_BUILD_DIR}/zlib_matrix_bench"
+MATRIX_RESULTS_FILE = "deflate_matrix_results.txt"
+MATRIX_REPEATS = 3
+MATRIX_TIMEOUT = 3600  # seconds per combination; multi-GB corpora at level 9 are slow
+
+STRATEGIES = {"default": 0, "filtered": 1, "huffman_only": 2, "rle": 3, "fixed": 4}
+
+# deflateTune(good_length, max_lazy, nice_length, max_chain); None keeps the level's defaults
+MATRIX_DEFAULTS = {
+    "levels": [1, 6, 9],
+    "window_bits": [15, 12],
+    "mem_levels": [8, 9],
+    "strategies": ["default", "filtered", "rle"],
+    "tunes": [None, (4, 4, 16, 16), (32, 258, 258, 4096)],
+}
+
+MATRIX_LINE_PATTERN = re.compile(r'^MATRIX\s+(.*)$', re.MULTILINE)
+RESULT_COLUMNS = ("kind", "level", "window_bits", "mem_level", "strategy", "tune",
+                  "ratio", "comp_mb_s", "decomp_mb_s", "deflate_peak_bytes", "inflate_peak_bytes")
+
+
+def parse_size(text):
+    """'64M' -> 67108864; accepts K, M and G suffixes (same as harness/make_corpus.py)."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = str(text).strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def prepare_matrix(corpus_size, kinds, seed=0):
+    """Build the uninstrumented library and the matrix harness, and generate the corpus in the container."""
+    if not prepare_bench_build():
+        return False
+    r = run_in_container(f"clang-14 -O2 -I{BENCH_BUILD_DIR} -o {MATRIX_BINARY} harness/zlib_matrix_bench.c "
+                         f"{BENCH_BUILD_DIR}/libz.a", show_output=False, timeout=120)
+    if r.returncode != 0:
+        print(f"  ✗ Building the matrix harness failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    print(f"  Generating {len(kinds)} corpus files of {corpus_size} bytes in {CORPUS_DIR}...")
+    r = run_in_container(f"python3 harness/make_corpus.py --out {CORPUS_DIR} --size {corpus_size} "
+                         f"--kinds {','.join(kinds)} --seed {seed}", show_output=False,
+                         timeout=600 + corpus_size // (1024 * 1024) * len(kinds))
+    if r.returncode != 0:
+        print(f"  ✗ Corpus generation failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    print("  ✓ Matrix harness and corpus ready")
+    return True
+
+
+def parse_matrix_output(stdout):
+    """The key=value fields of the harness's MATRIX line as numbers, or None."""
+    m = MATRIX_LINE_PATTERN.search(stdout or "")
+    if not m:
+        return None
+    return {key: float(value) for key, value in (pair.split("=", 1) for pair in m.group(1).split())}
+
+
+def run_combination(corpus_file, level, window_bits, mem_level, strategy, tune, repeats=MATRIX_REPEATS):
+    """Run one parameter combination over one corpus file; returns the parsed MATRIX fields or None."""
+    args = [corpus_file, level, window_bits, mem_level, STRATEGIES[strategy], *(tune or ())]
+    with CPU_POOL.pinned(1) as cpus:
+        r = run_in_container(f"{MATRIX_BINARY} {' '.join(str(a) for a in args)} -r {repeats}",
+                             show_output=False, timeout=MATRIX_TIMEOUT, cpus=cpus)
+    fields = parse_matrix_output(r.stdout)
+    if r.returncode != 0 or fields is None:
+        print(f"  ✗ {os.path.basename(corpus_file)} {args[1:]} failed: {(r.stdout or '').strip()[-300:]}")
+        return None
+    return fields
+
+
+def format_table(rows):
+    """Fixed-width text table of the result rows."""
+    header = ("kind", "lvl", "wbits", "mem", "strategy", "tune", "ratio", "comp MB/s", "decomp MB/s", "deflate KiB")
+    lines = ["{:<11} {:>3} {:>5} {:>3} {:<12} {:<20} {:>8} {:>10} {:>11} {:>11}".format(*header)]
+    for row in rows:
+        lines.append("{:<11} {:>3} {:>5} {:>3} {:<12} {:<20} {:>8.3f} {:>10.1f} {:>11.1f} {:>11.0f}".format(
+            row["kind"], row["level"], row["window_bits"], row["mem_level"], row["strategy"], row["tune"],
+            row["ratio"], row["comp_mb_s"], row["decomp_mb_s"], row["deflate_peak_bytes"] / 1024))
+    return "\n".join(lines)
+
+
+def run_deflate_matrix(corpus_size="16M", kinds=CORPUS_KINDS, seed=0, repeats=MATRIX_REPEATS, **matrix):
+    """
+    Run the parameter matrix (MATRIX_DEFAULTS, overridable by keyword) over the corpus.
+    Prints a table, appends the rows to MATRIX_RESULTS_FILE and returns them.
+    """
+    settings = {**MATRIX_DEFAULTS, **matrix}
+    unknown = set(settings) - set(MATRIX_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown matrix settings: {sorted(unknown)}")
+    corpus_size = parse_size(corpus_size)
+    if not prepare_matrix(corpus_size, kinds, seed):
+        return []
+
+    combinations = list(itertools.product(settings["levels"], settings["window_bits"], settings["mem_levels"],
+                                          settings["strategies"], settings["tunes"]))
+    print(f"  Running {len(combinations)} combinations x {len(kinds)} corpus files...")
+    rows = []
+    for kind in kinds:
+        corpus_file = f"{CORPUS_DIR}/{kind}-{corpus_size}-s{seed}.bin"
+        for level, window_bits, mem_level, strategy, tune in combinations:
+            fields = run_combination(corpus_file, level, window_bits, mem_level, strategy, tune, repeats)
+            if fields is None:
+                continue
+            rows.append({
+                "kind": kind, "level": level, "window_bits": window_bits, "mem_level": mem_level,
+                "strategy": strategy, "tune": "/".join(str(t) for t in tune) if tune else "default",
+                "ratio": fields["ratio"], "comp_mb_s": fields["comp_mb_s"], "decomp_mb_s": fields["decomp_mb_s"],
+                "deflate_peak_bytes": int(fields["deflate_peak_bytes"]),
+                "inflate_peak_bytes": int(fields["inflate_peak_bytes"]),
+            })
+
+    print(format_table(rows))
+    header_needed = not os.path.exists(MATRIX_RESULTS_FILE)
+    with open(MATRIX_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("corpus_bytes,seed," + ",".join(RESULT_COLUMNS) + "\n")
+        for row in rows:
+            f.write(f"{corpus_size},{seed}," + ",".join(str(row[c]) for c in RESULT_COLUMNS) + "\n")
+    print(f"  ✓ {len(rows)} rows appended to {MATRIX_RESULTS_FILE}")
+    return rows
+
+
+if __name__ == "__main__":
+    corpus_size = "16M"  # per corpus kind; K/M/G suffixes, e.g. "2G"
+    # the harness files are installed into a temporary copy, never into the zlib checkout
+    temp_dir = tempfile.mkdtemp(prefix='zlib_tmp_')
+    HOST_ZLIB_PATH = os.path.join(temp_dir, 'zlib')
+    shutil.copytree(os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib')), HOST_ZLIB_PATH, symlinks=True)
+    try:
+        install_harness_files(HOST_ZLIB_PATH)
+        if not start_container(HOST_ZLIB_PATH):
+            raise SystemExit("Failed to start container")
+        try:
+            run_deflate_matrix(corpus_size)
+        finally:
+            stop_container()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
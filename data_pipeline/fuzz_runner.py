@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Build and run the generated libFuzzer harnesses (zlib/fuzz/fuzz_<module>_<function>.c).
+
+Harnesses are built against a separate copy of the tree compiled with ASan and libFuzzer's
+coverage instrumentation (FUZZ_BUILD_DIR in the container). Each corpus is seeded from the
+buffers the module's Unity tests use: byte-array initializers and string literals are extracted
+from tests/tests_<module>_*.c and written as they are and zlib-, gzip- and raw-deflate
+compressed, so harnesses that take compressed input get valid streams to mutate.
+
+Each harness then runs in libFuzzer's fork mode with one job per available CPU for
+FUZZ_SECONDS. Coverage (libFuzzer's `cov:` edge count) of the seeds alone and of the
+final corpus gives the new coverage found; exec/s and crash/timeout/OOM counts come from the
+last status line. Corpora and crash artifacts are kept in zlib/fuzz/corpus/ and
+zlib/fuzz/artifacts/, and a row per harness is appended to fuzz_results.txt.
+"""
+
+import ast
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+
+from test_container_one_mull import (
+    SCRIPT_DIR, CPU_POOL, start_container, stop_container, run_in_container
+)
+
+FUZZ_BUILD_DIR = "/tmp/zlib-fuzz"
+FUZZ_CFLAGS = "-O1 -g -fno-omit-frame-pointer -fsanitize=address,fuzzer-no-link"
+FUZZ_LDFLAGS = "-fsanitize=address,fuzzer"
+FUZZ_SECONDS = 60          # fuzzing time per harness
+FUZZ_MAX_LEN = 65536       # libFuzzer -max_len
+FUZZ_RSS_LIMIT_MB = 2048   # libFuzzer -rss_limit_mb per job
+FUZZ_RESULTS_FILE = "fuzz_results.txt"
+MIN_SEED_BYTES = 4         # shorter literals are format strings and flags, not test data
+MAX_SEEDS = 500            # per harness
+
+FUZZ_PROGS = ["adler32", "crc32", "compress", "uncompr", "deflate", "inflate", "gzread", "gzwrite"]
+
+# { 0x78, 0x9c, 1, 'a', ... } initializers of byte arrays
+BYTE_ARRAY_PATTERN = re.compile(r'\{\s*((?:(?:0[xX][0-9a-fA-F]+|\d+|\'(?:\\.|[^\'\\])\')\s*,\s*)+'
+                                r'(?:0[xX][0-9a-fA-F]+|\d+|\'(?:\\.|[^\'\\])\')?)\s*,?\s*\}')
+# one or more adjacent string literals (concatenated by the compiler)
+STRING_LITERAL_PATTERN = re.compile(r'(?:"(?:\\.|[^"\\\n])*"\s*)+')
+# libFuzzer -fork status lines (no colon after exec/s), e.g.
+#   "#1048576: cov: 812 ft: 2301 corp: 90 exec/s 3500 oom/timeout/crash: 0/0/0 time: 12s job: 7 dft_time: 0"
+FORK_STATUS_PATTERN = re.compile(r'^#(?P<execs>\d+):\s+cov: (?P<cov>\d+) ft: (?P<ft>\d+) corp: (?P<corp>\d+)\S*'
+                                 r'.*?exec/s:? (?P<exec_s>\d+) oom/timeout/crash: (?P<oom>\d+)/(?P<timeout>\d+)/'
+                                 r'(?P<crash>\d+)', re.MULTILINE)
+INITED_PATTERN = re.compile(r'INITED cov: (?P<cov>\d+) ft: (?P<ft>\d+)')
+
+RESULT_COLUMNS = ("program_name", "function_name", "seeds", "seed_cov", "final_cov", "new_cov", "seed_ft",
+                  "final_ft", "corpus", "execs", "exec_s", "crashes", "timeouts", "ooms")
+
+
+def decode_char(token):
+    """Value of a C integer or character constant from a byte-array initializer."""
+    if token.startswith("'"):
+        return ord(ast.literal_eval(token)) & 0xFF  # Python shares C's simple escapes and \x/\ooo
+    return int(token, 0) & 0xFF
+
+
+def decode_c_string(literals):
+    """Bytes of adjacent C string literals (without the terminating NUL)."""
+    data = b""
+    for literal in re.findall(r'"((?:\\.|[^"\\\n])*)"', literals):
+        try:
+            data += ast.literal_eval(f'b"{literal}"')
+        except (SyntaxError, ValueError):
+            data += literal.encode("latin-1", "replace")
+    return data
+
+
+def extract_seed_buffers(test_code):
+    """Distinct byte buffers (array initializers and string literals) used in a Unity test file."""
+    buffers = []
+    for m in BYTE_ARRAY_PATTERN.finditer(test_code):
+        tokens = re.findall(r"0[xX][0-9a-fA-F]+|\d+|'(?:\\.|[^'\\])'", m.group(1))
+        buffers.append(bytes(decode_char(t) for t in tokens))
+    for m in STRING_LITERAL_PATTERN.finditer(test_code):
+        data = decode_c_string(m.group(0))
+        if "%" in data.decode("latin-1") and len(data) < 64:
+            continue  # printf formats
+        buffers.append(data)
+    seen, unique = set(), []
+    for data in buffers:
+        if len(data) >= MIN_SEED_BYTES and data not in seen:
+            seen.add(data)
+            unique.append(data)
+    return unique
+
+
+def seed_variants(data):
+    """The buffer itself and its zlib, gzip and raw deflate encodings."""
+    raw = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return [data, zlib.compress(data), gzip.compress(data, mtime=0), raw.compress(data) + raw.flush()]
+
+
+def write_seeds(HOST_ZLIB_PATH, program_name, harness):
+    """Seed directory zlib/fuzz/seeds/<harness> from the module's Unity tests; returns the seed count."""
+    tests_dir = os.path.join(HOST_ZLIB_PATH, 'tests')
+    seed_dir = os.path.join(HOST_ZLIB_PATH, 'fuzz', 'seeds', harness)
+    os.makedirs(seed_dir, exist_ok=True)
+    seeds = set()
+    if os.path.isdir(tests_dir):
+        for filename in sorted(os.listdir(tests_dir)):
+            if not (filename.startswith(f"tests_{program_name}_") and filename.endswith(".c")):
+                continue
+            with open(os.path.join(tests_dir, filename), 'r', encoding='utf-8', errors='replace') as f:
+                for data in extract_seed_buffers(f.read()):
+                    seeds.update(v for v in seed_variants(data) if len(v) <= FUZZ_MAX_LEN)
+    for data in sorted(seeds, key=len)[:MAX_SEEDS]:
+        with open(os.path.join(seed_dir, f"seed-{hashlib.sha1(data).hexdigest()}"), 'wb') as f:
+            f.write(data)
+    return min(len(seeds), MAX_SEEDS)
+
+
+def prepare_fuzz_build():
+    """Copy /zlib to FUZZ_BUILD_DIR in the container and build an ASan + fuzzer-instrumented libz.a there."""
+    print(f"  Preparing fuzzing build in {FUZZ_BUILD_DIR}...")
+    cmd = (f"rm -rf {FUZZ_BUILD_DIR} && mkdir -p {FUZZ_BUILD_DIR} && "
+           f"rsync -a --exclude '*.o' --exclude '*.a' --exclude 'tests_*' --exclude mull-reports --exclude fuzz "
+           f"/zlib/ {FUZZ_BUILD_DIR}/ && cd {FUZZ_BUILD_DIR} && "
+           f"(make distclean > /dev/null 2>&1 || true) && "
+           f"CC=clang-14 CFLAGS='{FUZZ_CFLAGS}' ./configure --static > /dev/null && make -j$(nproc) libz.a")
+    r = run_in_container(cmd, show_output=False, timeout=600)
+    if r.returncode != 0:
+        print(f"  ✗ Fuzzing build failed:\n{(r.stdout or '')[-1000:]}")
+        return False
+    print("  ✓ Instrumented libz.a built")
+    return True
+
+
+def coverage_of(binary, *dirs):
+    """(cov, ft) after loading the inputs in dirs without fuzzing, or (None, None)."""
+    r = run_in_container(f"{binary} -runs=0 -max_len={FUZZ_MAX_LEN} -rss_limit_mb={FUZZ_RSS_LIMIT_MB} "
+                         + " ".join(dirs), show_output=False, timeout=600)
+    m = INITED_PATTERN.search(r.stdout or "")
+    return (int(m.group("cov")), int(m.group("ft"))) if m else (None, None)
+
+
+def run_fuzzer(program_name, fuzzer, seed_count, seconds=FUZZ_SECONDS):
+    """Build one harness, fuzz it in fork mode on all available CPUs and return a result record, or None."""
+    harness = fuzzer["fuzz_filename"][:-2]
+    binary = f"{FUZZ_BUILD_DIR}/{harness}"
+    corpus, seeds, artifacts = (f"/zlib/fuzz/{kind}/{harness}" for kind in ("corpus", "seeds", "artifacts"))
+    r = run_in_container(f"clang-14 {FUZZ_CFLAGS} {FUZZ_LDFLAGS} -I{FUZZ_BUILD_DIR} -o {binary} "
+                         f"/zlib/fuzz/{fuzzer['fuzz_filename']} {FUZZ_BUILD_DIR}/libz.a",
+                         show_output=False, timeout=300)
+    if r.returncode != 0:
+        print(f"  ✗ Build failed for {harness}:\n{(r.stdout or '')[-1000:]}")
+        return None
+    run_in_container(f"mkdir -p {corpus} {seeds} {artifacts}", show_output=False, timeout=60)
+
+    seed_cov, seed_ft = coverage_of(binary, seeds)
+    with CPU_POOL.pinned(len(CPU_POOL.cpus)) as cpus:
+        jobs = len(cpus.split(","))
+        print(f"  Fuzzing {harness} for {seconds}s with {jobs} jobs...")
+        # the first directory receives new inputs; crashes are kept and fuzzing goes on
+        r = run_in_container(f"{binary} -fork={jobs} -ignore_crashes=1 -ignore_timeouts=1 "
+                             f"-ignore_ooms=1 -max_total_time={seconds} -max_len={FUZZ_MAX_LEN} "
+                             f"-rss_limit_mb={FUZZ_RSS_LIMIT_MB} -artifact_prefix={artifacts}/ {corpus} {seeds}",
+                             show_output=False, timeout=seconds + 300, cpus=cpus)
+    statuses = list(FORK_STATUS_PATTERN.finditer(r.stdout or ""))
+    if not statuses:
+        print(f"  ✗ {harness} reported no fuzzing status (return code {r.returncode}):\n{(r.stdout or '')[-1000:]}")
+        return None
+    last = statuses[-1]
+    final_cov, final_ft = coverage_of(binary, corpus, seeds)
+    record = {
+        "program_name": program_name, "function_name": fuzzer["function_name"],
+        "seeds": seed_count,
+        "seed_cov": seed_cov, "final_cov": final_cov,
+        "new_cov": final_cov - seed_cov if None not in (seed_cov, final_cov) else None,
+        "seed_ft": seed_ft, "final_ft": final_ft, "corpus": int(last.group("corp")),
+        "execs": int(last.group("execs")), "exec_s": int(last.group("exec_s")),
+        "crashes": int(last.group("crash")), "timeouts": int(last.group("timeout")), "ooms": int(last.group("oom")),
+    }
+    mark = "✗" if record["crashes"] else "✓"
+    print(f"  {mark} {harness}: {record['exec_s']} exec/s, cov {seed_cov} -> {final_cov} "
+          f"(+{record['new_cov']}), {record['crashes']} crashes, {record['timeouts']} timeouts, "
+          f"{record['ooms']} OOMs")
+    return record
+
+
+def run_fuzzers_for_one_zlib_program(program_name, HOST_ZLIB_PATH=None, prepared=False, seconds=FUZZ_SECONDS):
+    """
+    Seed and run every generated fuzz harness of a module (from injectable_functions/<program>_fuzzers.json)
+    and append the results to FUZZ_RESULTS_FILE. Returns the list of result records.
+    """
+    HOST_ZLIB_PATH = HOST_ZLIB_PATH or os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+    fuzzers_json = os.path.join(HOST_ZLIB_PATH, 'injectable_functions', f"{program_name}_fuzzers.json")
+    if not os.path.exists(fuzzers_json):
+        print(f"No fuzzers JSON found: {fuzzers_json}")
+        return []
+    with open(fuzzers_json, 'r', encoding='utf-8') as f:
+        fuzzers = [z for z in json.load(f) if z.get("fuzz_filename")]
+
+    if not prepared and not prepare_fuzz_build():
+        return []
+
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    results = []
+    for fuzzer in fuzzers:
+        harness = fuzzer["fuzz_filename"][:-2]
+        seed_count = write_seeds(HOST_ZLIB_PATH, program_name, harness)
+        print(f"\n  Fuzz harness: {harness} ({seed_count} seeds)")
+        record = run_fuzzer(program_name, fuzzer, seed_count, seconds)
+        if record:
+            results.append({"timestamp": timestamp, **record})
+
+    header_needed = not os.path.exists(FUZZ_RESULTS_FILE)
+    with open(FUZZ_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("timestamp,seconds," + ",".join(RESULT_COLUMNS) + "\n")
+        for r in results:
+            f.write(f"{r['timestamp']},{seconds}," + ",".join(str(r[c]) for c in RESULT_COLUMNS) + "\n")
+    print(f"  ✓ {len(results)} fuzzing results for {program_name} appended to {FUZZ_RESULTS_FILE}")
+    return results
+
+
+if __name__ == "__main__":
+    HOST_ZLIB_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+    if not start_container(HOST_ZLIB_PATH):
+        raise SystemExit("Failed to start container")
+    try:
+        if prepare_fuzz_build():
+            for program_name in FUZZ_PROGS:
+                print(f"\n{'='*70}\nFuzzing {program_name}\n{'='*70}")
+                run_fuzzers_for_one_zlib_program(program_name, HOST_ZLIB_PATH, prepared=True)
+    finally:
+        stop_container()
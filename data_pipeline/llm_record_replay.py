@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Record/replay backend for the DSPy converters used by the generation pipeline.
+
+In "record" mode every request sent through a converter is forwarded to the live
+LLM and the response is appended to a gzip-compressed JSONL archive. In "replay"
+mode the same requests are answered from that archive without touching the network,
+so the build/mutation stages can be rerun deterministically and at full speed.
+
+Requests are keyed by the signature name plus a hash of the input fields. Identical
+requests issued several times in one run (e.g. retries or multiple candidates) are
+replayed in the order they were recorded.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+import dspy
+
+LLM_MODES = ("live", "record", "replay")
+
+
+def request_key(signature_name, inputs):
+    """Stable hash of a converter request (signature name + input fields)."""
+    payload = json.dumps({"signature": signature_name, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_archive(archive_path):
+    """Load an archive as {key: [outputs, ...]} preserving recording order."""
+    recorded = {}
+    if not archive_path or not os.path.exists(archive_path):
+        return recorded
+    with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            recorded.setdefault(entry["key"], []).append(entry["outputs"])
+    return recorded
+
+
+class RecordReplayConverter:
+    """
+    Wrap a DSPy module so its calls are recorded to / replayed from an archive.
+    In "live" mode the wrapper is a transparent pass-through.
+    """
+
+    def __init__(self, converter, signature_name, mode="live", archive_path=None):
+        if mode not in LLM_MODES:
+            raise ValueError(f"Unknown LLM mode '{mode}', expected one of {LLM_MODES}")
+        if mode != "live" and not archive_path:
+            raise ValueError(f"LLM mode '{mode}' requires an archive path")
+        self.converter = converter
+        self.signature_name = signature_name
+        self.mode = mode
+        self.archive_path = archive_path
+        self._recorded = load_archive(archive_path) if mode == "replay" else {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        key = request_key(self.signature_name, kwargs)
+        with self._lock:
+            occurrence = self._seen.get(key, 0)
+            self._seen[key] = occurrence + 1
+
+        if self.mode == "replay":
+            recorded = self._recorded.get(key, [])
+            if occurrence >= len(recorded):
+                raise LookupError(
+                    f"No recorded {self.signature_name} response #{occurrence + 1} in {self.archive_path}"
+                )
+            return dspy.Prediction(**recorded[occurrence])
+
+        result = self.converter(**kwargs)
+        if self.mode == "record":
+            self._append(key, kwargs, result)
+        return result
+
+    def _append(self, key, inputs, result):
+        """Append one request/response pair as a gzip member (keeps the file appendable)."""
+        entry = {
+            "key": key,
+            "signature": self.signature_name,
+            "module_name": inputs.get("module_name"),
+            "target": inputs.get("target_function_name"),
+            "outputs": result.toDict(),
+        }
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.archive_path)), exist_ok=True)
+            with gzip.open(self.archive_path, 'at', encoding='utf-8') as f:
+                f.write(line)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Redundant test-case minimization for generated Unity suites.
+
+Every RUN_TEST case of a passing suite is built as its own binary and run against the mutants
+the full suite kills. A greedy set cover then keeps the smallest set of cases that still kills
+all of them; cases that add no kills are dropped from main(). The reduced suite is rebuilt and
+verified to kill exactly the same mutants before it replaces the original file, so the mutation
+score is unchanged while every mutant execution runs fewer cases.
+"""
+
+import os
+import re
+import time
+
+from mull_mutants import REPORTS_DIR, list_mutants, execute_mutants
+from test_container_one_mull import build_program, build_programs_batch, run_tests, write_host_file
+
+RUN_TEST_PATTERN = r'^[ \t]*RUN_TEST\s*\(\s*(\w+)\s*\)\s*;[ \t]*$'
+
+
+def find_test_cases(tests_c):
+    """Names of the test cases run from main(), in order."""
+    return re.findall(RUN_TEST_PATTERN, tests_c, flags=re.MULTILINE)
+
+
+def keep_test_cases(tests_c, keep):
+    """Return tests_c with the RUN_TEST calls of every case not in keep commented out."""
+    def replace(m):
+        if m.group(1) in keep:
+            return m.group(0)
+        indent = m.group(0)[:len(m.group(0)) - len(m.group(0).lstrip())]
+        return f"{indent}/* {m.group(0).strip()} (removed by test minimization) */"
+    return re.sub(RUN_TEST_PATTERN, replace, tests_c, flags=re.MULTILINE)
+
+
+def greedy_cover(kills_by_case, required):
+    """Pick cases greedily until every mutant in required is killed; returns the chosen cases in order."""
+    remaining = set(required)
+    chosen = []
+    while remaining:
+        best = max(kills_by_case, key=lambda case: len(kills_by_case[case] & remaining))
+        gained = kills_by_case[best] & remaining
+        if not gained:
+            break
+        chosen.append(best)
+        remaining -= gained
+    return chosen
+
+
+def timed_execute(test_binary, mutant_ids, HOST_ZLIB_PATH, tag):
+    start = time.perf_counter()
+    statuses = execute_mutants(test_binary, mutant_ids, HOST_ZLIB_PATH, tag=tag)
+    return statuses, time.perf_counter() - start
+
+
+def minimize_test_cases(function_name, test_filename, HOST_ZLIB_PATH, build_jobs=None):
+    """
+    Minimize the RUN_TEST cases of tests/<test_filename>.c against the mutants it kills.
+    The suite must pass; its target is rebuilt first so that a file rewritten since the last
+    build (e.g. by mutant augmentation) is what the kills are taken from. Returns a summary
+    dict, or None if the suite was left unchanged.
+    """
+    test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{test_filename}.c")
+    with open(test_path, 'r', encoding='utf-8') as f:
+        tests_c = f.read()
+    cases = find_test_cases(tests_c)
+    if len(cases) < 2:
+        return None
+
+    # make is a no-op when the binary is already up to date with the test file
+    built, _ = build_program(test_filename)
+    if not built or not run_tests(test_filename)[0]:
+        print(f"  ✗ {test_filename} does not build/pass from its current source, skipping minimization")
+        return None
+
+    mutants = list_mutants(test_filename, HOST_ZLIB_PATH)
+    full_statuses, _ = timed_execute(test_filename, [m["mutant_id"] for m in mutants], HOST_ZLIB_PATH, "min_full")
+    killed = sorted(mutant_id for mutant_id, status in full_statuses.items() if status == "killed")
+    if not killed:
+        return None
+
+    # one binary per test case, built in a single parallel make
+    case_targets = {case: f"{test_filename}_case{i}" for i, case in enumerate(cases)}
+    for case, target in case_targets.items():
+        write_host_file(os.path.join(HOST_ZLIB_PATH, 'tests', f"{target}.c"), keep_test_cases(tests_c, {case}))
+    try:
+        builds = build_programs_batch(list(case_targets.values()), build_jobs)
+        kills_by_case = {}
+        must_keep = []
+        for case, target in case_targets.items():
+            passed = builds[target][0] and run_tests(target)[0]
+            if not passed:
+                # a case that can't run on its own (order dependence, shared state) is kept as is
+                must_keep.append(case)
+                continue
+            statuses = execute_mutants(target, killed, HOST_ZLIB_PATH, tag="min_case")
+            kills_by_case[case] = {mutant_id for mutant_id, status in statuses.items() if status == "killed"}
+    finally:
+        for target in case_targets.values():
+            os.remove(os.path.join(HOST_ZLIB_PATH, 'tests', f"{target}.c"))
+
+    chosen = list(must_keep)
+    if kills_by_case:
+        chosen += greedy_cover(kills_by_case, set(killed))
+    keep = set(chosen)
+    if len(keep) == len(cases):
+        print(f"  No redundant test cases in {test_filename}")
+        return None
+
+    # verify the reduced suite on its own before replacing the original
+    reduced_c = keep_test_cases(tests_c, keep)
+    reduced_target = f"{test_filename}_min"
+    reduced_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{reduced_target}.c")
+    write_host_file(reduced_path, reduced_c)
+    try:
+        built, _ = build_program(reduced_target)
+        if not built or not run_tests(reduced_target)[0]:
+            print(f"  ✗ Reduced suite for {function_name} does not build/pass, keeping the original")
+            return None
+        reduced_statuses, reduced_time = timed_execute(reduced_target, killed, HOST_ZLIB_PATH, "min_verify")
+        # the same mutants against the full suite, so both timings share one denominator
+        _, full_time = timed_execute(test_filename, killed, HOST_ZLIB_PATH, "min_baseline")
+        if any(status != "killed" for status in reduced_statuses.values()) or len(reduced_statuses) != len(killed):
+            print(f"  ✗ Reduced suite for {function_name} loses kills, keeping the original")
+            return None
+    finally:
+        os.remove(reduced_path)
+
+    # keep the full suite next to the reports, then replace the test file
+    backup_path = os.path.join(HOST_ZLIB_PATH, REPORTS_DIR, 'minimized', f"{test_filename}.full.c")
+    write_host_file(backup_path, tests_c)
+    write_host_file(test_path, reduced_c)
+    summary = {
+        "cases_before": len(cases),
+        "cases_after": len(keep),
+        "removed": [case for case in cases if case not in keep],
+        "killed": len(killed),
+        "seconds_per_mutant_before": round(full_time / len(killed), 3),
+        "seconds_per_mutant_after": round(reduced_time / len(killed), 3),
+    }
+    print(f"  ✓ Minimized {test_filename}: {len(cases)} -> {len(keep)} test cases, "
+          f"score unchanged ({len(killed)} kills), {summary['seconds_per_mutant_before']}s -> "
+          f"{summary['seconds_per_mutant_after']}s per mutant")
+    return summary
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Mutant-level helpers on top of Mull: enumerate the mutants embedded in a test binary,
+execute an arbitrary subset of them, and estimate mutation scores from a stratified sample.
+"""
+
+import json
+import math
+import os
+import random
+import sqlite3
+from statistics import NormalDist
+
+from test_container_one_mull import CPU_POOL, TEST_MEMORY_MB, run_in_container, run_mull, write_host_file
+
+REPORTS_DIR = "mull-reports"
+MUTANT_TIMEOUT = 10  # seconds per mutant execution
+SAMPLE_SEED = 0
+
+
+def list_mutants(test_binary, HOST_ZLIB_PATH):
+    """
+    Enumerate the mutants of an instrumented test binary with a Mull dry run (no mutant is executed).
+    Returns a list of dicts with keys: mutant_id, mutator, filename, line, column.
+    """
+    report_name = f"{test_binary}_mutants"
+    run_in_container(f"mkdir -p {REPORTS_DIR} && rm -f {REPORTS_DIR}/{report_name}.sqlite", show_output=False)
+    mull_cmd = (f"mull-runner-14 {test_binary} --dry-run --reporters SQLite "
+                f"--report-dir {REPORTS_DIR} --report-name {report_name}")
+    r = run_in_container(mull_cmd, show_output=False, timeout=600)
+
+    sqlite_path = os.path.join(HOST_ZLIB_PATH, REPORTS_DIR, f"{report_name}.sqlite")
+    if not os.path.exists(sqlite_path):
+        print(f"  ✗ Mull dry run produced no report for {test_binary} (return code {r.returncode})")
+        return []
+
+    with sqlite3.connect(sqlite_path) as conn:
+        cursor = conn.execute("SELECT * FROM mutant")
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    mutants = []
+    for row in rows:
+        mutator = row.get("mutator")
+        filename = row.get("filename")
+        line = row.get("line_number")
+        column = row.get("column_number")
+        mutant_id = row.get("mutant_id") or f"{mutator}:{filename}:{line}:{column}"
+        mutants.append({"mutant_id": mutant_id, "mutator": mutator, "filename": filename, "line": line, "column": column})
+    print(f"  Found {len(mutants)} mutants in {test_binary}")
+    return mutants
+
+
+def execute_mutants(test_binary, mutant_ids, HOST_ZLIB_PATH, timeout=MUTANT_TIMEOUT, workers=None, tag="run"):
+    """
+    Execute the given mutants against the test binary inside the container.
+    Returns {mutant_id: "killed" | "survived"}.
+    """
+    if not mutant_ids:
+        return {}
+    ids_file = f"{REPORTS_DIR}/.mutants_{test_binary}_{tag}.txt"
+    results_file = f"{REPORTS_DIR}/.mutants_{test_binary}_{tag}.json"
+    write_host_file(os.path.join(HOST_ZLIB_PATH, ids_file), "\n".join(mutant_ids) + "\n")
+
+    with CPU_POOL.pinned(workers or len(CPU_POOL.cpus)) as cpus:
+        cmd = (f"python3 harness/run_mutants.py ./{test_binary} --mutants {ids_file} --output {results_file} "
+               f"--timeout {timeout} --workers {len(cpus.split(','))} --memory-mb {TEST_MEMORY_MB}")
+        # every mutant may run into its timeout; leave room for that on top of the normal run time
+        r = run_in_container(cmd, show_output=False, timeout=120 + timeout * len(mutant_ids), cpus=cpus)
+
+    results_path = os.path.join(HOST_ZLIB_PATH, results_file)
+    if r.returncode != 0 or not os.path.exists(results_path):
+        print(f"  ✗ Mutant execution failed for {test_binary}: {(r.stdout or '')[-500:]}")
+        return {}
+    with open(results_path) as f:
+        return {entry["mutant_id"]: entry["status"] for entry in json.load(f)}
+
+
+def stratified_sample(mutants, sample_size, seed=SAMPLE_SEED):
+    """
+    Seeded random sample of mutants stratified by mutator: proportional allocation with at
+    least one mutant per mutator. Returns {mutator: [mutants...]} for the sampled mutants.
+    """
+    strata = {}
+    for mutant in mutants:
+        strata.setdefault(mutant["mutator"], []).append(mutant)
+
+    rng = random.Random(seed)
+    total = len(mutants)
+    sample = {}
+    for mutator in sorted(strata):
+        members = sorted(strata[mutator], key=lambda m: m["mutant_id"])
+        n = max(1, round(sample_size * len(members) / total))
+        sample[mutator] = rng.sample(members, min(n, len(members)))
+    return sample
+
+
+def estimate_score(strata_sizes, strata_kills, confidence=0.95):
+    """
+    Stratified estimate of the mutation score (in percent) with a normal-approximation
+    confidence interval and finite population correction.
+
+    Args:
+        strata_sizes: {mutator: number of mutants in the population}
+        strata_kills: {mutator: (killed, executed)} for the sample
+    Returns:
+        (score, ci_low, ci_high)
+    """
+    total = sum(strata_sizes.values())
+    estimate = 0.0
+    variance = 0.0
+    for mutator, size in strata_sizes.items():
+        killed, executed = strata_kills.get(mutator, (0, 0))
+        if executed == 0:
+            continue
+        weight = size / total
+        estimate += weight * killed / executed
+        # shrink towards 1/2 so all-killed / all-survived strata still carry uncertainty
+        p = (killed + 0.5) / (executed + 1)
+        fpc = (size - executed) / size
+        variance += weight ** 2 * p * (1 - p) / executed * fpc
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    margin = z * math.sqrt(variance)
+    return 100 * estimate, 100 * max(0.0, estimate - margin), 100 * min(1.0, estimate + margin)
+
+
+def run_sampled_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, sample_size,
+                     seed=SAMPLE_SEED, threshold=50, escalate=True, profile="full", confidence=0.95):
+    """
+    Estimate the mutation score from a stratified sample of mutants. If escalate is set and the
+    confidence interval straddles threshold, fall back to a full Mull run.
+
+    Returns a dict with keys: score, killed, survived, total, population, sampled, ci_low, ci_high,
+    output_file. killed/survived/total count the executed mutants (killed + survived == total) and
+    population is the number of mutants the score estimates; sampled is None when the score comes
+    from a full Mull run, where total == population.
+    """
+    mutants = list_mutants(test_filename, HOST_ZLIB_PATH)
+
+    def full_run():
+        score, killed, survived, total, output_file = run_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, profile)
+        return {"score": score, "killed": killed, "survived": survived, "total": total, "population": total,
+                "sampled": None, "ci_low": None, "ci_high": None, "output_file": output_file}
+
+    if len(mutants) <= sample_size:
+        print(f"  {len(mutants)} mutants <= sample size {sample_size}, running the full set")
+        return full_run()
+
+    sample = stratified_sample(mutants, sample_size, seed)
+    sampled_ids = [m["mutant_id"] for members in sample.values() for m in members]
+    print(f"  Executing {len(sampled_ids)}/{len(mutants)} sampled mutants (seed {seed})...")
+    statuses = execute_mutants(test_filename, sampled_ids, HOST_ZLIB_PATH, tag="sample")
+    if not statuses:
+        return full_run()
+
+    strata_sizes = {}
+    for mutant in mutants:
+        strata_sizes[mutant["mutator"]] = strata_sizes.get(mutant["mutator"], 0) + 1
+    strata_kills = {}
+    for mutator, members in sample.items():
+        killed = sum(1 for m in members if statuses.get(m["mutant_id"]) == "killed")
+        strata_kills[mutator] = (killed, len(members))
+
+    score, ci_low, ci_high = estimate_score(strata_sizes, strata_kills, confidence)
+    killed = sum(k for k, _ in strata_kills.values())
+    print(f"  Estimated mutation score: {score:.1f}% ({confidence:.0%} CI {ci_low:.1f}-{ci_high:.1f}) "
+          f"from {len(sampled_ids)}/{len(mutants)} mutants")
+
+    output_file = f"{REPORTS_DIR}/mull_{program_name}_{function_name}_sampled.json"
+    write_host_file(os.path.join(HOST_ZLIB_PATH, output_file), json.dumps({
+        "profile": profile,
+        "seed": seed,
+        "population": len(mutants),
+        "strata": {m: {"size": strata_sizes[m], "killed": k, "executed": n} for m, (k, n) in strata_kills.items()},
+        "score": score,
+        "ci": [ci_low, ci_high],
+        "confidence": confidence,
+        "mutants": statuses,
+    }, indent=2))
+
+    if escalate and ci_low <= threshold <= ci_high:
+        print(f"  Interval straddles threshold {threshold}, escalating to the full mutant set")
+        return full_run()
+
+    return {"score": round(score), "killed": killed, "survived": len(sampled_ids) - killed,
+            "total": len(sampled_ids), "population": len(mutants),
+            "sampled": len(sampled_ids), "ci_low": round(ci_low, 1), "ci_high": round(ci_high, 1),
+            "output_file": output_file}
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Trivial Compiler Equivalence (TCE) pre-pass for Mull mutants.
+
+Each operator mutant is applied to the (wrapper-injected) module source, the original and all
+mutants are compiled to optimized LLVM IR at -O2, and the normalized IR is hashed:
+  - a mutant whose IR equals the original is equivalent and is never executed
+  - mutants with identical IR are duplicates; only one representative is executed and the
+    others inherit its status
+Mutants whose mutator cannot be applied at source level are executed as usual.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from mull_mutants import REPORTS_DIR, list_mutants, execute_mutants
+from precheck_tests import configured_defines
+from test_container_one_mull import run_in_container, run_mull, write_host_file
+
+TCE_OPT_FLAGS = "-O2 -S -emit-llvm -g0"
+
+# Mull mutator -> (original operator, replacement) at the mutant's source location
+SOURCE_MUTATIONS = {
+    "cxx_add_to_sub": ("+", "-"),
+    "cxx_sub_to_add": ("-", "+"),
+    "cxx_mul_to_div": ("*", "/"),
+    "cxx_div_to_mul": ("/", "*"),
+    "cxx_rem_to_div": ("%", "/"),
+    "cxx_add_assign_to_sub_assign": ("+=", "-="),
+    "cxx_sub_assign_to_add_assign": ("-=", "+="),
+    "cxx_mul_assign_to_div_assign": ("*=", "/="),
+    "cxx_div_assign_to_mul_assign": ("/=", "*="),
+    "cxx_rem_assign_to_div_assign": ("%=", "/="),
+    "cxx_eq_to_ne": ("==", "!="),
+    "cxx_ne_to_eq": ("!=", "=="),
+    "cxx_gt_to_le": (">", "<="),
+    "cxx_ge_to_lt": (">=", "<"),
+    "cxx_lt_to_ge": ("<", ">="),
+    "cxx_le_to_gt": ("<=", ">"),
+    "cxx_gt_to_ge": (">", ">="),
+    "cxx_ge_to_gt": (">=", ">"),
+    "cxx_lt_to_le": ("<", "<="),
+    "cxx_le_to_lt": ("<=", "<"),
+    "cxx_logical_and_to_or": ("&&", "||"),
+    "cxx_logical_or_to_and": ("||", "&&"),
+    "cxx_and_to_or": ("&", "|"),
+    "cxx_or_to_and": ("|", "&"),
+    "cxx_xor_to_or": ("^", "|"),
+    "cxx_lshift_to_rshift": ("<<", ">>"),
+    "cxx_rshift_to_lshift": (">>", "<<"),
+    "cxx_and_assign_to_or_assign": ("&=", "|="),
+    "cxx_or_assign_to_and_assign": ("|=", "&="),
+    "cxx_xor_assign_to_or_assign": ("^=", "|="),
+    "cxx_lshift_assign_to_rshift_assign": ("<<=", ">>="),
+    "cxx_rshift_assign_to_lshift_assign": (">>=", "<<="),
+    "cxx_pre_inc_to_pre_dec": ("++", "--"),
+    "cxx_pre_dec_to_pre_inc": ("--", "++"),
+    "cxx_post_inc_to_post_dec": ("++", "--"),
+    "cxx_post_dec_to_post_inc": ("--", "++"),
+    "cxx_minus_to_noop": ("-", ""),
+    "cxx_remove_negation": ("!", ""),
+    "cxx_bitwise_not_to_noop": ("~", ""),
+}
+
+# longer operators that start with a shorter one; used to reject e.g. '>' when the source has '>>'
+C_OPERATORS = {
+    "++", "--", "+=", "-=", "*=", "/=", "%=", "==", "!=", "<=", ">=", "&&", "||",
+    "&=", "|=", "^=", "<<", ">>", "<<=", ">>=", "->",
+}
+
+
+def apply_source_mutation(source_lines, mutant):
+    """
+    Return the mutated source text, or None if the mutator is not supported or the
+    operator at the mutant's location does not match what the mutator expects.
+    """
+    mutation = SOURCE_MUTATIONS.get(mutant["mutator"])
+    if not mutation or not mutant.get("line") or not mutant.get("column"):
+        return None
+    original, replacement = mutation
+    line_index = mutant["line"] - 1
+    col_index = mutant["column"] - 1
+    if line_index >= len(source_lines):
+        return None
+    line = source_lines[line_index]
+    if line[col_index:col_index + len(original)] != original:
+        return None
+    following = line[col_index + len(original):col_index + len(original) + 1]
+    if following and original + following in C_OPERATORS:
+        return None
+    mutated_line = line[:col_index] + replacement + line[col_index + len(original):]
+    return "".join(source_lines[:line_index] + [mutated_line] + source_lines[line_index + 1:])
+
+
+def normalized_ir_hash(ir_text):
+    """Hash LLVM IR with file names and metadata stripped."""
+    kept = []
+    for line in ir_text.splitlines():
+        if line.startswith(("; ModuleID", "source_filename", "!")):
+            continue
+        kept.append(re.sub(r', !\w+ !\d+', '', line))
+    return hashlib.sha256("\n".join(kept).encode('utf-8')).hexdigest()
+
+
+def compile_variants(HOST_ZLIB_PATH, work_dir, variants):
+    """
+    Compile {name: source} to -O2 IR inside the container, in parallel.
+    Returns {name: ir_hash} for the variants that compiled.
+    """
+    host_work_dir = os.path.join(HOST_ZLIB_PATH, work_dir)
+    shutil.rmtree(host_work_dir, ignore_errors=True)
+    os.makedirs(host_work_dir)
+    for name, source in variants.items():
+        with open(os.path.join(host_work_dir, f"{name}.c"), 'w', encoding='utf-8') as f:
+            f.write(source)
+
+    defines = " ".join(configured_defines(HOST_ZLIB_PATH))
+    cmd = (f"ls {work_dir}/*.c | xargs -P$(nproc) -I{{}} "
+           f"clang-14 {TCE_OPT_FLAGS} {defines} -I/zlib -o {{}}.ll {{}} 2>/dev/null")
+    run_in_container(cmd, show_output=False, timeout=60 + 2 * len(variants))
+
+    hashes = {}
+    for name in variants:
+        ir_path = os.path.join(host_work_dir, f"{name}.c.ll")
+        if os.path.exists(ir_path):
+            with open(ir_path, 'r', encoding='utf-8', errors='replace') as f:
+                hashes[name] = normalized_ir_hash(f.read())
+    shutil.rmtree(host_work_dir, ignore_errors=True)
+    return hashes
+
+
+def classify_mutants(program_name, test_filename, mutants, HOST_ZLIB_PATH):
+    """
+    Split mutants into equivalent, duplicate and to-execute sets by their -O2 IR hash.
+    Returns {mutant_id: ("equivalent" | "duplicate" | "execute", representative_id)}.
+    """
+    src_c_path = os.path.join(HOST_ZLIB_PATH, f"{program_name}.c")
+    with open(src_c_path, 'r', encoding='utf-8') as f:
+        source_text = f.read()
+    source_lines = source_text.splitlines(keepends=True)
+
+    variants = {"original": source_text}
+    variant_of = {}
+    for index, mutant in enumerate(mutants):
+        mutated = apply_source_mutation(source_lines, mutant)
+        if mutated is not None:
+            variants[f"m{index}"] = mutated
+            variant_of[mutant["mutant_id"]] = f"m{index}"
+    print(f"  TCE: compiling original + {len(variant_of)}/{len(mutants)} source-level mutants at -O2...")
+    hashes = compile_variants(HOST_ZLIB_PATH, f"{REPORTS_DIR}/.tce_{test_filename}", variants)
+
+    original_hash = hashes.get("original")
+    classification = {}
+    representative_for_hash = {}
+    for mutant in mutants:
+        mutant_id = mutant["mutant_id"]
+        ir_hash = hashes.get(variant_of.get(mutant_id))
+        if original_hash is None or ir_hash is None:
+            classification[mutant_id] = ("execute", mutant_id)
+        elif ir_hash == original_hash:
+            classification[mutant_id] = ("equivalent", None)
+        elif ir_hash in representative_for_hash:
+            classification[mutant_id] = ("duplicate", representative_for_hash[ir_hash])
+        else:
+            representative_for_hash[ir_hash] = mutant_id
+            classification[mutant_id] = ("execute", mutant_id)
+    return classification
+
+
+def run_tce_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, profile="full"):
+    """
+    Mutation testing with the TCE pre-pass: equivalent mutants are excluded from the score,
+    duplicates are not executed but inherit their representative's result.
+
+    Returns a dict with keys: score, killed, survived, total, equivalent, duplicate, output_file.
+    If the selected mutants cannot all be executed, the result of a full Mull run is returned
+    instead (equivalent and duplicate are then None).
+    """
+    mutants = list_mutants(test_filename, HOST_ZLIB_PATH)
+    if not mutants:
+        return {"score": "N/A", "killed": 0, "survived": 0, "total": 0, "equivalent": 0, "duplicate": 0,
+                "output_file": None}
+
+    classification = classify_mutants(program_name, test_filename, mutants, HOST_ZLIB_PATH)
+    to_execute = [mutant_id for mutant_id, (kind, _) in classification.items() if kind == "execute"]
+    equivalent = [mutant_id for mutant_id, (kind, _) in classification.items() if kind == "equivalent"]
+    duplicate = [mutant_id for mutant_id, (kind, _) in classification.items() if kind == "duplicate"]
+    print(f"  TCE: {len(equivalent)} equivalent, {len(duplicate)} duplicate, executing {len(to_execute)} mutants")
+
+    statuses = execute_mutants(test_filename, to_execute, HOST_ZLIB_PATH, tag="tce")
+    if len(statuses) < len(to_execute):
+        # a failed execution would otherwise be scored as all-survived
+        print(f"  ✗ TCE: only {len(statuses)}/{len(to_execute)} mutants executed, falling back to a full Mull run")
+        score, killed, survived, total, output_file = run_mull(program_name, function_name, test_filename,
+                                                               HOST_ZLIB_PATH, profile)
+        return {"score": score, "killed": killed, "survived": survived, "total": total,
+                "equivalent": None, "duplicate": None, "output_file": output_file}
+    for mutant_id in duplicate:
+        statuses[mutant_id] = statuses.get(classification[mutant_id][1], "survived")
+
+    scored = [mutant_id for mutant_id in classification if mutant_id not in equivalent]
+    killed = sum(1 for mutant_id in scored if statuses.get(mutant_id) == "killed")
+    survived = len(scored) - killed
+    score = round(100 * killed / len(scored)) if scored else "N/A"
+    print(f"  ✓ TCE mutation score: {score}% ({killed}/{len(scored)} killed, {len(equivalent)} equivalent excluded)")
+
+    output_file = f"{REPORTS_DIR}/mull_{program_name}_{function_name}_tce.json"
+    write_host_file(os.path.join(HOST_ZLIB_PATH, output_file), json.dumps({
+        "profile": profile,
+        "score": score,
+        "killed": killed,
+        "survived": survived,
+        "equivalent": equivalent,
+        "duplicate": {mutant_id: classification[mutant_id][1] for mutant_id in duplicate},
+        "mutants": statuses,
+    }, indent=2))
+    return {"score": score, "killed": killed, "survived": survived, "total": len(scored),
+            "equivalent": len(equivalent), "duplicate": len(duplicate), "output_file": output_file}
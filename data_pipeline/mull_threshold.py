@@ -1,9 +1,11 @@
 import csv
 
-def count_functions_above_threshold(file_path, threshold):
+def count_functions_above_threshold(file_path, threshold, profile=None):
     """
     Count how many functions have mull_score > threshold.
     mull_score is treated as numeric; 'N/A' is ignored.
+    If profile is given, only rows scored with that mutation profile are counted
+    (rows recorded before profiles existed count as 'full').
     """
     count = 0
     total = 0
@@ -11,6 +13,9 @@ def count_functions_above_threshold(file_path, threshold):
     with open(file_path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
+            row_profile = row.get('mull_profile') or 'full'
+            if profile and row_profile != profile:
+                continue
             total += 1
             score = row['mull_score']
             if score != 'N/A':
@@ -22,11 +27,11 @@ def count_functions_above_threshold(file_path, threshold):
                     pass  # skip invalid numbers
 
     print(f"Total functions: {total}")
-    print(f"Functions with mull_score > {threshold}: {count}")
+    print(f"Functions with mull_score > {threshold}{f' ({profile} profile)' if profile else ''}: {count}")
     return count
 
 # Example usage
 if __name__ == "__main__":
-    file_path = "test_results_mull.txt"
+    file_path = "test_results_mull.txt"  # mull_results.txt has the same rows with mull_profile, for profile=...
     threshold = 50  # change as needed
     count_functions_above_threshold(file_path, threshold)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Survived-mutant-targeted test augmentation.
+
+After mutation testing, the survived mutants of a function are sent to the LLM together with
+the passing test file to get additional Unity cases aimed at exactly those mutants. The
+augmented file is built as its own target and only the survived mutants are re-executed
+against it, so the score improves without repeating a full-function Mull run.
+"""
+
+import json
+import os
+
+from mull_mutants import execute_mutants
+from test_container_one_mull import (
+    build_program, run_tests, extract_survived_mutants, read_report, write_host_file
+)
+
+MAX_MUTANTS_PER_PROMPT = 40
+
+_augmenter = None
+
+
+def get_augmenter():
+    """Initialize the augmentation converter on first use (LLM stack is only loaded when needed)."""
+    global _augmenter
+    if _augmenter is None:
+        from test_gpt5_generation import initialize_llm, SurvivedMutantsToUnityTests
+        _augmenter = initialize_llm(signature=SurvivedMutantsToUnityTests)
+    return _augmenter
+
+
+def mutant_from_id(mutant_id):
+    """Split a Mull mutant identifier (mutator:file:line:column) into a mutant dict."""
+    mutator, location = mutant_id.split(":", 1)
+    filename, line, column = location.rsplit(":", 2)
+    return {"mutant_id": mutant_id, "mutator": mutator, "filename": filename,
+            "line": int(line), "column": int(column), "description": mutator}
+
+
+def load_survived_mutants(HOST_ZLIB_PATH, output_file):
+    """Survived mutants from a Mull output file, or from a sampled/TCE JSON report."""
+    path = os.path.join(HOST_ZLIB_PATH, output_file)
+    if not output_file or not os.path.exists(path):
+        return []
+    content = read_report(path)
+    if output_file.endswith(".json"):
+        statuses = json.loads(content).get("mutants", {})
+        return [mutant_from_id(mutant_id) for mutant_id, status in statuses.items() if status == "survived"]
+    return extract_survived_mutants(content)
+
+
+def describe_mutants(mutants, source_lines):
+    """One line per mutant: location, mutator, description and the original source line."""
+    lines = []
+    for m in mutants:
+        source_line = source_lines[m["line"] - 1].strip() if 0 < m["line"] <= len(source_lines) else ""
+        lines.append(f"{os.path.basename(m['filename'])}:{m['line']}:{m['column']} [{m['mutator']}] "
+                     f"{m['description']} | {source_line}")
+    return "\n".join(lines)
+
+
+def augment_for_survived_mutants(program_name, function_name, test_filename, HOST_ZLIB_PATH, result_entry):
+    """
+    Augment the tests of one function against its survived mutants and re-score.
+
+    Expects <program>.c on disk to be the wrapper-injected source the test binary was built
+    from. On success the augmented file replaces tests/<test_filename>.c and result_entry's
+    Mull counts are updated. Returns the number of newly killed mutants.
+    """
+    survived = load_survived_mutants(HOST_ZLIB_PATH, result_entry["mull_output"] or "")
+    if not survived:
+        return 0
+    survived = survived[:MAX_MUTANTS_PER_PROMPT]
+
+    src_c_path = os.path.join(HOST_ZLIB_PATH, f"{program_name}.c")
+    with open(src_c_path, 'r', encoding='utf-8') as f:
+        module_code = f.read()
+    test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{test_filename}.c")
+    with open(test_path, 'r', encoding='utf-8') as f:
+        tests_c = f.read()
+
+    from test_gpt5_generation import augment_unity_tests_with_llm
+    augmented = augment_unity_tests_with_llm(
+        get_augmenter(), f"{program_name}.c", module_code, function_name, tests_c,
+        describe_mutants(survived, module_code.splitlines())
+    )
+    if not augmented:
+        return 0
+
+    # build the augmented suite as its own target so the original binary stays intact
+    augmented_target = f"{test_filename}_aug"
+    augmented_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{augmented_target}.c")
+    write_host_file(augmented_path, augmented)
+    try:
+        built, _ = build_program(augmented_target)
+        if not built:
+            return 0
+        passed = run_tests(augmented_target)[0]
+        if not passed:
+            print(f"  ✗ Augmented tests for {function_name} fail on the original code, discarding")
+            return 0
+
+        print(f"  Re-executing {len(survived)} survived mutants against the augmented tests...")
+        statuses = execute_mutants(augmented_target, [m["mutant_id"] for m in survived], HOST_ZLIB_PATH, tag="augment")
+        newly_killed = sum(1 for status in statuses.values() if status == "killed")
+        if newly_killed == 0:
+            print(f"  ✗ Augmented tests for {function_name} killed no survived mutants")
+            return 0
+
+        write_host_file(test_path, augmented)
+        killed = result_entry["mull_killed"] + newly_killed
+        # sampled scores are re-estimated over the executed sample only
+        executed = result_entry.get("mull_sampled") or result_entry["mull_total"]
+        result_entry.update({
+            "mull_killed": killed,
+            "mull_survived": executed - killed,
+            "mull_score": round(100 * killed / executed) if executed else result_entry["mull_score"],
+            "mull_augmented_killed": newly_killed,
+        })
+        print(f"  ✓ Augmented tests killed {newly_killed}/{len(survived)} survived mutants, "
+              f"mutation score now {result_entry['mull_score']}%")
+        return newly_killed
+    finally:
+        os.remove(augmented_path)
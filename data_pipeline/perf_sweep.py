@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Performance sweep over a range of zlib submodule commits.
+
+Every commit is checked out in its own git worktree under one sweep directory, which is
+mounted as /zlib in the usual build-zlib container. The worktrees are built in parallel
+(uninstrumented -O2, like benchmark_runner.py) together with a fixed benchmark set: the
+generated micro-benchmarks in zlib/benchmarks and a few deflate/inflate matrix combinations.
+
+The benchmarks then run SWEEP_REPEATS times, interleaved over the commits so that drift of
+the machine spreads evenly, each run pinned to one CPU. Every commit is compared with the
+previous one (and with the first) using a Mann-Whitney U test on the samples; a change that
+is significant and larger than MIN_EFFECT is reported, and regressions are listed as commit
+pairs to `git bisect`. All comparisons go to perf_sweep_results.txt.
+"""
+
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark_runner import parse_bench_output
+from deflate_matrix_bench import CORPUS_DIR, STRATEGIES, parse_matrix_output, parse_size
+from test_container_one_mull import (
+    SCRIPT_DIR, REPO_DIR, CPU_POOL, start_container, stop_container, run_in_container
+)
+
+SWEEP_CFLAGS = "-O2"
+SWEEP_BUILD_WORKERS = 4    # worktrees built concurrently
+SWEEP_REPEATS = 7          # samples per benchmark and commit
+SWEEP_TIMEOUT = 600        # seconds per benchmark run
+SWEEP_CORPUS_SIZE = "16M"
+SWEEP_RESULTS_FILE = "perf_sweep_results.txt"
+ALPHA = 0.01               # significance level of the Mann-Whitney U test
+MIN_EFFECT = 0.02          # relative median change below which a significant difference is ignored
+
+# (corpus kind, level, windowBits, memLevel, strategy) run through harness/zlib_matrix_bench.c
+SWEEP_MATRIX = [
+    ("text", 1, 15, 8, "default"),
+    ("text", 6, 15, 8, "default"),
+    ("binary", 9, 15, 9, "default"),
+    ("repetitive", 6, 15, 8, "rle"),
+]
+
+# metrics where a larger value is better; everything else (ns_per_call) is a time
+HIGHER_IS_BETTER = {"comp_mb_s", "decomp_mb_s"}
+
+RESULT_COLUMNS = ("base", "commit", "benchmark", "metric", "base_median", "median", "change", "p_value", "verdict")
+
+
+def resolve_commits(HOST_ZLIB_PATH, commits):
+    """
+    Full hashes for a list of revisions, or for a range "A..B" (A itself first, as the baseline,
+    then every commit of A..B in order).
+    """
+    def git(*args):
+        return subprocess.run(['git', '-C', HOST_ZLIB_PATH, *args], capture_output=True, text=True, check=True).stdout
+
+    if isinstance(commits, str) and ".." in commits:
+        start = commits.split("..", 1)[0]
+        return [git('rev-parse', start).strip()] + git('rev-list', '--reverse', commits).split()
+    if isinstance(commits, str):
+        commits = [commits]
+    return [git('rev-parse', c).strip() for c in commits]
+
+
+def add_worktrees(HOST_ZLIB_PATH, sweep_dir, commits):
+    """A detached worktree per commit at sweep_dir/<short hash>; returns {commit: short hash}."""
+    names = {}
+    for commit in commits:
+        name = commit[:12]
+        subprocess.run(['git', '-C', HOST_ZLIB_PATH, 'worktree', 'add', '--detach', '--force',
+                        os.path.join(sweep_dir, name), commit], capture_output=True, text=True, check=True)
+        names[commit] = name
+    return names
+
+
+def remove_worktrees(HOST_ZLIB_PATH, sweep_dir, names):
+    for name in names.values():
+        subprocess.run(['git', '-C', HOST_ZLIB_PATH, 'worktree', 'remove', '--force', os.path.join(sweep_dir, name)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    subprocess.run(['git', '-C', HOST_ZLIB_PATH, 'worktree', 'prune'],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stage_benchmark_sources(HOST_ZLIB_PATH, sweep_dir, bench_names=None):
+    """
+    Copy harness/ and the generated benchmark sources next to the worktrees, so every commit is
+    measured with the same code. Returns the benchmark names (bench_<module>_<function>).
+    """
+    shutil.copytree(os.path.join(REPO_DIR, 'harness'), os.path.join(sweep_dir, 'harness'), dirs_exist_ok=True)
+    bench_src = os.path.join(HOST_ZLIB_PATH, 'benchmarks')
+    available = sorted(f[:-2] for f in os.listdir(bench_src) if f.startswith('bench_') and f.endswith('.c')) \
+        if os.path.isdir(bench_src) else []
+    selected = [b for b in available if bench_names is None or b in bench_names]
+    os.makedirs(os.path.join(sweep_dir, 'benchmarks'), exist_ok=True)
+    for bench in selected:
+        shutil.copy2(os.path.join(bench_src, f"{bench}.c"), os.path.join(sweep_dir, 'benchmarks'))
+    return selected
+
+
+def build_worktree(name, bench_names, jobs):
+    """
+    Configure and build libz.a, the matrix harness and every benchmark in /zlib/<name>.
+    Benchmarks that do not compile against this commit (e.g. an API it predates) are skipped.
+    Returns the names of the benchmark binaries that were built, or None if the library failed.
+    """
+    cmd = (f"cd /zlib/{name} && (make distclean > /dev/null 2>&1 || true) && "
+           f"CC=clang-14 CFLAGS='{SWEEP_CFLAGS}' ./configure --static > /dev/null && make -j{jobs} libz.a && "
+           f"clang-14 {SWEEP_CFLAGS} -I. -o zlib_matrix_bench ../harness/zlib_matrix_bench.c libz.a")
+    for bench in bench_names:
+        cmd += (f" && (clang-14 {SWEEP_CFLAGS} -I. -o {bench} ../benchmarks/{bench}.c libz.a > /dev/null 2>&1 "
+                f"&& echo BUILT {bench} || echo SKIPPED {bench})")
+    r = run_in_container(cmd, show_output=False, timeout=900)
+    if r.returncode != 0:
+        print(f"  ✗ {name}: build failed:\n{(r.stdout or '')[-1000:]}")
+        return None
+    lines = (r.stdout or "").splitlines()
+    built = [line.split()[1] for line in lines if line.startswith("BUILT ")]
+    skipped = [line.split()[1] for line in lines if line.startswith("SKIPPED ")]
+    print(f"  ✓ {name}: built ({len(built)} benchmarks" + (f", {len(skipped)} skipped" if skipped else "") + ")")
+    return built
+
+
+def build_all(names, bench_names):
+    """Build all worktrees concurrently; returns {name: built benchmarks} for those that built."""
+    workers = max(1, min(SWEEP_BUILD_WORKERS, len(names)))
+    jobs = max(1, len(CPU_POOL.cpus) // workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        built = dict(zip(names, pool.map(lambda n: build_worktree(n, bench_names, jobs), names)))
+    return {name: benches for name, benches in built.items() if benches is not None}
+
+
+def run_samples(name, benches, corpus_size, seed=0):
+    """
+    One run of the fixed benchmark set in /zlib/<name>.
+    Returns {(benchmark, metric): value}.
+    """
+    samples = {}
+    for bench in benches:
+        with CPU_POOL.pinned(1) as cpus:
+            r = run_in_container(f"/zlib/{name}/{bench}", show_output=False, timeout=SWEEP_TIMEOUT, cpus=cpus)
+        if r.returncode != 0:
+            continue
+        for record in parse_bench_output(r.stdout):
+            if record["ns_per_call"] is not None:
+                samples[(f"{bench}:{record['case']}", "ns_per_call")] = record["ns_per_call"]
+    for kind, level, window_bits, mem_level, strategy in SWEEP_MATRIX:
+        corpus_file = f"{CORPUS_DIR}/{kind}-{corpus_size}-s{seed}.bin"
+        with CPU_POOL.pinned(1) as cpus:
+            r = run_in_container(f"/zlib/{name}/zlib_matrix_bench {corpus_file} {level} {window_bits} {mem_level} "
+                                 f"{STRATEGIES[strategy]} -r 1", show_output=False, timeout=SWEEP_TIMEOUT, cpus=cpus)
+        fields = parse_matrix_output(r.stdout)
+        if r.returncode != 0 or fields is None:
+            continue
+        label = f"matrix:{kind}:l{level}w{window_bits}m{mem_level}:{strategy}"
+        samples[(label, "comp_mb_s")] = fields["comp_mb_s"]
+        samples[(label, "decomp_mb_s")] = fields["decomp_mb_s"]
+    return samples
+
+
+def mann_whitney_u(a, b):
+    """
+    Two-sided Mann-Whitney U test (normal approximation with tie and continuity correction).
+    Returns the p-value; 1.0 when either sample is empty or all values are equal.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 1.0
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    n = n1 + n2
+    rank_sum_a = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum_a += average_rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def compare(base_samples, samples, metric):
+    """(relative change of the median, p-value, verdict) of samples against base_samples."""
+    base_median = statistics.median(base_samples)
+    median = statistics.median(samples)
+    change = (median - base_median) / base_median if base_median else 0.0
+    p_value = mann_whitney_u(base_samples, samples)
+    worse = -change if metric in HIGHER_IS_BETTER else change
+    if p_value >= ALPHA or abs(change) < MIN_EFFECT:
+        verdict = "unchanged"
+    else:
+        verdict = "regression" if worse > 0 else "improvement"
+    return change, p_value, verdict
+
+
+def compare_commits(commits, samples):
+    """Each commit against its predecessor and against the first commit; returns result rows."""
+    rows = []
+    keys = sorted({key for per_commit in samples.values() for key in per_commit})
+    for index, commit in enumerate(commits[1:], start=1):
+        bases = [commits[index - 1]] + ([commits[0]] if index > 1 else [])
+        for base in bases:
+            for benchmark, metric in keys:
+                a = samples[base].get((benchmark, metric))
+                b = samples[commit].get((benchmark, metric))
+                if not a or not b:
+                    continue
+                change, p_value, verdict = compare(a, b, metric)
+                rows.append({"base": base[:12], "commit": commit[:12], "benchmark": benchmark, "metric": metric,
+                             "base_median": statistics.median(a), "median": statistics.median(b),
+                             "change": change, "p_value": p_value, "verdict": verdict,
+                             "adjacent": base == commits[index - 1]})
+    return rows
+
+
+def run_perf_sweep(commits, HOST_ZLIB_PATH=None, bench_names=None, repeats=SWEEP_REPEATS,
+                   corpus_size=SWEEP_CORPUS_SIZE, keep_worktrees=False):
+    """
+    Build and benchmark each zlib commit (a list of revisions or a range "A..B") and compare them.
+    Prints significant changes and bisect candidates, appends every comparison to
+    SWEEP_RESULTS_FILE and returns the rows.
+    """
+    HOST_ZLIB_PATH = HOST_ZLIB_PATH or os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'zlib'))
+    commits = resolve_commits(HOST_ZLIB_PATH, commits)
+    if len(commits) < 2:
+        print("  ✗ A sweep needs at least two commits")
+        return []
+    corpus_size = parse_size(corpus_size)
+    sweep_dir = tempfile.mkdtemp(prefix='zlib_sweep_')
+    names = {}
+    print(f"Sweeping {len(commits)} commits in {sweep_dir}")
+    try:
+        names = add_worktrees(HOST_ZLIB_PATH, sweep_dir, commits)
+        bench_names = stage_benchmark_sources(HOST_ZLIB_PATH, sweep_dir, bench_names)
+        if not start_container(sweep_dir):
+            return []
+        try:
+            kinds = sorted({kind for kind, *_ in SWEEP_MATRIX})
+            r = run_in_container(f"python3 /zlib/harness/make_corpus.py --out {CORPUS_DIR} --size {corpus_size} "
+                                 f"--kinds {','.join(kinds)}", show_output=False, timeout=600)
+            if r.returncode != 0:
+                print(f"  ✗ Corpus generation failed:\n{(r.stdout or '')[-1000:]}")
+                return []
+
+            print(f"  Building {len(commits)} worktrees...")
+            built = build_all(list(names.values()), bench_names)
+            commits = [c for c in commits if names[c] in built]
+            if len(commits) < 2:
+                print("  ✗ Fewer than two commits built")
+                return []
+
+            samples = {commit: {} for commit in commits}
+            for repeat in range(repeats):
+                print(f"  Benchmark round {repeat + 1}/{repeats}...")
+                for commit in commits:
+                    for key, value in run_samples(names[commit], built[names[commit]], corpus_size).items():
+                        samples[commit].setdefault(key, []).append(value)
+        finally:
+            stop_container()
+    finally:
+        if not keep_worktrees:
+            remove_worktrees(HOST_ZLIB_PATH, sweep_dir, names)
+            shutil.rmtree(sweep_dir, ignore_errors=True)
+
+    rows = compare_commits(commits, samples)
+    report(rows)
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    header_needed = not os.path.exists(SWEEP_RESULTS_FILE)
+    with open(SWEEP_RESULTS_FILE, "a") as f:
+        if header_needed:
+            f.write("timestamp,repeats," + ",".join(RESULT_COLUMNS) + "\n")
+        for row in rows:
+            f.write(f"{timestamp},{repeats}," + ",".join(
+                f"{row[c]:.6g}" if isinstance(row[c], float) else str(row[c]) for c in RESULT_COLUMNS) + "\n")
+    print(f"  ✓ {len(rows)} comparisons appended to {SWEEP_RESULTS_FILE}")
+    return rows
+
+
+def report(rows):
+    """Print the significant changes between adjacent commits and the regressions to bisect."""
+    changed = [row for row in rows if row["adjacent"] and row["verdict"] != "unchanged"]
+    if not changed:
+        print(f"  No significant changes between adjacent commits (alpha={ALPHA}, min effect {MIN_EFFECT:.0%})")
+    for row in changed:
+        mark = "✗" if row["verdict"] == "regression" else "✓"
+        print(f"  {mark} {row['base']}..{row['commit']} {row['benchmark']} {row['metric']}: "
+              f"{row['base_median']:.4g} -> {row['median']:.4g} ({row['change']:+.1%}, p={row['p_value']:.4f})")
+    regressions = sorted({(row["base"], row["commit"]) for row in changed if row["verdict"] == "regression"})
+    if regressions:
+        print("\n  Regressions to bisect:")
+        for good, bad in regressions:
+            print(f"    git -C zlib bisect start {bad} {good}")
+
+
+if __name__ == "__main__":
+    commit_range = "v1.2.13..v1.3"  # a range "A..B" or a list of revisions
+    run_perf_sweep(commit_range)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cheap host-side precheck of generated tests_*.c files.
+
+Runs `-fsyntax-only` with a host compiler (falling back to tree-sitter error detection
+when no compiler is available) and checks that every zlib symbol the test relies on is
+actually reachable from the wrapper-injected module. Broken files are rejected in
+milliseconds instead of costing a container `make` round-trip and a library rebuild.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import time
+
+PRECHECK_COMPILERS = ("clang-14", "clang", "gcc", "cc")
+
+# Implicit declarations are only a warning under clang-14 (the container compiler), so
+# don't let newer host compilers reject what the real build accepts. Wrapper calls are
+# covered by the symbol check below instead.
+PRECHECK_FLAGS = ["-fsyntax-only", "-std=gnu11", "-Wno-implicit-function-declaration"]
+
+
+def configured_defines(zlib_path):
+    """
+    Return the -D/-U flags from the CFLAGS line of the configured zlib Makefile, i.e. the
+    preprocessor configuration `configure` chose. Compiler/plugin flags are dropped so the
+    result is usable with any host compiler. Returns [] if zlib is not configured.
+    """
+    makefile_path = os.path.join(zlib_path, 'Makefile')
+    if not os.path.exists(makefile_path):
+        return []
+    with open(makefile_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('CFLAGS='):
+                return [flag for flag in line[len('CFLAGS='):].split() if flag.startswith(('-D', '-U'))]
+    return []
+
+
+def find_precheck_compiler():
+    """Return the first available host compiler for syntax checks, or None."""
+    for compiler in PRECHECK_COMPILERS:
+        path = shutil.which(compiler)
+        if path:
+            return path
+    return None
+
+
+def syntax_check_with_compiler(compiler, test_path, zlib_path):
+    """Run <compiler> -fsyntax-only on the test file; returns (ok, diagnostics)."""
+    include_flags = [f"-I{zlib_path}", f"-I{os.path.join(zlib_path, 'tests')}", f"-I{os.path.join(zlib_path, 'unity')}"]
+    cmd = [compiler, *PRECHECK_FLAGS, *configured_defines(zlib_path), *include_flags, test_path]
+    try:
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        return False, "Precheck timed out"
+    return r.returncode == 0, r.stderr
+
+
+def syntax_check_with_treesitter(test_code):
+    """Fallback when no compiler exists: report tree-sitter ERROR/MISSING nodes."""
+    try:
+        from tree_sitter import Language, Parser
+        import tree_sitter_c as tsc
+    except ImportError:
+        return True, "No compiler or tree-sitter available, syntax check skipped"
+
+    parser = Parser(Language(tsc.language()))
+    tree = parser.parse(test_code.encode('utf-8'))
+    problems = []
+
+    def traverse_tree(node):
+        if node.type == 'ERROR' or node.is_missing:
+            line, col = node.start_point
+            kind = "missing" if node.is_missing else "syntax error near"
+            problems.append(f"{line + 1}:{col + 1}: {kind} '{node.type}'")
+            return
+        for child in node.children:
+            traverse_tree(child)
+
+    traverse_tree(tree.root_node)
+    return not problems, "\n".join(problems)
+
+
+def check_symbols(test_code, module_code):
+    """
+    Check the test against the wrapper-injected module:
+      - every test_<name>() it calls but doesn't define must be a wrapper in the module
+      - it must not call a `local` module function directly (unresolvable at link time)
+    Returns a list of error strings.
+    """
+    errors = []
+    defined_in_test = set(re.findall(r'\b([A-Za-z_]\w*)\s*\([^;{)]*\)\s*\{', test_code))
+    called_in_test = set(re.findall(r'\b([A-Za-z_]\w*)\s*\(', test_code))
+
+    module_wrappers = set(re.findall(r'\b(test_\w+)\s*\([^;{)]*\)\s*\{', module_code))
+    local_functions = set(re.findall(r'^local\s+[^;{(]*?\b([A-Za-z_]\w*)\s*\(', module_code, flags=re.MULTILINE))
+
+    for name in sorted(called_in_test - defined_in_test):
+        if name.startswith("test_") and name not in module_wrappers:
+            errors.append(f"calls undefined wrapper {name}()")
+        elif name in local_functions:
+            errors.append(f"calls local function {name}() directly instead of test_{name}()")
+    return errors
+
+
+def precheck_test_file(test_path, module_code, zlib_path):
+    """
+    Precheck one generated test file.
+
+    Args:
+        test_path: Path to tests_<module>_<function>.c on the host
+        module_code: Module source with the global wrapper already injected
+        zlib_path: Host zlib tree used for include paths
+    Returns:
+        (ok, diagnostics) where diagnostics is a short human-readable report
+    """
+    start = time.perf_counter()
+    with open(test_path, 'r', encoding='utf-8', errors='replace') as f:
+        test_code = f.read()
+
+    compiler = find_precheck_compiler()
+    if compiler:
+        syntax_ok, syntax_output = syntax_check_with_compiler(compiler, test_path, zlib_path)
+    else:
+        syntax_ok, syntax_output = syntax_check_with_treesitter(test_code)
+
+    symbol_errors = check_symbols(test_code, module_code)
+    ok = syntax_ok and not symbol_errors
+
+    diagnostics = syntax_output.strip()
+    if symbol_errors:
+        diagnostics += ("\n" if diagnostics else "") + "\n".join(f"symbol check: {e}" for e in symbol_errors)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if ok:
+        print(f"  ✓ Precheck passed for {os.path.basename(test_path)} ({elapsed_ms:.0f} ms)")
+    else:
+        print(f"  ✗ Precheck failed for {os.path.basename(test_path)} ({elapsed_ms:.0f} ms)")
+        print("  " + diagnostics[:800].replace("\n", "\n  "))
+    return ok, diagnostics
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Live progress reporting for long build/test/mutate runs.
+
+After every function a status line is printed with completed/remaining functions per stage,
+functions per minute, mutants per second and an ETA; the same data is written to a JSON
+status file, which a background thread also refreshes periodically while long Mull runs are
+in progress. The ETA uses the per-function cost of each module from earlier runs
+(job_costs.json), falling back to the average of the current run.
+"""
+
+import json
+import os
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATUS_FILE = "progress_status.json"
+HISTORY_FILE = os.path.join(SCRIPT_DIR, "job_costs.json")
+STATUS_INTERVAL = 15   # seconds between periodic status file refreshes
+HISTORY_WEIGHT = 0.5   # weight of the latest run in the moving average of a module's cost
+
+STAGES = ("precheck", "build", "test", "mull")
+
+_tracker = None
+
+
+def planned_function_count(injectable_dir, program_name):
+    """Number of distinct test files in injectable_functions/<program>_injectable_functions.json."""
+    injectable_json = os.path.join(injectable_dir, f"{program_name}_injectable_functions.json")
+    if not os.path.exists(injectable_json):
+        return 0
+    with open(injectable_json, 'r', encoding='utf-8') as f:
+        return len({func["test_filename"] for func in json.load(f) if func.get("test_filename")})
+
+
+def stages_reached(result_entry):
+    """The pipeline stages a function went through, judged from its result entry."""
+    stages = []
+    if result_entry.get("precheck") is not None:
+        stages.append("precheck")
+    if result_entry.get("precheck") is not False:
+        stages.append("build")
+    if result_entry.get("build"):
+        stages.append("test")
+    if result_entry.get("mull_profile"):
+        stages.append("mull")
+    return stages
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "unknown"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressTracker:
+    """Collects per-function completions of a run and reports throughput and ETA."""
+
+    def __init__(self, planned, status_path=STATUS_FILE, history_path=HISTORY_FILE, interval=STATUS_INTERVAL):
+        """planned: {program_name: number of functions}, in processing order."""
+        self.planned = dict(planned)
+        self.status_path = status_path
+        self.history_path = history_path
+        self.history = self._load_history()
+        self.started = time.time()
+        self.completed = {program: 0 for program in self.planned}
+        self.stage_counts = {stage: 0 for stage in STAGES}
+        self.module_seconds = {program: 0.0 for program in self.planned}
+        self.mutants = 0
+        self.mull_seconds = 0.0
+        self.current = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # the refresh thread and the pipeline share one temp file
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._refresh_periodically, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def _load_history(self):
+        if self.history_path and os.path.exists(self.history_path):
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _refresh_periodically(self, interval):
+        while not self._stop.wait(interval):
+            self.write_status()
+
+    def start_module(self, program_name, function_count):
+        with self._lock:
+            self.current = program_name
+            self.planned[program_name] = function_count
+            self.completed.setdefault(program_name, 0)
+            self.module_seconds.setdefault(program_name, 0.0)
+
+    def function_done(self, program_name, result_entry, seconds, repeat=False):
+        """
+        Record a finished function. repeat marks a re-test (e.g. after a repair): its time and
+        mutants count towards throughput, but the function is not counted as completed again.
+        """
+        with self._lock:
+            if not repeat:
+                self.completed[program_name] = self.completed.get(program_name, 0) + 1
+                for stage in stages_reached(result_entry):
+                    self.stage_counts[stage] += 1
+            self.module_seconds[program_name] = self.module_seconds.get(program_name, 0.0) + seconds
+            if result_entry.get("mull_profile"):
+                self.mutants += result_entry.get("mull_sampled") or result_entry.get("mull_total") or 0
+                self.mull_seconds += result_entry.get("mull_seconds") or 0.0
+        self.print_status()
+        self.write_status()
+
+    def module_done(self, program_name):
+        """Fold the module's per-function cost into the job cost history."""
+        with self._lock:
+            functions = self.completed.get(program_name, 0)
+            if not functions:
+                return
+            cost = self.module_seconds[program_name] / functions
+            previous = self.history.get(program_name, {}).get("seconds_per_function")
+            if previous is not None:
+                cost = HISTORY_WEIGHT * cost + (1 - HISTORY_WEIGHT) * previous
+            self.history[program_name] = {"seconds_per_function": round(cost, 2), "functions": functions}
+            history = dict(self.history)
+        if self.history_path:
+            with open(self.history_path, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=2, sort_keys=True)
+        self.write_status()
+
+    def _cost_per_function(self, program_name, run_average):
+        known = self.history.get(program_name, {}).get("seconds_per_function")
+        if known is not None:
+            return known
+        if run_average is not None:
+            return run_average
+        costs = [h["seconds_per_function"] for h in self.history.values()]
+        return sum(costs) / len(costs) if costs else None
+
+    def snapshot(self):
+        """The current progress as a dict (also the content of the status file)."""
+        with self._lock:
+            elapsed = time.time() - self.started
+            done = sum(self.completed.values())
+            total = sum(max(self.planned[p], self.completed.get(p, 0)) for p in self.planned)
+            run_average = sum(self.module_seconds.values()) / done if done else None
+            eta = 0.0
+            for program_name, planned in self.planned.items():
+                remaining = max(0, planned - self.completed.get(program_name, 0))
+                if not remaining:
+                    continue
+                cost = self._cost_per_function(program_name, run_average)
+                if cost is None:
+                    eta = None
+                    break
+                eta += remaining * cost
+            return {
+                "updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "current_module": self.current,
+                "elapsed_seconds": round(elapsed, 1),
+                "functions_completed": done,
+                "functions_total": total,
+                # remaining: planned functions that have not got through the stage (yet or at all)
+                "stages": {stage: {"completed": count, "remaining": max(0, total - count)}
+                           for stage, count in self.stage_counts.items()},
+                "modules": {p: {"completed": self.completed.get(p, 0), "planned": n} for p, n in self.planned.items()},
+                "functions_per_minute": round(60 * done / elapsed, 2) if elapsed else 0.0,
+                "mutants_executed": self.mutants,
+                "mutants_per_second": round(self.mutants / self.mull_seconds, 2) if self.mull_seconds else None,
+                "eta_seconds": round(eta) if eta is not None else None,
+            }
+
+    def print_status(self):
+        s = self.snapshot()
+        module = s["current_module"]
+        module_progress = s["modules"].get(module, {})
+        stages = " ".join(f"{stage} {s['stages'][stage]['completed']} ({s['stages'][stage]['remaining']} left)"
+                          for stage in STAGES)
+        mutants_rate = f"{s['mutants_per_second']} mutants/s" if s["mutants_per_second"] is not None else "- mutants/s"
+        print(f"[progress] {module} {module_progress.get('completed', 0)}/{module_progress.get('planned', 0)} | "
+              f"total {s['functions_completed']}/{s['functions_total']} functions | {stages} | "
+              f"{s['functions_per_minute']} fn/min | {mutants_rate} | ETA {format_duration(s['eta_seconds'])}")
+
+    def write_status(self):
+        if not self.status_path:
+            return
+        content = json.dumps(self.snapshot(), indent=2)
+        tmp_path = f"{self.status_path}.tmp"
+        with self._write_lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, self.status_path)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.write_status()
+
+
+def start_tracking(planned, **kwargs):
+    """Start a run-wide tracker for {program_name: function count}; used by the pipeline stages."""
+    global _tracker
+    if _tracker is not None:
+        _tracker.close()
+    _tracker = ProgressTracker(planned, **kwargs)
+    return _tracker
+
+
+def get_tracker(program_name, function_count):
+    """The run-wide tracker, or a tracker for this module alone when none was started."""
+    tracker = _tracker or start_tracking({program_name: function_count})
+    tracker.start_module(program_name, function_count)
+    return tracker
+
+
+def stop_tracking():
+    global _tracker
+    if _tracker is not None:
+        _tracker.close()
+        _tracker = None
@@ -1,4 +1,7 @@
-from test_container_one_mull import run_build_execute_mutate_for_one_zlib_program
+import os
+
+from progress import planned_function_count, start_tracking, stop_tracking
+from test_container_one_mull import SCRIPT_DIR, run_build_execute_mutate_for_one_zlib_program
 
 default_progs = [
     "adler32",
@@ -22,6 +25,8 @@ if __name__ == "__main__":
     success = 0
     failed = 0
     print(len(default_progs), " files to execute tests for.")
+    injectable_dir = os.path.join(SCRIPT_DIR, '..', 'zlib', 'injectable_functions')
+    start_tracking({p: planned_function_count(injectable_dir, p) for p in default_progs})
     for i, program_name in enumerate(default_progs, 1):
         print(f"\n{'='*70}")
         print(f"Executing tests for zlib files: {program_name}")
@@ -35,6 +40,7 @@ if __name__ == "__main__":
             failed += 1
             print(f"✗ {program_name} FAILED: {e}")
             continue  # Keep going to next program
+    stop_tracking()
     print(f"\n{'='*70}")
     print(f"SUMMARY: {success} success, {failed} failed")
     print('='*70)
\ No newline at end of file
@@ -6,11 +6,20 @@ and restore the original source file.
 """
 
 import os
+import gzip
 import subprocess
 import json
 import shutil
 import tempfile
+import time
 import re
+import shlex
+import threading
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from precheck_tests import precheck_test_file
+from progress import get_tracker
 
 # from tree_sitter import Language, Parser
 # import tree_sitter_c as tsc
@@ -19,17 +28,120 @@ import re
 # Configuration
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONTAINER_NAME = "build-zlib"
+REPO_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+CCACHE_VOLUME = "zlib-ccache"  # persistent podman volume shared by all runs
+# mull.yml decides which mutants the frontend plugin embeds, so it must be part of the cache key
+CCACHE_ENV = {
+    "CCACHE_DIR": "/ccache",
+    "CCACHE_BASEDIR": "/zlib",
+    "CCACHE_EXTRAFILES": "/usr/lib/mull-ir-frontend-14:/zlib/mull.yml",
+    "CCACHE_SLOPPINESS": "pch_defines,time_macros,include_file_mtime,include_file_ctime",
+}
+TESTS_PCH = "tests_common.h.pch"
+SCRATCH_DIR = "/scratch"        # tmpfs exported as TMPDIR for file-heavy (gz*) tests
+SCRATCH_SIZE = "512m"
+CONTAINER_CPUS = None    # podman --cpus for the whole container (None: no limit)
+CONTAINER_MEMORY = None  # podman --memory, e.g. "8g" (None: no limit)
+JOBS_DIR = "/tmp/.jobs"  # in-container pid files of running jobs, used to kill them on host-side timeouts
+KILL_GRACE = 5           # seconds between SIGTERM and SIGKILL when a job times out
+TEST_MEMORY_MB = 2048    # address-space limit for test binary and mutant runs
+# Mutation profiles: "quick" is a small high-signal subset for triaging freshly generated
+# tests, "full" is what final scores are reported with.
+MULL_PROFILES = {
+    "quick": [
+        "cxx_eq_to_ne",
+        "cxx_ne_to_eq",
+        "cxx_lt_to_ge",
+        "cxx_gt_to_le",
+        "cxx_logical_and_to_or",
+        "cxx_logical_or_to_and",
+        "cxx_remove_void_call",
+    ],
+    "default": ["cxx_default"],
+    "full": ["cxx_all"],
+}
+# Mutation-testing settings threaded through inject_and_test. sample_size enables sampled
+# scoring; threshold/escalate decide when a sampled estimate is re-run on the full set.
+# tce skips mutants that compile to the same -O2 IR as the original or as another mutant.
+# augment asks the LLM for extra tests against the survived mutants and re-runs only those.
+# minimize drops RUN_TEST cases that add no kills (verified to leave the score unchanged).
+MUTATION_DEFAULTS = {
+    "profile": "full",
+    "sample_size": None,
+    "sample_seed": 0,
+    "threshold": 50,
+    "escalate": True,
+    "tce": False,
+    "augment": False,
+    "minimize": False,
+}
+REPAIR_WORKERS = 4            # concurrent LLM repair requests
+REPAIR_FEEDBACK_CHARS = 3000  # tail of compiler/Unity output sent back to the LLM
+LOGS_DIR = "mull-reports/logs"  # per-target gzip logs of every build/test stage
+LOG_TAIL_CHARS = REPAIR_FEEDBACK_CHARS  # output kept in memory per stage; the full text is in the log
+TEST_CASE_BUDGET_MS = None    # fail a test binary whose slowest Unity case exceeds this (None: report only)
+SLOW_CASES_REPORTED = 5       # slowest cases listed in the run summary
+ALLOC_RESULTS_FILE = "alloc_profile_results.txt"  # per-configuration zlib heap usage (ALLOC_PROFILE builds)
+# test_results_mull.txt keeps its original columns; the profile/CI/population columns go to MULL_RESULTS_FILE
+LEGACY_RESULTS_FILE = "test_results_mull.txt"
+MULL_RESULTS_FILE = "mull_results.txt"
+PROFILES_DIR = "/tmp/profiles"  # in-container .profraw files, one per test run (see coverage_report.py)
+
+# Unity result line, as printed with UNITY_INCLUDE_EXEC_TIME:
+#   tests/tests_x.c:42:test_foo:PASS (3 ms)
+#   tests/tests_x.c:57:test_bar:FAIL: Expected 1 Was 2 (0 ms)
+UNITY_RESULT_PATTERN = re.compile(
+    r'(?P<file>[^\s:]+):(?P<line>\d+):(?P<name>\w+):(?P<status>PASS|FAIL|IGNORE)'
+    r'(?::\s?(?P<message>.*?))?(?:\s\((?P<ms>\d+) ms\))?\s*$',
+    re.MULTILINE
+)
+
+# Line printed at exit by binaries linked with harness/alloc_profile.c:
+#   ALLOC config=deflateInit2_(level=6,windowBits=15,memLevel=8,strategy=0) streams=1 allocs=5 ... peak_bytes=268096
+ALLOC_LINE_PATTERN = re.compile(
+    r'^ALLOC config=(?P<config>\S+) streams=(?P<streams>\d+) allocs=(?P<allocs>\d+) frees=(?P<frees>\d+) '
+    r'bytes=(?P<bytes>\d+) peak_bytes=(?P<peak_bytes>\d+)', re.MULTILINE
+)
 
 # ---------- container utilities (kept/adjusted from your script) ----------
 
-def start_container(HOST_ZLIB_PATH):
-    """Start a long-running container in the background (clean start)."""
+def start_container(HOST_ZLIB_PATH, use_ccache=True, use_pch=False, use_scratch=True, extra_volumes=None,
+                    profile_allocations=False):
+    """
+    Start a long-running container in the background (clean start).
+    use_ccache puts the ccache compiler wrappers first on PATH and mounts the persistent cache
+    volume; use_pch makes test objects force-include the precompiled tests_common.h;
+    use_scratch mounts a tmpfs at SCRATCH_DIR and exports it as TMPDIR, so files the tests
+    create are not written through the /zlib bind mount for every mutant.
+    extra_volumes: {host path: container path} mounted in addition to /zlib.
+    profile_allocations links test and benchmark binaries with the counting zcalloc/zcfree
+    of harness/alloc_profile.c (ALLOC_PROFILE=1 in the patched Makefile).
+    """
     subprocess.run(['podman', 'rm', '-f', CONTAINER_NAME],
                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     print(f"Starting container {CONTAINER_NAME}...")
+    options = []
+    if use_ccache:
+        options += ['-v', f'{CCACHE_VOLUME}:/ccache',
+                    '-e', 'PATH=/usr/lib/ccache:/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin']
+        for key, value in CCACHE_ENV.items():
+            options += ['-e', f'{key}={value}']
+    if use_pch:
+        options += ['-e', f'TESTS_PCH={TESTS_PCH}']
+    if profile_allocations:
+        options += ['-e', 'ALLOC_PROFILE=1']
+    if use_scratch:
+        options += ['--tmpfs', f'{SCRATCH_DIR}:rw,size={SCRATCH_SIZE},mode=1777',
+                    '-e', f'TMPDIR={SCRATCH_DIR}']
+    if CONTAINER_CPUS:
+        options += ['--cpus', str(CONTAINER_CPUS)]
+    if CONTAINER_MEMORY:
+        options += ['--memory', CONTAINER_MEMORY]
+    for host_path, container_path in (extra_volumes or {}).items():
+        options += ['-v', f'{host_path}:{container_path}']
     result = subprocess.run([
         'podman', 'run', '-d', '--name', CONTAINER_NAME, '--user', 'root',
-        '-v', f'{HOST_ZLIB_PATH}:/zlib', 'build-zlib', 'sleep', 'infinity'
+        '-v', f'{HOST_ZLIB_PATH}:/zlib', *options, 'build-zlib', 'sleep', 'infinity'
     ], capture_output=True, text=True)
     if result.returncode == 0:
         print("  ✓ Container started successfully")
@@ -38,15 +150,64 @@ def start_container(HOST_ZLIB_PATH):
         print(f"  ✗ Failed to start container: {result.stderr}")
         return False
 
-def run_in_container(command, show_output=False, timeout=120):
-    """Run command in container; returns subprocess.CompletedProcess."""
-    cmd = ['podman', 'exec', '-t', '-w', '/zlib', CONTAINER_NAME, 'bash', '-c', command]
+class CpuPool:
+    """Hands out disjoint sets of CPUs to concurrent jobs so they don't thrash each other."""
+
+    def __init__(self, cpus):
+        self.cpus = list(cpus)
+        self._free = list(cpus)
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def pinned(self, count=1):
+        """Block until count CPUs are free; yields them as a taskset list ("0,1,2")."""
+        count = max(1, min(count, len(self.cpus)))
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._free) >= count)
+            taken = self._free[:count]
+            del self._free[:count]
+        try:
+            yield ",".join(str(cpu) for cpu in taken)
+        finally:
+            with self._cond:
+                self._free.extend(taken)
+                self._cond.notify_all()
+
+
+# the container shares the host's CPUs (CONTAINER_CPUS is a quota, not a cpuset)
+CPU_POOL = CpuPool(sorted(os.sched_getaffinity(0)))
+
+
+def run_in_container(command, show_output=False, timeout=120, cpus=None, memory_mb=None):
+    """
+    Run command in container; returns subprocess.CompletedProcess.
+
+    The command runs under `timeout` in its own process group, so on expiry the whole
+    in-container process tree (make, test binary, mull-runner and their children) is killed,
+    not only the host-side podman client. If podman itself hangs, the job's process group is
+    killed through its pid file. cpus ("0,1") pins the job with taskset, memory_mb caps its
+    address space.
+    """
+    pid_file = f"{JOBS_DIR}/{uuid.uuid4().hex}.pid"
+    limits = f"ulimit -v {memory_mb * 1024}; " if memory_mb else ""
+    pinning = f"taskset -c {cpus} " if cpus else ""
+    wrapped = (f"mkdir -p {JOBS_DIR}; {limits}"
+               f"{pinning}timeout -k {KILL_GRACE} {timeout} bash -c {shlex.quote(command)} & "
+               f"echo $! > {pid_file}; wait $!; rc=$?; rm -f {pid_file}; exit $rc")
+    cmd = ['podman', 'exec', '-t', '-w', '/zlib', CONTAINER_NAME, 'bash', '-c', wrapped]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        # the in-container timeout fires first; this one only catches a hung podman client
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout + KILL_GRACE + 30)
     except subprocess.TimeoutExpired:
-        print(f"⚠ Command timed out after {timeout}s: {command}")
-        result = subprocess.CompletedProcess(cmd, returncode=1, stdout="", stderr="Timeout expired")
+        subprocess.run(['podman', 'exec', CONTAINER_NAME, 'bash', '-c',
+                        f'[ -f {pid_file} ] && kill -KILL -- -$(cat {pid_file}); rm -f {pid_file}'],
+                       capture_output=True)
+        result = subprocess.CompletedProcess(cmd, returncode=124, stdout="", stderr="")
+    # 124: terminated by timeout; 137: SIGKILLed, after the grace period or by the kernel
+    if result.returncode in (124, 137):
+        print(f"⚠ Command timed out or was killed after at most {timeout}s: {command}")
+        result.stderr = (result.stderr or "") + "Timeout expired"
     if show_output:
         if result.stdout:
             print(result.stdout)
@@ -62,6 +223,35 @@ def stop_container():
     print("  ✓ Container stopped")
 
 
+def install_harness_files(HOST_ZLIB_PATH):
+    """Copy the pipeline's C support files (harness/) into the zlib tree used by the container."""
+    harness_src = os.path.join(REPO_DIR, 'harness')
+    harness_dest = os.path.join(HOST_ZLIB_PATH, 'harness')
+    if os.path.exists(harness_src):
+        shutil.copytree(harness_src, harness_dest, dirs_exist_ok=True)
+
+
+def reset_ccache_stats():
+    """Zero the compiler cache statistics so the run summary only counts this run."""
+    run_in_container('ccache --zero-stats', show_output=False, timeout=60)
+
+
+def get_ccache_stats():
+    """Return {'hits', 'misses', 'hit_rate'} from `ccache --print-stats`, or None if unavailable."""
+    r = run_in_container('ccache --print-stats', show_output=False, timeout=60)
+    if r.returncode != 0:
+        return None
+    counters = {}
+    for line in (r.stdout or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].isdigit():
+            counters[parts[0]] = int(parts[1])
+    hits = counters.get("direct_cache_hit", 0) + counters.get("preprocessed_cache_hit", 0)
+    misses = counters.get("cache_miss", 0)
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": 100.0 * hits / lookups if lookups else 0.0}
+
+
 def clean_build():
     """Run make clean to remove previous build artifacts."""
     print("  Running make clean...")
@@ -125,22 +315,127 @@ def build_program(program_name):
         print("  " + "="*50)
         print(r.stderr[-800:] if r.stderr else "(empty)")
         print("  " + "="*50)
-        return False, r.stderr
+        # podman exec -t merges the compiler's stderr into stdout, keep both for diagnostics
+        return False, (r.stdout or "") + (r.stderr or "")
+
+def build_programs_batch(program_names, jobs=None):
+    """
+    Build many programs with a single `make -jN -k` invocation inside the container.
+    Success is decided per target by whether its binary exists afterwards; diagnostics are
+    attributed to a target when they mention its source, object or binary. Unattributed error
+    lines (e.g. a broken library object) are attached to every failed target.
+    Returns {program_name: (built, output)}.
+    """
+    if not program_names:
+        return {}
+    jobs = jobs or "$(nproc)"
+    targets = " ".join(program_names)
+    print(f"  Building {len(program_names)} targets with make -j{jobs} -k...")
+    # stale binaries from an earlier build would be mistaken for successes
+    run_in_container(f'rm -f {targets}', show_output=False)
+    r = run_in_container(f'make -j{jobs} -k {targets}', show_output=False, timeout=300 + 60 * len(program_names))
+    check = run_in_container(f'for t in {targets}; do [ -x "$t" ] && echo "$t"; done', show_output=False)
+    built_targets = set((check.stdout or "").split())
+
+    output_lines = ((r.stdout or "") + (r.stderr or "")).splitlines()
+    patterns = {name: re.compile(r'(?<![\w])' + re.escape(name) + r'(?![\w])') for name in program_names}
+    attributed = {name: [] for name in program_names}
+    unattributed = []
+    for line in output_lines:
+        owners = [name for name, pattern in patterns.items() if pattern.search(line)]
+        for name in owners:
+            attributed[name].append(line)
+        if not owners and re.search(r'error|Error|undefined reference', line):
+            unattributed.append(line)
+
+    results = {}
+    for name in program_names:
+        built = name in built_targets
+        lines = attributed[name] if built else attributed[name] + unattributed
+        results[name] = (built, "\n".join(lines))
+    print(f"  ✓ Batch build finished: {len(built_targets)} built / {len(program_names) - len(built_targets)} failed")
+    return results
+
+
+def parse_unity_results(stdout):
+    """
+    Parse Unity's per-case result lines into records with keys:
+    name, status (PASS/FAIL/IGNORE), file, line, message, duration_ms.
+    duration_ms is None when Unity was built without UNITY_INCLUDE_EXEC_TIME.
+    """
+    cases = []
+    for m in UNITY_RESULT_PATTERN.finditer(stdout or ""):
+        cases.append({
+            "name": m.group("name"),
+            "status": m.group("status"),
+            "file": m.group("file"),
+            "line": int(m.group("line")),
+            "message": m.group("message") or "",
+            "duration_ms": int(m.group("ms")) if m.group("ms") is not None else None,
+        })
+    return cases
+
+
+def parse_alloc_profile(output):
+    """
+    Parse the ALLOC lines of an ALLOC_PROFILE binary into records with keys:
+    config, streams, allocs, frees, bytes, peak_bytes. The last record is the total.
+    """
+    return [{"config": m.group("config"),
+             **{key: int(m.group(key)) for key in ("streams", "allocs", "frees", "bytes", "peak_bytes")}}
+            for m in ALLOC_LINE_PATTERN.finditer(output or "")]
+
+
+def append_alloc_profile(kind, program_name, function_name, records, file_path=ALLOC_RESULTS_FILE):
+    """Append the allocation records of one test or benchmark binary (kind) to the results file."""
+    if not records:
+        return
+    header_needed = not os.path.exists(file_path)
+    with open(file_path, "a") as f:
+        if header_needed:
+            f.write("timestamp,kind,program_name,function_name,config,streams,allocs,frees,bytes,peak_bytes\n")
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        for r in records:
+            f.write(f"{timestamp},{kind},{program_name},{function_name},\"{r['config']}\",{r['streams']},"
+                    f"{r['allocs']},{r['frees']},{r['bytes']},{r['peak_bytes']}\n")
+
 
-def run_tests(program_name):
-    """Run the compiled program inside container and capture output."""
+def run_tests(program_name, budget_ms=None):
+    """
+    Run the compiled program inside container and capture output.
+    Returns (passed, stdout, stderr, cases) with one record per Unity test case.
+    """
     print(f"  Running tests: ./{program_name}")
-    r = run_in_container(f'./{program_name}', show_output=False, timeout=120)
-    # Consider "FAIL" in stdout as a failing test; otherwise returncode 0 is success.
-    passed = (r.returncode == 0) and ("FAIL" not in (r.stdout or ""))
-    if passed:
+    # a uniquely named raw profile per run; the default (default.profraw in /zlib) would be overwritten
+    profile = f"{PROFILES_DIR}/{program_name}-%p.profraw"
+    with CPU_POOL.pinned(1) as cpus:
+        r = run_in_container(f'mkdir -p {PROFILES_DIR} && LLVM_PROFILE_FILE={profile} ./{program_name}',
+                             show_output=False, timeout=120, cpus=cpus, memory_mb=TEST_MEMORY_MB)
+    cases = parse_unity_results(r.stdout)
+    if cases:
+        # per-case results; a crash mid-suite leaves the remaining cases unreported and exits non-zero
+        failed = [c["name"] for c in cases if c["status"] == "FAIL"]
+        passed = (r.returncode == 0) and not failed
+    else:
+        # Consider "FAIL" in stdout as a failing test; otherwise returncode 0 is success.
+        passed = (r.returncode == 0) and ("FAIL" not in (r.stdout or ""))
+
+    for c in cases:
+        c["over_budget"] = budget_ms is not None and (c["duration_ms"] or 0) > budget_ms
+    over_budget = [c for c in cases if c["over_budget"]]
+
+    if passed and over_budget:
+        passed = False
+        print(f"  ✗ {len(over_budget)} test case(s) of {program_name} exceed the {budget_ms} ms budget: "
+              + ", ".join(f"{c['name']} ({c['duration_ms']} ms)" for c in over_budget))
+    elif passed:
         print(f"  ✓ Tests passed for {program_name}")
     else:
         print(f"  ✗ Tests failed / non-zero exit for {program_name}")
         # show a truncated output for diagnostics
         print((r.stdout or "")[:1000])
         print((r.stderr or "")[:1000])
-    return passed, r.stdout, r.stderr
+    return passed, r.stdout, r.stderr, cases
 
 
 import re
@@ -173,6 +468,27 @@ def extract_mutation_metrics_from_output(output):
     return (score, killed, survived, total)
 
 
+def extract_survived_mutants(output):
+    """
+    Extract the survived mutants listed by Mull's IDE reporter, e.g.
+      /zlib/trees.c:230:16: warning: Survived: Replaced >> with << [cxx_rshift_to_lshift]
+    Returns a list of dicts with keys: mutant_id, mutator, filename, line, column, description.
+    """
+    survived = []
+    pattern = r"^(\S+?):(\d+):(\d+): warning: Survived: (.*?) \[(\w+)\]\s*$"
+    for m in re.finditer(pattern, output, flags=re.MULTILINE):
+        filename, line, column, description, mutator = m.groups()
+        survived.append({
+            "mutant_id": f"{mutator}:{filename}:{line}:{column}",
+            "mutator": mutator,
+            "filename": filename,
+            "line": int(line),
+            "column": int(column),
+            "description": description,
+        })
+    return survived
+
+
 def avg(values):
     vals = [v for v in values if isinstance(v, (int, float))]
     average = sum(vals) / len(vals) if vals else 0
@@ -181,17 +497,24 @@ def avg(values):
 
 
 
-def run_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH):
-    """Run Mull mutation testing and save output to file."""
-    reports_dir = "mull-reports"
-    mkdir_cmd = f"mkdir -p {reports_dir}"
-    run_in_container(mkdir_cmd, show_output=False)
+def mutation_settings(**overrides):
+    """Return MUTATION_DEFAULTS updated with the given overrides."""
+    settings = dict(MUTATION_DEFAULTS)
+    settings.update(overrides)
+    return settings
 
 
-    # Replace mull.yml
+def write_mull_config(program_name, HOST_ZLIB_PATH, profile="full"):
+    """
+    Write mull.yml for the module with the mutators of the given profile.
+    The Mull IR frontend reads this at compile time, so it must be written before building.
+    """
+    if profile not in MULL_PROFILES:
+        raise ValueError(f"Unknown mutation profile '{profile}', expected one of {list(MULL_PROFILES)}")
+    mutators = "\n".join(f"  - {m}" for m in MULL_PROFILES[profile])
     mull_yml_content = f"""
 mutators:
-  - cxx_all
+{mutators}
 
 timeout: 10000
 
@@ -200,41 +523,50 @@ includePaths:
    """
     mull_yml_path = os.path.join(HOST_ZLIB_PATH, f"mull.yml")
     write_host_file(mull_yml_path, mull_yml_content)
+
+
+def run_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, profile="full"):
+    """Run Mull mutation testing with the given mutation profile and save the gzipped output to file."""
+    reports_dir = "mull-reports"
+    mkdir_cmd = f"mkdir -p {reports_dir}"
+    run_in_container(mkdir_cmd, show_output=False)
+
+    # Replace mull.yml
+    write_mull_config(program_name, HOST_ZLIB_PATH, profile)
     
-    
-    # Save output to mull-reports directory
-    output_file = f"{reports_dir}/mull_{program_name}_{function_name}.out"
-    print(f"  Running Mull mutation testing...")
+    # Save output to mull-reports directory (non-full profiles get their own file)
+    profile_suffix = "" if profile == "full" else f"_{profile}"
+    output_file = f"{reports_dir}/mull_{program_name}_{function_name}{profile_suffix}.out.gz"
+    print(f"  Running Mull mutation testing (profile: {profile})...")
     print(f"  Command: mull-runner-14 {test_filename} --debug")
     print(f"  Output will be saved to: {output_file}")
     
-    mull_cmd = f'mull-runner-14 {test_filename} --debug > {output_file} 2>&1'
-    r = run_in_container(mull_cmd, show_output=False, timeout=600)
+    # Mull derives mutant timeouts from the original test's run time, so give it dedicated CPUs
+    with CPU_POOL.pinned(len(CPU_POOL.cpus)) as cpus:
+        workers = len(cpus.split(","))
+        # --debug logs are large; compress them as they are written
+        mull_cmd = (f'set -o pipefail; mull-runner-14 {test_filename} --workers {workers} --debug 2>&1 '
+                    f'| gzip -1 > {output_file}')
+        r = run_in_container(mull_cmd, show_output=False, timeout=600, cpus=cpus)
     
     print(f"  Mull command return code: {r.returncode}")
-    cat_result = run_in_container(f'cat {output_file}')
-    if cat_result.returncode == 0:
-        output_text = cat_result.stdout
+    output_path = os.path.join(HOST_ZLIB_PATH, output_file)
+    output_text = read_report(output_path) if os.path.exists(output_path) else ""
 
     score, killed, survived, total = extract_mutation_metrics_from_output(output_text)
 
     # Check if output file was created and has content
-    check_cmd = f'[ -f {output_file} ] && wc -l {output_file}'
-    check_result = run_in_container(check_cmd, show_output=False)
-    
-    if check_result.returncode == 0:
+    if output_text:
+        output_lines = output_text.split('\n')
         print(f"  ✓ Mull completed, output saved to {output_file}")
-        print(f"    {check_result.stdout.strip()}")
+        print(f"    {len(output_lines)} lines")
         
         # Show a preview of the output
-        preview_cmd = f'head -30 {output_file}'
-        preview_result = run_in_container(preview_cmd, show_output=False)
-        if preview_result.returncode == 0:
-            print(f"  Preview of {output_file}:")
-            print("  " + "-"*50)
-            for line in preview_result.stdout.split('\n')[:30]:
-                print(f"  {line}")
-            print("  " + "-"*50)
+        print(f"  Preview of {output_file}:")
+        print("  " + "-"*50)
+        for line in output_lines[:30]:
+            print(f"  {line}")
+        print("  " + "-"*50)
         
         return score,killed,survived,total, output_file
     else:
@@ -244,37 +576,94 @@ includePaths:
         return score,killed,survived,total, output_file
 
 
+def read_report(path):
+    """Read a report or log file, transparently decompressing .gz files."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def append_log(HOST_ZLIB_PATH, target, stage, text):
+    """
+    Append one stage's output to the gzip log of a test target (one gzip member per append).
+    Returns the log path relative to the zlib tree.
+    """
+    log_file = f"{LOGS_DIR}/{target}.log.gz"
+    log_path = os.path.join(HOST_ZLIB_PATH, log_file)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with gzip.open(log_path, 'at', encoding='utf-8') as f:
+        f.write(f"===== {stage} =====\n{text or ''}\n")
+    return log_file
+
+
+def log_tail(text, limit=LOG_TAIL_CHARS):
+    """The part of a stage's output kept in memory."""
+    return (text or "")[-limit:]
+
+
 # ---------- file manipulation helpers ----------
-def copy_results_back(temp_zlib_path, original_zlib_path):
-    """Copy mutation testing results back to original directory."""
+def new_artifacts(temp_zlib_path, original_zlib_path, since):
+    """
+    Paths (relative to the zlib tree) of the artifacts a run produced: report files under
+    mull-reports/ modified after `since` (scratch files starting with '.' are skipped) and
+    tests/tests_*.c files whose content differs from the original tree (e.g. repaired tests).
+    """
+    artifacts = []
+    reports_root = os.path.join(temp_zlib_path, 'mull-reports')
+    for dirpath, dirnames, filenames in os.walk(reports_root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if not name.startswith('.') and os.path.getmtime(path) >= since:
+                artifacts.append(os.path.relpath(path, temp_zlib_path))
+
+    tests_src = os.path.join(temp_zlib_path, 'tests')
+    if os.path.exists(tests_src):
+        for item in os.listdir(tests_src):
+            if not (item.startswith('tests_') and item.endswith('.c')):
+                continue
+            rel_path = os.path.join('tests', item)
+            with open(os.path.join(temp_zlib_path, rel_path), 'rb') as f:
+                new_content = f.read()
+            dest_item = os.path.join(original_zlib_path, rel_path)
+            old_content = None
+            if os.path.exists(dest_item):
+                with open(dest_item, 'rb') as f:
+                    old_content = f.read()
+            if new_content != old_content:
+                artifacts.append(rel_path)
+    return sorted(artifacts)
+
+
+def copy_results_back(temp_zlib_path, original_zlib_path, since=0):
+    """
+    Copy the artifacts produced since `since` (reports, logs, rewritten tests) back to the
+    original directory in a single tar stream instead of one copy per file.
+    """
     print("Copying mutation testing results back to original directory...")
-    
-    # Copy mull-reports files if directory exists
-    mull_reports_src = os.path.join(temp_zlib_path, 'mull-reports')
-    if os.path.exists(mull_reports_src):
-        mull_reports_dest = os.path.join(original_zlib_path, 'mull-reports')
-        
-        # Create destination directory if it doesn't exist
-        os.makedirs(mull_reports_dest, exist_ok=True)
-        
-        # Copy each file individually (preserves other files, overwrites duplicates)
-        for item in os.listdir(mull_reports_src):
-            src_item = os.path.join(mull_reports_src, item)
-            dest_item = os.path.join(mull_reports_dest, item)
-            
-            if os.path.isfile(src_item):
-                shutil.copy2(src_item, dest_item)
-                print(f"  ✓ Copied {item}")
-            elif os.path.isdir(src_item):
-                # For subdirectories, remove and replace
-                if os.path.exists(dest_item):
-                    shutil.rmtree(dest_item)
-                shutil.copytree(src_item, dest_item)
-                print(f"  ✓ Copied directory {item}")
-        
-        print(f"  ✓ Merged results into mull-reports/")
-    else:
-        print("  No mull-reports directory found")
+    artifacts = new_artifacts(temp_zlib_path, original_zlib_path, since)
+    if not artifacts:
+        print("  No new results found")
+        return
+
+    pack = subprocess.Popen(['tar', '-C', temp_zlib_path, '-cf', '-', '--null', '-T', '-'],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    unpack = subprocess.Popen(['tar', '-C', original_zlib_path, '-xpf', '-'],
+                              stdin=pack.stdout, stderr=subprocess.PIPE)
+    pack.stdout.close()  # unpack owns the read end now
+    pack.stdin.write(b"\0".join(path.encode() for path in artifacts))
+    pack.stdin.close()
+    pack_err = pack.stderr.read()
+    pack.wait()
+    _, unpack_err = unpack.communicate()
+    if pack.returncode != 0 or unpack.returncode != 0:
+        print(f"  ✗ Copying results failed: {(pack_err + unpack_err).decode(errors='replace')[:500]}")
+        return
+
+    updated_tests = [path for path in artifacts if path.startswith('tests' + os.sep)]
+    print(f"  ✓ Copied {len(artifacts) - len(updated_tests)} report file(s) into mull-reports/")
+    for path in updated_tests:
+        print(f"  ✓ Copied updated test {os.path.basename(path)}")
  
 
 def write_host_file(path, content):
@@ -390,17 +779,201 @@ def create_global_wrapper_functions(original_code, function_signature):
         return original_code
 
 
+def create_all_global_wrappers(original_code, function_signatures):
+    """Inject the global wrappers for every given signature (each distinct signature once)."""
+    code = original_code
+    for function_signature in dict.fromkeys(function_signatures):
+        code = create_global_wrapper_functions(code, function_signature)
+    return code
+
+
 # ---------- main inject-and-test logic ----------
 
-def inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=True):
+def new_result_entry(function_name, **fields):
+    """Result record for one function; stages fill in their fields as they complete."""
+    entry = {
+        "function": function_name,
+        "test_filename": None,
+        "precheck": None,
+        "build": False,
+        "test": False,
+        "mull_profile": None,
+        "mull_score": None,
+        "mull_sampled": None,
+        "mull_population": None,
+        "mull_ci_low": None,
+        "mull_ci_high": None,
+        "mull_equivalent": None,
+        "mull_duplicate": None,
+        "mull_augmented_killed": None,
+        "minimized": None,
+        "mull_seconds": None,
+        "test_cases": [],
+        "alloc_profile": [],
+        "coverage": None,
+        "mull_total": 0,
+        "mull_killed": 0,
+        "mull_survived": 0,
+        "mull_output": None,
+        "log": None,
+        "stdout": "",
+        "stderr": "",
+        "build_output": ""
+    }
+    entry.update(fields)
+    return entry
+
+
+def test_one_function(program_name, function_name, test_filename, src_c_path, global_included_code, original_code,
+                      HOST_ZLIB_PATH, run_mutation_testing=True, run_precheck=True, mutation=None):
+    """
+    Precheck, build, run and (optionally) mutate the tests for one function with its global
+    wrapper injected into <program>.c. The original source is restored before returning.
+    Returns the result entry for the function.
+    """
+    # reject broken test files on the host before paying for a container build
+    if run_precheck:
+        test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{test_filename}.c")
+        prechecked, precheck_output = precheck_test_file(test_path, global_included_code, HOST_ZLIB_PATH)
+        if not prechecked:
+            return new_result_entry(function_name, precheck=False, build_output=log_tail(precheck_output),
+                                    log=append_log(HOST_ZLIB_PATH, test_filename, "precheck", precheck_output))
+
+    try:
+        # write modified code back to host file (visible inside container)
+        write_host_file(src_c_path, global_included_code)
+        print(f"  Wrote modified {src_c_path} (with global function wrapper)")
+
+        # build and run
+        built, build_output = build_program(test_filename)
+        return run_built_function(program_name, function_name, test_filename, built, build_output,
+                                  HOST_ZLIB_PATH, run_mutation_testing, precheck=True if run_precheck else None,
+                                  mutation=mutation)
+
+    finally:
+        # restore original file (so next function starts from clean source)
+        write_host_file(src_c_path, original_code)
+        print("  Restored original source file after test run.")
+
+
+def run_built_function(program_name, function_name, test_filename, built, build_output, HOST_ZLIB_PATH,
+                       run_mutation_testing=True, precheck=None, mutation=None):
+    """
+    Run the tests (and Mull) for a function whose test target has already been built.
+    Full build/test output goes to the target's gzip log; the entry only keeps its tail.
+    """
+    mutation = mutation_settings(**(mutation or {}))
+    result_entry = new_result_entry(
+        function_name,
+        test_filename=test_filename,
+        precheck=precheck,
+        build=built,
+        build_output=log_tail(build_output),
+        log=append_log(HOST_ZLIB_PATH, test_filename, "build", build_output)
+    )
+
+    if not built:
+        return result_entry
+
+    passed, stdout, stderr, cases = run_tests(test_filename, budget_ms=TEST_CASE_BUDGET_MS)
+    append_log(HOST_ZLIB_PATH, test_filename, "test", f"{stdout or ''}\n{stderr or ''}")
+    result_entry["test"] = passed
+    result_entry["stdout"] = log_tail(stdout)
+    result_entry["stderr"] = log_tail(stderr)
+    result_entry["test_cases"] = cases
+    result_entry["alloc_profile"] = parse_alloc_profile(f"{stdout or ''}\n{stderr or ''}")
+
+    # run Mull if enabled and tests passed
+    if passed and run_mutation_testing:
+        print(f"  Function {function_name} passed tests. Running mutation testing...")
+        mull_started = time.perf_counter()
+        if mutation["tce"] and mutation["sample_size"]:
+            print(f"  ⚠ tce and sample_size are exclusive; running TCE on all mutants, sample_size "
+                  f"{mutation['sample_size']} is ignored")
+        if mutation["tce"]:
+            # imported lazily: mull_tce builds on this module's container helpers
+            from mull_tce import run_tce_mull
+            tce = run_tce_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, mutation["profile"])
+            mull_score, mull_killed, mull_survived, mull_total, mull_output_file = (
+                tce["score"], tce["killed"], tce["survived"], tce["total"], tce["output_file"])
+            result_entry.update({
+                "mull_equivalent": tce["equivalent"],
+                "mull_duplicate": tce["duplicate"],
+            })
+        elif mutation["sample_size"]:
+            # imported lazily: mull_mutants builds on this module's container helpers
+            from mull_mutants import run_sampled_mull
+            sampled = run_sampled_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH,
+                                       mutation["sample_size"], seed=mutation["sample_seed"],
+                                       threshold=mutation["threshold"], escalate=mutation["escalate"],
+                                       profile=mutation["profile"])
+            mull_score, mull_killed, mull_survived, mull_total, mull_output_file = (
+                sampled["score"], sampled["killed"], sampled["survived"], sampled["total"], sampled["output_file"])
+            result_entry.update({
+                "mull_sampled": sampled["sampled"],
+                "mull_population": sampled["population"],
+                "mull_ci_low": sampled["ci_low"],
+                "mull_ci_high": sampled["ci_high"],
+            })
+        else:
+            mull_score, mull_killed, mull_survived, mull_total, mull_output_file = run_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH, mutation["profile"])
+        result_entry.update({
+            "mull_profile": mutation["profile"],
+            "mull_score": mull_score if mull_score != "N/A" else None,
+            "mull_total": mull_total,
+            "mull_killed": mull_killed,
+            "mull_survived": mull_survived,
+            "mull_output": mull_output_file,
+            "mull_seconds": round(time.perf_counter() - mull_started, 2),
+        })
+
+        if mutation["augment"] and mull_survived:
+            from mutant_augmentation import augment_for_survived_mutants
+            augment_for_survived_mutants(program_name, function_name, test_filename, HOST_ZLIB_PATH, result_entry)
+
+        if mutation["minimize"] and result_entry["mull_killed"]:
+            from minimize_tests import minimize_test_cases
+            result_entry["minimized"] = minimize_test_cases(function_name, test_filename, HOST_ZLIB_PATH)
+
+    if passed:
+        print(f"  ✓ Function {function_name} passed tests after injection.")
+    return result_entry
+
+
+def failure_feedback(result_entry, limit=REPAIR_FEEDBACK_CHARS):
+    """Return (failing_stage, truncated output) for a failed result entry, or (None, None)."""
+    if not result_entry["build"]:
+        return "build", result_entry["build_output"][-limit:]
+    if not result_entry["test"]:
+        output = (result_entry["stdout"] or "") + "\n" + (result_entry["stderr"] or "")
+        return "test", output.strip()[-limit:]
+    return None, None
+
+
+def inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=True, run_precheck=True,
+                    repair_attempts=0, batch_build=False, build_jobs=None, mutation=None):
     """
     For each injectable function (JSON at injectable_functions/<program>_injectable_functions.json),
     create the modified code and overwrite the source file <program>.c, build, run tests, and restore original file.
+    With run_precheck, test files that fail the host-side syntax/symbol precheck are recorded as
+    build failures without a container build.
+
+    With repair_attempts > 0, a failing build/test is sent back to the LLM together with its truncated
+    compiler/Unity output. Repairs run in background threads while the remaining functions are processed;
+    each repaired file re-enters at the build stage, up to repair_attempts times per function.
+
+    With batch_build, the wrappers of all functions are injected at once and every test target of
+    the module is built by a single `make -j<build_jobs> -k` before tests are run one by one.
+
+    mutation holds the mutation-testing settings (see MUTATION_DEFAULTS): the profile selects the
+    mutator set (see MULL_PROFILES) and is recorded with every score; a sample_size switches to
+    sampled scoring with a confidence interval.
     """
+    mutation = mutation_settings(**(mutation or {}))
     injectable_json = os.path.join(INJECTABLE_FUNCTION_PATH, f"{program_name}_injectable_functions.json")
     if not os.path.exists(injectable_json):
         print(f"No injectable JSON found: {injectable_json}")
-        return
+        return []
 
     # load injectable functions
     with open(injectable_json, 'r', encoding='utf-8') as f:
@@ -409,82 +982,140 @@ def inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_
     src_c_path = os.path.join(HOST_ZLIB_PATH, f"{program_name}.c")
     if not os.path.exists(src_c_path):
         print(f"ERROR: source file not found: {src_c_path}")
-        return
+        return []
 
     # backup original
     with open(src_c_path, 'r', encoding='utf-8') as f:
         original_code = f.read()
 
     results = []
+    repair_executor = None
+    pending_repairs = {}  # future -> (index into results, function info, attempt)
+    if repair_attempts > 0:
+        # imported lazily: the LLM stack is only needed when repairs are enabled
+        from test_gpt5_generation import initialize_llm, RepairUnityTests, repair_unity_tests_with_llm
+        repairer = initialize_llm(signature=RepairUnityTests)
+        repair_executor = ThreadPoolExecutor(max_workers=REPAIR_WORKERS)
+
+    def submit_repair(index, info, attempt):
+        stage, feedback = failure_feedback(results[index])
+        if stage is None or attempt > repair_attempts:
+            return
+        test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{info['test_filename']}.c")
+        with open(test_path, 'r', encoding='utf-8', errors='replace') as f:
+            tests_c = f.read()
+        print(f"  Queued repair {attempt}/{repair_attempts} for {info['function_name']} ({stage} failure)")
+        future = repair_executor.submit(
+            repair_unity_tests_with_llm, repairer, f"{program_name}.c", info['global_included_code'],
+            info['function_signature'], tests_c, stage, feedback
+        )
+        pending_repairs[future] = (index, info, attempt)
+
+    # #ifdef variants in JSON from older discovery share one test file; run it once
+    functions_to_test, seen_tests = [], set()
+    for func in injectable_functions:
+        if func.get("test_filename") and func["test_filename"] not in seen_tests:
+            seen_tests.add(func["test_filename"])
+            functions_to_test.append(func)
+    if len(seen_tests) < sum(1 for func in injectable_functions if func.get("test_filename")):
+        print(f"  Skipping duplicate entries in {injectable_json}")
+    batch_builds = {}
+    batch_seconds_per_target = 0.0
+    all_wrappers_code = None
+    tracker = get_tracker(program_name, len(functions_to_test))
 
     try:
-        for func in injectable_functions:
+        # the Mull frontend picks up mull.yml at compile time, so the profile must be in place before any build
+        if run_mutation_testing:
+            write_mull_config(program_name, HOST_ZLIB_PATH, mutation["profile"])
+
+        if batch_build:
+            print("\n" + "-"*60)
+            print(f"Batch building {len(functions_to_test)} test targets for {program_name}")
+            all_wrappers_code = create_all_global_wrappers(
+                original_code, [func["function_signature"] for func in functions_to_test]
+            )
+            batch_targets = []
+            for func in functions_to_test:
+                test_filename = func["test_filename"].split(".")[0]
+                if run_precheck:
+                    test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{test_filename}.c")
+                    prechecked, precheck_output = precheck_test_file(test_path, all_wrappers_code, HOST_ZLIB_PATH)
+                    if not prechecked:
+                        batch_builds[test_filename] = (False, precheck_output, False)
+                        continue
+                batch_targets.append(test_filename)
+            write_host_file(src_c_path, all_wrappers_code)
+            print(f"  Wrote modified {src_c_path} (with all global function wrappers)")
+            batch_started = time.perf_counter()
+            for target, (built, output) in build_programs_batch(batch_targets, build_jobs).items():
+                batch_builds[target] = (built, output, True if run_precheck else None)
+            # the shared build is charged evenly to the functions in the job cost history
+            batch_seconds_per_target = (time.perf_counter() - batch_started) / max(1, len(functions_to_test))
+
+        for func in functions_to_test:
             function_name = func.get("function_name")
             function_signature = func["function_signature"]
-            if not func.get("test_filename"):
-                continue
             test_filename = func.get("test_filename").split(".")[0]
             print("\n" + "-"*60)
             print(f"Processing function: {function_name}")
-            # create modified code by appending include
-            global_included_code = create_global_wrapper_functions(original_code, function_signature)
-
-            # write modified code back to host file (visible inside container)
-            write_host_file(src_c_path, global_included_code)
-            print(f"  Wrote modified {src_c_path} (with global function wrapper)")
-
-            # build and run
-            built, build_output = build_program(test_filename)
-
-            result_entry = {
-                "function": function_name,
-                "build": built,
-                "test": False,
-                "mull_score": None,
-                "mull_total": 0,
-                "mull_killed": 0,
-                "mull_survived": 0,
-                "mull_output": None,
-                "stdout": "",
-                "stderr": "",
-                "build_output": build_output or ""
-            }
-
-            if not built:
-                # restore original and continue
-                write_host_file(src_c_path, original_code)
-                print("  Restored code after failed build.")
-                results.append(result_entry)
-                continue
-
-
-            passed, stdout, stderr = run_tests(test_filename)
-            result_entry["test"] = passed
-            result_entry["stdout"] = stdout or ""
-            result_entry["stderr"] = stderr or ""
-            
-            # run Mull if enabled and tests passed
-            if passed and run_mutation_testing:
-                print(f"  Function {function_name} passed tests. Running mutation testing...")
-                mull_score, mull_killed, mull_survived, mull_total, mull_output_file = run_mull(program_name, function_name, test_filename, HOST_ZLIB_PATH)
-                result_entry.update({
-                    "mull_score": mull_score if mull_score != "N/A" else None,
-                    "mull_total": mull_total,
-                    "mull_killed": mull_killed,
-                    "mull_survived": mull_survived,
-                    "mull_output": mull_output_file
-                })
-
+            function_started = time.perf_counter()
+
+            if batch_build:
+                global_included_code = all_wrappers_code
+                built, build_output, precheck = batch_builds[test_filename]
+                result_entry = run_built_function(program_name, function_name, test_filename, built, build_output,
+                                                  HOST_ZLIB_PATH, run_mutation_testing, precheck, mutation)
+            else:
+                # create modified code by appending include
+                global_included_code = create_global_wrapper_functions(original_code, function_signature)
+                result_entry = test_one_function(
+                    program_name, function_name, test_filename, src_c_path, global_included_code, original_code,
+                    HOST_ZLIB_PATH, run_mutation_testing, run_precheck, mutation
+                )
             results.append(result_entry)
-
-            if passed:
-                print(f"  ✓ Function {function_name} passed tests after injection.")
-            
-            # restore original file (so next iteration starts from clean source)
+            tracker.function_done(program_name, result_entry,
+                                  time.perf_counter() - function_started + batch_seconds_per_target)
+
+            if repair_executor:
+                info = {
+                    "function_name": function_name,
+                    "function_signature": function_signature,
+                    "test_filename": test_filename,
+                    "global_included_code": global_included_code,
+                }
+                submit_repair(len(results) - 1, info, 1)
+
+        if batch_build:
             write_host_file(src_c_path, original_code)
-            print("  Restored original source file after test run.")
+
+        # drain repairs: re-test each repaired file as soon as its LLM call returns
+        while pending_repairs:
+            done, _ = wait(pending_repairs, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, info, attempt = pending_repairs.pop(future)
+                repaired = future.result()
+                if not repaired:
+                    continue
+                print("\n" + "-"*60)
+                print(f"Re-testing repaired function: {info['function_name']} (attempt {attempt}/{repair_attempts})")
+                test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"{info['test_filename']}.c")
+                write_host_file(test_path, repaired)
+                function_started = time.perf_counter()
+                result_entry = test_one_function(
+                    program_name, info['function_name'], info['test_filename'], src_c_path,
+                    info['global_included_code'], original_code, HOST_ZLIB_PATH, run_mutation_testing, run_precheck,
+                    mutation
+                )
+                result_entry["repair_attempts"] = attempt
+                results[index] = result_entry
+                tracker.function_done(program_name, result_entry, time.perf_counter() - function_started, repeat=True)
+                submit_repair(index, info, attempt + 1)
 
     finally:
+        tracker.module_done(program_name)
+        if repair_executor:
+            repair_executor.shutdown(wait=False, cancel_futures=True)
         # ensure source restored even if exception occurs
         if os.path.exists(src_c_path):
             write_host_file(src_c_path, original_code)
@@ -494,12 +1125,30 @@ def inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_
     print(f"Results for program {program_name}:")
     for r in results:
         status = f"build={'✓' if r['build'] else '✗'}, test={'✓' if r['test'] else '✗'}, mull_score={r['mull_score'] if r['mull_score'] is not None else 'N/A'}"
+        if r.get("mull_profile"):
+            status += f" ({r['mull_profile']})"
+        if r.get("mull_equivalent") is not None:
+            status += f", {r['mull_equivalent']} equivalent / {r['mull_duplicate']} duplicate mutants skipped"
+        if r.get("mull_augmented_killed"):
+            status += f", +{r['mull_augmented_killed']} killed by augmented tests"
+        if r.get("minimized"):
+            status += f", minimized {r['minimized']['cases_before']}->{r['minimized']['cases_after']} cases"
+        if r.get("mull_sampled"):
+            status += f" ~{r['mull_ci_low']}-{r['mull_ci_high']} from {r['mull_sampled']}/{r['mull_population']} mutants"
+        if r.get("repair_attempts"):
+            status += f", repaired after {r['repair_attempts']} attempt(s)"
         print(f"  {r['function']}: {status}")
     print("="*40)
     return results
 
 
-def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_testing):
+def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_testing, repair_attempts=0,
+                                                  use_ccache=True, use_pch=False, use_scratch=True,
+                                                  batch_build=False, build_jobs=None,
+                                                  mull_profile="full", mull_sample_size=None, mull_sample_seed=0,
+                                                  mull_threshold=50, mull_escalate=True, mull_tce=False,
+                                                  mull_augment=False, minimize_tests=False, profile_allocations=False,
+                                                  collect_coverage=False):
     original_zlib_path = os.path.join(SCRIPT_DIR, '..', 'zlib')
     original_zlib_path = os.path.abspath(original_zlib_path)
 
@@ -508,6 +1157,8 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
     HOST_ZLIB_PATH = os.path.join(temp_dir, 'zlib')
 
     print(f"Creating temporary copy: {HOST_ZLIB_PATH}")
+    # copytree keeps mtimes, so anything under mull-reports/ newer than this was produced by the run
+    run_started = time.time()
     shutil.copytree(original_zlib_path, HOST_ZLIB_PATH, symlinks=True)
 
     # Compute injectable path from temp copy
@@ -515,15 +1166,29 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
     
 
     try:
-        if not start_container(HOST_ZLIB_PATH):
+        install_harness_files(HOST_ZLIB_PATH)
+        if not start_container(HOST_ZLIB_PATH, use_ccache=use_ccache, use_pch=use_pch, use_scratch=use_scratch,
+                               profile_allocations=profile_allocations):
             raise SystemExit("Failed to start container")
+        if use_ccache:
+            reset_ccache_stats()
 
         print("\n" + "="*60)
         print("STEP 3: Inject tests and build")
         print("="*60)
-        results = inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=enable_mutation_testing)
-
-        file_path = "test_results_mull.txt"
+        results = inject_and_test(program_name, HOST_ZLIB_PATH, INJECTABLE_FUNCTION_PATH, run_mutation_testing=enable_mutation_testing,
+                                  repair_attempts=repair_attempts, batch_build=batch_build, build_jobs=build_jobs,
+                                  mutation=mutation_settings(profile=mull_profile, sample_size=mull_sample_size,
+                                                             sample_seed=mull_sample_seed, threshold=mull_threshold,
+                                                             escalate=mull_escalate, tce=mull_tce,
+                                                             augment=mull_augment, minimize=minimize_tests))
+
+        if collect_coverage:
+            # imported lazily: coverage_report builds on this module's container helpers
+            from coverage_report import collect_coverage_for_program
+            collect_coverage_for_program(program_name, HOST_ZLIB_PATH, results)
+
+        file_path = LEGACY_RESULTS_FILE
         header_needed = not os.path.exists(file_path)
         with open(file_path, "a") as f:
             if header_needed:
@@ -534,6 +1199,32 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
                     f"{r['mull_score'] if r['mull_score'] is not None else 'N/A'},"
                     f"{r['mull_total']},{r['mull_killed']},{r['mull_survived']}\n"
                 )
+        file_path = MULL_RESULTS_FILE
+        header_needed = not os.path.exists(file_path)
+        with open(file_path, "a") as f:
+            if header_needed:
+                f.write("program_name,function_name,build,test,mull_score,mull_total,mull_killed,mull_survived,mull_profile,mull_ci_low,mull_ci_high,mull_population\n")
+            for r in results:
+                f.write(
+                    f"{program_name},{r['function']},{r['build']},{r['test']},"
+                    f"{r['mull_score'] if r['mull_score'] is not None else 'N/A'},"
+                    f"{r['mull_total']},{r['mull_killed']},{r['mull_survived']},{r['mull_profile'] or 'N/A'},"
+                    f"{r['mull_ci_low'] if r['mull_ci_low'] is not None else 'N/A'},"
+                    f"{r['mull_ci_high'] if r['mull_ci_high'] is not None else 'N/A'},"
+                    f"{r['mull_population'] if r['mull_population'] is not None else r['mull_total']}\n"
+                )
+
+        # per-case Unity results with timings, stored with the run's reports
+        cases_file = os.path.join(HOST_ZLIB_PATH, "mull-reports", f"test_cases_{program_name}.json")
+        write_host_file(cases_file, json.dumps({r['function']: r['test_cases'] for r in results}, indent=2))
+        for r in results:
+            append_alloc_profile("test", program_name, r['function'], r['alloc_profile'])
+        alloc_totals = sorted(((r['function'], r['alloc_profile'][-1]) for r in results if r['alloc_profile']),
+                              key=lambda ft: ft[1]['peak_bytes'], reverse=True)
+        timed_cases = sorted(
+            ((r['function'], c) for r in results for c in r['test_cases'] if c['duration_ms'] is not None),
+            key=lambda fc: fc[1]['duration_ms'], reverse=True
+        )
 
         # # Count build and test successes/failures
         total = len(results)
@@ -550,11 +1241,26 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
         print(f"  Build: {build_success} ✓ / {build_fail} ✗")
         print(f"  Test:  {test_success} ✓ / {test_fail} ✗")
         if enable_mutation_testing:
-            print(f"  Mull:  {mull_score} from {mull_total} ")
+            print(f"  Mull:  {mull_score} from {mull_total} (profile: {mull_profile})")
+        if use_ccache:
+            ccache_stats = get_ccache_stats()
+            if ccache_stats:
+                print(f"  ccache: {ccache_stats['hits']} hits / {ccache_stats['misses']} misses "
+                      f"({ccache_stats['hit_rate']:.1f}% hit rate){' with PCH' if use_pch else ''}")
+        if timed_cases:
+            print(f"  Slowest test cases:")
+            for function_name, c in timed_cases[:SLOW_CASES_REPORTED]:
+                budget_note = " (over budget)" if c['over_budget'] else ""
+                print(f"    {c['duration_ms']:>6} ms  {function_name}: {c['name']}{budget_note}")
+        if alloc_totals:
+            print(f"  Largest zlib heap peaks (details in {ALLOC_RESULTS_FILE}):")
+            for function_name, t in alloc_totals[:SLOW_CASES_REPORTED]:
+                print(f"    {t['peak_bytes'] / 1024:>8.1f} KiB  {function_name} ({t['allocs']} allocations, "
+                      f"{t['bytes'] / 1024:.1f} KiB total)")
         print(f"  ")
         print("="*40)
         #write to txt tile the programname, Total,build_success, test_success
-        file_path = "test_results_mull.txt"
+        file_path = LEGACY_RESULTS_FILE
         header_needed = not os.path.exists(file_path)
         with open(file_path, "a") as f:
             if header_needed:
@@ -564,7 +1270,7 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
 
     finally:
         stop_container()
-        copy_results_back(HOST_ZLIB_PATH, original_zlib_path)
+        copy_results_back(HOST_ZLIB_PATH, original_zlib_path, since=run_started)
         # Clean up temp directory
         print(f"Removing temporary directory: {temp_dir}")
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -573,4 +1279,5 @@ def run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_
 if __name__ == "__main__":
     program_name = "trees"  # change as needed
     enable_mutation_testing = True  # set to False to skip mutation testing
-    run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_testing)
\ No newline at end of file
+    repair_attempts = 0  # set > 0 to let the LLM repair failing tests
+    run_build_execute_mutate_for_one_zlib_program(program_name, enable_mutation_testing, repair_attempts)
\ No newline at end of file
@@ -5,20 +5,82 @@ import tree_sitter_c as tsc
 import re
 from pathlib import Path
 import json
+import subprocess
+import time
+from llm_record_replay import RecordReplayConverter
+from precheck_tests import check_symbols, configured_defines, find_precheck_compiler
+from test_container_one_mull import create_all_global_wrappers
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 HOST_ZLIB_PATH = os.path.join(SCRIPT_DIR, '..', 'zlib')
 HOST_ZLIB_PATH = os.path.abspath(HOST_ZLIB_PATH)
 INJECTABLE_FUNCTION_PATH = os.path.join(HOST_ZLIB_PATH, 'injectable_functions')
 
+# LLM backend: "live" (default), "record" (live + archive every response) or "replay" (archive only, no network)
+LLM_MODE = os.environ.get("LLM_MODE", "live")
+LLM_ARCHIVE_PATH = os.environ.get("LLM_ARCHIVE", os.path.join(SCRIPT_DIR, 'llm_archive', 'llm_archive.jsonl.gz'))
+LLM_USAGE_LOG = os.path.join(SCRIPT_DIR, 'llm_usage.jsonl')  # token usage and latency of each batched request
 
-def get_function_info(c_file, parser):
+# batched test generation: several small functions per request behind one stable module prefix
+LLM_BATCH_SIZE = int(os.environ.get("LLM_BATCH_SIZE", "1"))  # 1 = one request per function
+BATCH_MAX_LINES = 60  # functions with more non-empty lines always get a request of their own
+BATCH_FILE_MARKER = re.compile(r'^\s*/\*\s*=+\s*(tests_[0-9A-Za-z_.]+?\.c)\s*=+\s*\*/\s*$', re.MULTILINE)
+
+C_KEYWORDS = frozenset(
+    "auto break case char const continue default do double else enum extern float for goto if inline int long "
+    "register restrict return short signed sizeof static struct switch typedef union unsigned void volatile while "
+    "_Bool _Complex _Noreturn _Static_assert _Thread_local".split()
+)
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_]\w*$')
+LINE_MARKER_PATTERN = re.compile(r'^# (\d+) "(.*)"')
+
+
+def active_source_lines(c_file, zlib_path=HOST_ZLIB_PATH):
+    """
+    Map line number -> preprocessed text for the lines of c_file that survive the preprocessor
+    under the configure-chosen defines (the same -D/-U flags the build uses). Lines in inactive
+    #if branches are absent. Returns None when no host compiler is available or cpp fails.
+    """
+    compiler = find_precheck_compiler()
+    if compiler is None:
+        return None
+    cmd = [compiler, '-E', *configured_defines(zlib_path), f'-I{zlib_path}', c_file]
+    try:
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        return None
+    if r.returncode != 0:
+        print(f"  Preprocessing {c_file} failed, using the raw source:\n{r.stderr[-500:]}")
+        return None
+
+    lines = {}
+    in_file, line_number = False, 0
+    for text in r.stdout.splitlines():
+        marker = LINE_MARKER_PATTERN.match(text)
+        if marker:
+            line_number = int(marker.group(1))
+            in_file = marker.group(2) == c_file
+            continue
+        # cpp keeps short skipped stretches as blank lines; only text counts as active
+        if in_file and text.strip():
+            lines[line_number] = text
+        line_number += 1
+    return lines
+
+
+def get_function_info(c_file, parser, zlib_path=HOST_ZLIB_PATH):
     """
     Extract detailed information about all functions (except main).
+
+    Functions are discovered in the raw source (so signatures keep ZEXPORT/local), but only
+    definitions in code the preprocessor keeps under the configured defines are returned: of
+    #ifdef variants of a function only the active one remains, names are deduplicated, and
+    misparsed macro code (keywords or non-identifiers as names) is rejected.
     
     Args:
         c_file: Path to the C source file
         parser: tree-sitter Parser instance
+        zlib_path: configured zlib tree whose Makefile supplies the -D/-U flags
     
     Returns:
         List of dicts with keys: 'name', 'start_byte', 'end_byte', 'code', 'signature'
@@ -27,8 +89,10 @@ def get_function_info(c_file, parser):
     with open(c_file, 'rb') as f:
         c_code = f.read()
     tree = parser.parse(c_code)
+    active_lines = active_source_lines(c_file, zlib_path)
     
     functions = []
+    seen_names = set()
     
     def get_function_signature(func_def_node):
         """Extract the function signature (return type + declarator)"""
@@ -53,14 +117,26 @@ def get_function_info(c_file, parser):
         if node.type == 'function_definition':
             # Extract function name
             func_name = None
+            name_line = None
             for child in node.children:
                 if child.type == 'function_declarator':
                     for subchild in child.children:
                         if subchild.type == 'identifier':
                             func_name = c_code[subchild.start_byte:subchild.end_byte].decode('utf-8')
+                            name_line = subchild.start_point[0] + 1
                             break
                     break
-            
+
+            if func_name and (func_name in C_KEYWORDS or not IDENTIFIER_PATTERN.match(func_name)):
+                print(f"  Skipping bogus function name {func_name!r} (line {name_line})")
+                func_name = None
+            elif func_name and active_lines is not None and func_name not in active_lines.get(name_line, ""):
+                print(f"  Skipping {func_name} at line {name_line}: disabled by the preprocessor configuration")
+                func_name = None
+            elif func_name in seen_names:
+                print(f"  Skipping duplicate definition of {func_name} at line {name_line}")
+                func_name = None
+
             # Skip main function
             if func_name and func_name != 'main':
                 func_code = c_code[node.start_byte:node.end_byte].decode('utf-8')
@@ -70,6 +146,7 @@ def get_function_info(c_file, parser):
                     return
                 
                 signature = get_function_signature(node)
+                seen_names.add(func_name)
                 
                 functions.append({
                     'name': func_name,
@@ -114,6 +191,7 @@ class FunctionToUnityTests(dspy.Signature):
         ```
     - Create multiple test functions: void test_<function_name>_xxx(void) { ... }. Each test function should set up the necessary preconditions, call the target function, and use Unity assertions to verify expected outcomes.
     - Define main() that calls UNITY_BEGIN(), RUN_TEST() for each test, and returns UNITY_END().
+    - TEMPORARY FILES: Tests run with a RAM-backed scratch directory in the TMPDIR environment variable, and the same binary may run several times concurrently. Create every file the test needs (e.g., .gz files for gzopen/gzread/gzwrite) under getenv("TMPDIR") (fall back to "/tmp" if unset) with a unique name, e.g. via mkstemp() or by including getpid() and the test name. Never write into the current directory, and remove the files in the test or in tearDown().
     - CRITICAL RULES FOR STDOUT/STDERR REDIRECTION: Unity's TEST_ASSERT macros write to stdout. If your test redirects stdout (common for I/O testing), do NOT use TEST_ASSERT macros while stdout is redirected. Use simple if-checks with return NULL for errors. Only use TEST_ASSERT before redirection or after restoration.
     """
     module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'gzread.c')")
@@ -121,20 +199,142 @@ class FunctionToUnityTests(dspy.Signature):
     target_function_name: str = dspy.InputField(description="Name of the specific function to test")
     tests_c: str = dspy.OutputField(description="Complete Unity test file that thoroughly tests ONLY the target function")
 
-def initialize_llm():
+class FunctionsToUnityTestsBatch(dspy.Signature):
     """
-    Initialize the LLM once and return the configured converter.
+    You will be given a zlib source module and its contents, along with a list of SEVERAL SPECIFIC FUNCTIONS within it.
+    Your task is to write one standalone test suite per function (tests_{module_name}_{function_name}.c), each testing ONLY its function, using the Unity Testing Framework.
+
+    CONTEXT:
+    You should call the functions directly without redefining them in the test files.
+    For every function declared local in the source code, I have added a global wrapper function named test_{function_name} in the source code. Call the global wrapper test_{function_name} instead of the original local function.
+    Each file is built on its own with ONLY its own function's wrapper present: a file may call test_{function_name} of its own function and no other test_ wrapper, even though the module shows the wrappers of the other functions.
+    Do not redefine internal structs, functions, or macros from the zlib source — this can cause compilation errors or runtime issues. Use the existing definitions.
+
+    REQUIRED FORMAT for each `tests_{module_name}_{function_name}.c`: A Unity test file that thoroughly tests the given function's functionality.
+    - At the top of the file, include "unity/unity.h" and "zlib.h", and any other standard headers needed for the test code itself (e.g., stdlib.h, string.h, math.h).
+    - Implement setUp() and tearDown() functions for Unity (empty bodies are fine).
+    - Create multiple test functions: void test_<function_name>_xxx(void) { ... }. Each test function should set up the necessary preconditions, call the target function, and use Unity assertions to verify expected outcomes.
+    - Define main() that calls UNITY_BEGIN(), RUN_TEST() for each test, and returns UNITY_END().
+    - TEMPORARY FILES: Tests run with a RAM-backed scratch directory in the TMPDIR environment variable, and the same binary may run several times concurrently. Create every file the test needs under getenv("TMPDIR") (fall back to "/tmp" if unset) with a unique name, e.g. via mkstemp() or by including getpid() and the test name. Never write into the current directory, and remove the files in the test or in tearDown().
+    - CRITICAL RULES FOR STDOUT/STDERR REDIRECTION: Unity's TEST_ASSERT macros write to stdout. If your test redirects stdout, do NOT use TEST_ASSERT macros while stdout is redirected. Only use TEST_ASSERT before redirection or after restoration.
+
+    OUTPUT: the files are compiled as separate programs, so each one must be complete on its own.
+    Write one file for EVERY function in the list, in the same order, each starting with a marker line of exactly this form:
+        /* ===== tests_{module_name}_{function_name}.c ===== */
+    where {module_name} is the module name without ".c". Put nothing but the files after the markers.
+    """
+    module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'gzread.c')")
+    module_code: str = dspy.InputField(description="The full contents of the zlib source file, with the global wrappers of all its local functions")
+    target_function_names: str = dspy.InputField(description="Signatures of the functions to test, one per line")
+    tests_files: str = dspy.OutputField(description="One complete Unity test file per function, each preceded by its marker line")
+
+class RepairUnityTests(dspy.Signature):
+    """
+    You will be given a zlib source module, the SPECIFIC FUNCTION under test, a Unity test file
+    (tests_{module_name}_{function_name}.c) written for it, and the truncated output of the stage where it failed
+    (compiler/linker errors for the "build" stage, Unity/runtime output for the "test" stage).
+    Your task is to return a corrected version of the complete test file.
+
+    RULES:
+    - Fix the reported errors with the smallest changes that make the file build and pass. Keep the existing test cases where possible.
+    - For "test" failures, a failing assertion means the expected value in the test is wrong; correct the expectation from the source code rather than deleting the check. Remove a test case only if it cannot be made correct.
+    - Keep the same conventions as the original file: include "unity/unity.h" and "zlib.h", call the global wrapper test_{function_name} for functions declared local, and do not redefine zlib structs, functions or macros.
+    - Keep setUp(), tearDown() and a main() that calls UNITY_BEGIN(), RUN_TEST() for each test, and returns UNITY_END().
+    """
+    module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'gzread.c')")
+    module_code: str = dspy.InputField(description="The full contents of the zlib source file, including global wrappers")
+    target_function_name: str = dspy.InputField(description="Name of the specific function under test")
+    tests_c: str = dspy.InputField(description="The failing Unity test file")
+    failure_stage: str = dspy.InputField(description="Stage that failed: 'build' or 'test'")
+    failure_output: str = dspy.InputField(description="Truncated compiler or test output from the failing stage")
+    repaired_tests_c: str = dspy.OutputField(description="Complete corrected Unity test file")
+
+class SurvivedMutantsToUnityTests(dspy.Signature):
+    """
+    You will be given a zlib source module, the SPECIFIC FUNCTION under test, its passing Unity test file
+    (tests_{module_name}_{function_name}.c), and a list of mutants that SURVIVED this test file under mutation testing.
+    Each mutant is a single small change to the source (location, mutation operator, description and the original source line).
+    Your task is to return the complete test file with ADDITIONAL test cases that kill these mutants.
+
+    RULES:
+    - Keep every existing test case and RUN_TEST unchanged; only add new test functions and their RUN_TEST calls.
+    - Each new test must pass on the original code and fail when one of the listed mutants is applied. Target the exact
+      conditions, boundaries and side effects the mutated line controls.
+    - Keep the same conventions as the original file: include "unity/unity.h" and "zlib.h", call the global wrapper
+      test_{function_name} for functions declared local, and do not redefine zlib structs, functions or macros.
+    """
+    module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'gzread.c')")
+    module_code: str = dspy.InputField(description="The full contents of the zlib source file, including global wrappers")
+    target_function_name: str = dspy.InputField(description="Name of the specific function under test")
+    tests_c: str = dspy.InputField(description="The current, passing Unity test file")
+    survived_mutants: str = dspy.InputField(description="One survived mutant per line: file:line:column [mutator] description | source line")
+    augmented_tests_c: str = dspy.OutputField(description="Complete Unity test file with the additional mutant-killing test cases")
+
+class FunctionToBenchmark(dspy.Signature):
+    """
+    You will be given a zlib source module and its contents, along with the name of a SPECIFIC PUBLIC FUNCTION within it (part of the zlib API declared in zlib.h).
+    Your task is to write a standalone micro-benchmark (bench_{module_name}_{function_name}.c) that measures the speed of ONLY this function.
+
+    REQUIRED FORMAT for `bench_{module_name}_{function_name}.c`:
+    - Include "zlib.h" and the standard headers the benchmark needs (e.g., stdio.h, stdlib.h, string.h, time.h). Do not include Unity or internal zlib headers, and only call the public zlib API.
+    - Generate all input data inside the program with a fixed-seed PRNG (e.g., xorshift32 seeded with 12345). Do not read files or use unseeded rand().
+    - Define a few cases with representative inputs for the function, e.g. 1 KiB, 64 KiB and 1 MiB buffers of text-like and of random data.
+    - For each case: make warmup calls first, then time at least 5 repetitions of a batch of calls with clock_gettime(CLOCK_MONOTONIC) and report the median repetition.
+    - Consume every result (e.g., fold it into a checksum printed at the end) so calls cannot be optimized away. Check return codes and exit non-zero on any error.
+    - Print exactly one line per case in this format:
+        BENCH case=<case_name> bytes=<input bytes per call> calls=<calls per repetition> ns_per_call=<median ns per call> mb_per_s=<median MB/s, 0 if the function is not size-based>
+    - main() returns 0 on success. Keep the total run time under about 10 seconds.
+    """
+    module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'crc32.c')")
+    module_code: str = dspy.InputField(description="The full contents of the zlib source file")
+    target_function_name: str = dspy.InputField(description="Name of the specific public function to benchmark")
+    bench_c: str = dspy.OutputField(description="Complete benchmark program for the target function")
+
+class FunctionToFuzzHarness(dspy.Signature):
+    """
+    You will be given a zlib source module and its contents, the name of a SPECIFIC PUBLIC FUNCTION within it (part of the zlib API declared in zlib.h), and the Unity tests already written for it.
+    Your task is to write a libFuzzer harness (fuzz_{module_name}_{function_name}.c) that drives ONLY this function with fuzzer-provided bytes.
+
+    REQUIRED FORMAT for `fuzz_{module_name}_{function_name}.c`:
+    - Include "zlib.h" and the standard headers the harness needs (e.g., stdint.h, stddef.h, stdlib.h, string.h). Do not include Unity or internal zlib headers, and only call the public zlib API.
+    - Define exactly `int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size)` and no main(). Return 0.
+    - Use the input the way the Unity tests feed the function: e.g. as compressed data for inflate/uncompress, as plain data for deflate/compress/checksums. You may take a few leading bytes as parameters (level, windowBits, strategy, flush mode, chunk sizes), mapped into their valid ranges.
+    - Bound all work: cap output buffers (e.g. 1 MiB) and loop iterations so a single input runs in milliseconds.
+    - Check return codes, but never abort on errors zlib reports for invalid input; only call abort() when an invariant must hold (e.g., a compress/uncompress round trip differs from the input).
+    - Free every allocation and end every stream on all paths. For gz* functions, write the input to a uniquely named file under $TMPDIR (default /tmp) and remove it afterwards.
+    - No global state that carries over between calls, no printing, no sleeping, no threads.
+    """
+    module_name : str = dspy.InputField(description="The zlib source module filename (e.g., 'inflate.c')")
+    module_code: str = dspy.InputField(description="The full contents of the zlib source file")
+    target_function_name: str = dspy.InputField(description="Name of the specific public function to fuzz")
+    unity_tests: str = dspy.InputField(description="The generated Unity tests for the function, showing how it is called (may be empty)")
+    fuzz_c: str = dspy.OutputField(description="Complete libFuzzer harness for the target function")
+
+def initialize_llm(llm_mode=LLM_MODE, llm_archive_path=LLM_ARCHIVE_PATH, signature=FunctionToUnityTests, cache=True):
+    """
+    Initialize the LLM once and return the configured converter for `signature`.
     This should be called once at the start of the program.
+
+    llm_mode selects the backend: "live" calls GPT-5 directly, "record" also archives every
+    response to llm_archive_path, and "replay" serves responses from that archive offline.
+    cache=False turns off DSPy's response cache, so repeating a request draws a new sample.
     """
-    print("Initializing LLM...")
-    lm = dspy.LM(
-        "gpt-5",
-        model_type="chat",
-        temperature=1.0,
-        max_tokens=16000,  # these are required by gpt5
+    print(f"Initializing LLM (mode={llm_mode})...")
+    if llm_mode != "replay":
+        lm = dspy.LM(
+            "gpt-5",
+            model_type="chat",
+            temperature=1.0,
+            max_tokens=16000,  # these are required by gpt5
+            cache=cache,
+        )
+        dspy.configure(lm=lm)
+    converter = RecordReplayConverter(
+        dspy.ChainOfThought(signature),
+        signature.__name__,
+        mode=llm_mode,
+        archive_path=llm_archive_path,
     )
-    dspy.configure(lm=lm)
-    converter = dspy.ChainOfThought(FunctionToUnityTests)
     print("  ✓ LLM initialized successfully")
     return converter
 
@@ -154,7 +354,7 @@ def generate_unity_tests_with_llm(converter, module_name, module_code, target_fu
     Generate Unity tests using a pre-initialized LLM converter.
     
     Args:
-        converter: Pre-initialized dspy.ChainOfThought(FunctionToUnityTests) instance
+        converter: Pre-initialized converter returned by initialize_llm()
         module_name: The zlib source module filename (e.g., 'gzread.c')
         module_code: The full contents of the zlib source module
         target_function_name: Name of the specific function to test
@@ -174,29 +374,188 @@ def generate_unity_tests_with_llm(converter, module_name, module_code, target_fu
         print(f"  ✓ LLM generation completed for {target_function_name}")
         
         # Extract the generated tests.c code
-        tests_c = result.tests_c.strip()
+        tests_c = clean_generated_code(result.tests_c)
         
         # Check if generation failed (empty string)
         if not tests_c:
             print(f"  ✗ LLM returned empty tests for {target_function_name}")
             return False
-        
-        # Remove markdown code blocks if present
-        if "```c" in tests_c:
-            tests_c = tests_c.split("```c")[1].split("```")[0]
-        elif "```" in tests_c:
-            tests_c = tests_c.split("```")[1].split("```")[0]
-
-        # Fix stdout/stderr flushing before fork
-        tests_c = fix_stdout_stderr(tests_c)
-        
-        return tests_c.strip()
+
+        return tests_c
         
     except Exception as e:
         print(f"  ✗ Error generating tests with LLM for {target_function_name}: {e}")
         return False
+
+
+def llm_history_length():
+    """Number of requests in the configured LM's history (0 in replay mode, where there is no LM)."""
+    return len(getattr(dspy.settings.lm, "history", None) or [])
+
+
+def llm_usage_since(history_start):
+    """Prompt, cached prompt and completion tokens of the LM requests made after history_start."""
+    usage = {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+    for entry in (getattr(dspy.settings.lm, "history", None) or [])[history_start:]:
+        entry_usage = entry.get("usage") or {}
+        usage["prompt_tokens"] += entry_usage.get("prompt_tokens") or 0
+        usage["completion_tokens"] += entry_usage.get("completion_tokens") or 0
+        details = entry_usage.get("prompt_tokens_details") or {}
+        cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", 0)
+        usage["cached_tokens"] += cached or 0
+    return usage
+
+
+def record_llm_usage(module_name, signature_name, function_names, seconds, usage, files_returned):
+    """Append one request's token usage and latency to LLM_USAGE_LOG."""
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "module_name": module_name,
+        "signature": signature_name,
+        "functions": function_names,
+        "seconds": round(seconds, 2),
+        **usage,
+        "files_returned": files_returned,
+    }
+    with open(LLM_USAGE_LOG, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    print(f"  {signature_name}: {files_returned}/{len(function_names)} files in {seconds:.1f}s, "
+          f"{usage['prompt_tokens']} prompt tokens ({usage['cached_tokens']} cached), "
+          f"{usage['completion_tokens']} completion tokens")
+
+
+def split_batch_response(tests_files):
+    """{test filename: cleaned test code} for every marker-delimited file in a batched response."""
+    text = (tests_files or "").replace("```c", "").replace("```", "")
+    markers = list(BATCH_FILE_MARKER.finditer(text))
+    files = {}
+    for marker, following in zip(markers, markers[1:] + [None]):
+        tests_c = clean_generated_code(text[marker.end():following.start() if following else len(text)])
+        if tests_c:
+            files[marker.group(1)] = tests_c
+    return files
+
+
+def generate_unity_tests_batch_with_llm(converter, module_name, module_code, function_signatures):
+    """
+    Generate the tests for several functions in one request.
+
+    Returns {test filename: C code} for the files found in the response ({} on failure) and
+    records the request's latency and token usage.
+    """
+    history_start = llm_history_length()
+    started = time.perf_counter()
+    try:
+        print(f"  Generating tests for {len(function_signatures)} functions in {module_name} in one request...")
+        result = converter(
+            module_name=module_name,
+            module_code=module_code,
+            target_function_names="\n".join(function_signatures),
+        )
+        files = split_batch_response(result.tests_files)
+    except Exception as e:
+        print(f"  ✗ Error generating batched tests with LLM: {e}")
+        files = {}
+    record_llm_usage(module_name, "FunctionsToUnityTestsBatch", function_signatures,
+                     time.perf_counter() - started, llm_usage_since(history_start), len(files))
+    return files
+
+
+def plan_batches(function_info, batch_size):
+    """Group small functions into batches of up to batch_size; larger ones form batches of one."""
+    small, batches = [], []
+    for func in function_info:
+        lines = sum(1 for line in func['code'].splitlines() if line.strip())
+        if batch_size > 1 and lines <= BATCH_MAX_LINES:
+            small.append(func)
+        else:
+            batches.append([func])
+    batches.extend(small[k:k + batch_size] for k in range(0, len(small), batch_size))
+    return batches
+
+
+def clean_generated_code(tests_c):
+    """Strip markdown fences from LLM output and apply the fork() flushing fix."""
+    tests_c = (tests_c or "").strip()
+    if not tests_c:
+        return ""
+
+    # Remove markdown code blocks if present
+    if "```c" in tests_c:
+        tests_c = tests_c.split("```c")[1].split("```")[0]
+    elif "```" in tests_c:
+        tests_c = tests_c.split("```")[1].split("```")[0]
+
+    # Fix stdout/stderr flushing before fork
+    tests_c = fix_stdout_stderr(tests_c)
+
+    return tests_c.strip()
+
+
+def repair_unity_tests_with_llm(repairer, module_name, module_code, target_function_name, tests_c, failure_stage, failure_output):
+    """
+    Ask the LLM to fix a test file that failed to build or run.
+
+    Args:
+        repairer: Converter returned by initialize_llm(signature=RepairUnityTests)
+        failure_stage: "build" or "test"
+        failure_output: Truncated compiler/Unity output from the failing stage
+    Returns:
+        String containing the repaired C code, or False on failure
+    """
+    try:
+        print(f"  Repairing tests for {target_function_name} ({failure_stage} failure)...")
+        result = repairer(
+            module_name=module_name,
+            module_code=module_code,
+            target_function_name=target_function_name,
+            tests_c=tests_c,
+            failure_stage=failure_stage,
+            failure_output=failure_output
+        )
+        repaired = clean_generated_code(result.repaired_tests_c)
+        if not repaired:
+            print(f"  ✗ LLM returned empty repair for {target_function_name}")
+            return False
+        print(f"  ✓ LLM repair completed for {target_function_name}")
+        return repaired
+
+    except Exception as e:
+        print(f"  ✗ Error repairing tests with LLM for {target_function_name}: {e}")
+        return False
     
 
+def augment_unity_tests_with_llm(augmenter, module_name, module_code, target_function_name, tests_c, survived_mutants):
+    """
+    Ask the LLM for additional test cases that kill the given survived mutants.
+
+    Args:
+        augmenter: Converter returned by initialize_llm(signature=SurvivedMutantsToUnityTests)
+        survived_mutants: Text listing one survived mutant per line
+    Returns:
+        String containing the augmented C code, or False on failure
+    """
+    try:
+        print(f"  Generating mutant-targeted tests for {target_function_name}...")
+        result = augmenter(
+            module_name=module_name,
+            module_code=module_code,
+            target_function_name=target_function_name,
+            tests_c=tests_c,
+            survived_mutants=survived_mutants
+        )
+        augmented = clean_generated_code(result.augmented_tests_c)
+        if not augmented:
+            print(f"  ✗ LLM returned empty augmented tests for {target_function_name}")
+            return False
+        print(f"  ✓ LLM augmentation completed for {target_function_name}")
+        return augmented
+
+    except Exception as e:
+        print(f"  ✗ Error augmenting tests with LLM for {target_function_name}: {e}")
+        return False
+
+
 #for functions that are local, we need to create a global wrapper function for the tests code to call
 def create_global_wrapper_functions(original_code, function_signature):
     """
@@ -297,7 +656,10 @@ def create_global_wrapper_functions(original_code, function_signature):
         print(f"Error creating wrapper for {function_signature}: {e}")
         return original_code
 
-def generate_tests_for_one_zlib_file(module_name):
+def generate_tests_for_one_zlib_file(module_name, llm_mode=LLM_MODE, llm_archive_path=LLM_ARCHIVE_PATH,
+                                     batch_size=LLM_BATCH_SIZE):
+    if batch_size > 1:
+        return generate_batched_tests_for_one_zlib_file(module_name, llm_mode, llm_archive_path, batch_size)
     C_LANGUAGE = Language(tsc.language())
     parser = Parser(C_LANGUAGE)
     # print(f"Generating Unity tests for {module_name}...")
@@ -323,7 +685,7 @@ def generate_tests_for_one_zlib_file(module_name):
     function_info = get_function_info(src_c_path, parser)
 
     # Initialize LLM once for all functions
-    converter = initialize_llm()
+    converter = initialize_llm(llm_mode, llm_archive_path)
     
     injectable_functions = []
 
@@ -374,6 +736,245 @@ def generate_tests_for_one_zlib_file(module_name):
     # print("="*60)
     print(f"Generated tests for {len(injectable_functions)} functions")
 
+def generate_batched_tests_for_one_zlib_file(module_name, llm_mode=LLM_MODE, llm_archive_path=LLM_ARCHIVE_PATH,
+                                             batch_size=4):
+    """
+    generate_tests_for_one_zlib_file with up to batch_size small functions per request.
+
+    Every batch of the module sends the same instructions and the same module code (with the
+    wrappers of all local functions) before the varying function list, so the provider's prompt
+    cache can serve that prefix after the first batch. Functions missing from a batched response,
+    or whose file calls another function's test_ wrapper (absent when each file is built with
+    only its own), are retried with a single-function request. Writes the same files and JSON
+    as the unbatched mode.
+    """
+    parser = Parser(Language(tsc.language()))
+    src_c_path = os.path.join(HOST_ZLIB_PATH, f"{module_name}.c")
+    tests_dir_path = os.path.join(HOST_ZLIB_PATH, 'tests')
+    if not os.path.exists(src_c_path):
+        raise FileNotFoundError(f"Required source file does not exist: {src_c_path}")
+    os.makedirs(tests_dir_path, exist_ok=True)
+    os.makedirs(INJECTABLE_FUNCTION_PATH, exist_ok=True)
+    injectable_json_path = os.path.join(INJECTABLE_FUNCTION_PATH, f"{module_name}_injectable_functions.json")
+
+    with open(src_c_path, 'r') as f:
+        original_code = f.read()
+
+    function_info = get_function_info(src_c_path, parser)
+    shared_code = create_all_global_wrappers(original_code, [func['signature'] for func in function_info])
+
+    batch_converter = initialize_llm(llm_mode, llm_archive_path, signature=FunctionsToUnityTestsBatch)
+    single_converter = None
+    batches = plan_batches(function_info, batch_size)
+    print(f"{len(function_info)} functions in {len(batches)} requests (batch size {batch_size})")
+
+    injectable_functions = []
+    for i, batch in enumerate(batches, 1):
+        print(f"\n[{i}/{len(batches)}] Processing {', '.join(func['name'] for func in batch)}")
+        test_filenames = [f"tests_{module_name}_{re.sub(r'[^0-9a-zA-Z_]', '_', func['name'])}.c" for func in batch]
+        files = {}
+        if len(batch) > 1:
+            files = generate_unity_tests_batch_with_llm(batch_converter, module_name, shared_code,
+                                                        [func['signature'] for func in batch])
+
+        for func, test_filename in zip(batch, test_filenames):
+            tests_c_result = files.get(test_filename)
+            # the file is built with only its own wrapper injected, so calls to a sibling's wrapper won't link
+            symbol_errors = check_symbols(tests_c_result, create_global_wrapper_functions(
+                original_code, func['signature'])) if tests_c_result else []
+            if symbol_errors:
+                print(f"  ✗ {test_filename} from the batched response: {'; '.join(symbol_errors)}")
+                tests_c_result = None
+            if not tests_c_result:
+                if len(batch) > 1:
+                    print(f"  {test_filename} missing from the batched response, requesting it alone")
+                if single_converter is None:
+                    single_converter = initialize_llm(llm_mode, llm_archive_path)
+                history_start = llm_history_length()
+                started = time.perf_counter()
+                tests_c_result = generate_unity_tests_with_llm(
+                    single_converter, module_name,
+                    create_global_wrapper_functions(original_code, func['signature']), func['signature'])
+                record_llm_usage(module_name, "FunctionToUnityTests", [func['signature']],
+                                 time.perf_counter() - started, llm_usage_since(history_start),
+                                 1 if tests_c_result else 0)
+
+            if tests_c_result:
+                print(f"  ✓ Writing generated tests to {test_filename}")
+                with open(os.path.join(tests_dir_path, test_filename), "w") as f:
+                    f.write(tests_c_result)
+            else:
+                print(f"  ✗ Failed to generate tests for function: {func['name']}")
+
+            injectable_functions.append({
+                "function_name": func['name'],
+                "function_signature": func['signature'],
+                "test_filename": test_filename if tests_c_result else None
+            })
+        with open(injectable_json_path, "w") as f:
+            json.dump(injectable_functions, f, indent=2)
+
+    print(f"Generated tests for {len(injectable_functions)} functions")
+
+def generate_benchmark_with_llm(converter, module_name, module_code, target_function_name):
+    """
+    Generate a micro-benchmark for one public function.
+
+    Args:
+        converter: Converter returned by initialize_llm(signature=FunctionToBenchmark)
+    Returns:
+        String containing the generated C code, or False on failure
+    """
+    try:
+        print(f"  Generating benchmark for {target_function_name} in {module_name}...")
+        result = converter(
+            module_name=module_name,
+            module_code=module_code,
+            target_function_name=target_function_name
+        )
+        bench_c = clean_generated_code(result.bench_c)
+        if not bench_c:
+            print(f"  ✗ LLM returned an empty benchmark for {target_function_name}")
+            return False
+        print(f"  ✓ LLM benchmark generation completed for {target_function_name}")
+        return bench_c
+
+    except Exception as e:
+        print(f"  ✗ Error generating benchmark with LLM for {target_function_name}: {e}")
+        return False
+
+
+def is_public_function(function_signature):
+    """Functions exported by the zlib API are declared with ZEXPORT; local/ZLIB_INTERNAL ones are not benchmarked."""
+    return "ZEXPORT" in function_signature and not function_signature.startswith("local")
+
+
+def generate_benchmarks_for_one_zlib_file(module_name, llm_mode=LLM_MODE, llm_archive_path=LLM_ARCHIVE_PATH):
+    """
+    Generate benchmarks/bench_<module>_<function>.c for every public function of a module and
+    record them in injectable_functions/<module>_benchmarks.json.
+    """
+    parser = Parser(Language(tsc.language()))
+    src_c_path = os.path.join(HOST_ZLIB_PATH, f"{module_name}.c")
+    if not os.path.exists(src_c_path):
+        raise FileNotFoundError(f"Required source file does not exist: {src_c_path}")
+    bench_dir_path = os.path.join(HOST_ZLIB_PATH, 'benchmarks')
+    os.makedirs(bench_dir_path, exist_ok=True)
+    os.makedirs(INJECTABLE_FUNCTION_PATH, exist_ok=True)
+    benchmarks_json_path = os.path.join(INJECTABLE_FUNCTION_PATH, f"{module_name}_benchmarks.json")
+
+    with open(src_c_path, 'r') as f:
+        original_code = f.read()
+    public_functions = [func for func in get_function_info(src_c_path, parser) if is_public_function(func['signature'])]
+    converter = initialize_llm(llm_mode, llm_archive_path, signature=FunctionToBenchmark)
+
+    benchmarks = []
+    for i, func in enumerate(public_functions, 1):
+        function_name = func['name']
+        function_name_clean = re.sub(r'[^0-9a-zA-Z_]', '_', function_name)
+        print(f"\n[{i}/{len(public_functions)}] Processing function: {function_name}")
+
+        bench_c = generate_benchmark_with_llm(converter, module_name, original_code, func['signature'])
+        bench_filename = f"bench_{module_name}_{function_name_clean}.c"
+        if bench_c:
+            bench_path = os.path.join(bench_dir_path, bench_filename)
+            print(f"  ✓ Writing generated benchmark to {bench_path}")
+            with open(bench_path, "w") as f:
+                f.write(bench_c)
+        else:
+            print(f"  ✗ Failed to generate a benchmark for function: {function_name}")
+
+        benchmarks.append({
+            "function_name": function_name,
+            "function_signature": func['signature'],
+            "bench_filename": bench_filename if bench_c else None
+        })
+        with open(benchmarks_json_path, "w") as f:
+            json.dump(benchmarks, f, indent=2)
+
+    print(f"Generated benchmarks for {sum(1 for b in benchmarks if b['bench_filename'])}/{len(public_functions)} public functions")
+
+def generate_fuzz_harness_with_llm(converter, module_name, module_code, target_function_name, unity_tests=""):
+    """
+    Generate a libFuzzer harness for one public function.
+
+    Args:
+        converter: Converter returned by initialize_llm(signature=FunctionToFuzzHarness)
+    Returns:
+        String containing the generated C code, or False on failure
+    """
+    try:
+        print(f"  Generating fuzz harness for {target_function_name} in {module_name}...")
+        result = converter(
+            module_name=module_name,
+            module_code=module_code,
+            target_function_name=target_function_name,
+            unity_tests=unity_tests
+        )
+        fuzz_c = clean_generated_code(result.fuzz_c)
+        if not fuzz_c or "LLVMFuzzerTestOneInput" not in fuzz_c:
+            print(f"  ✗ LLM returned no LLVMFuzzerTestOneInput for {target_function_name}")
+            return False
+        print(f"  ✓ LLM fuzz harness generation completed for {target_function_name}")
+        return fuzz_c
+
+    except Exception as e:
+        print(f"  ✗ Error generating fuzz harness with LLM for {target_function_name}: {e}")
+        return False
+
+
+def generate_fuzzers_for_one_zlib_file(module_name, llm_mode=LLM_MODE, llm_archive_path=LLM_ARCHIVE_PATH):
+    """
+    Generate fuzz/fuzz_<module>_<function>.c for every public function of a module and record
+    them in injectable_functions/<module>_fuzzers.json. The function's Unity tests, if any, are
+    given to the model as examples of how the function is called.
+    """
+    parser = Parser(Language(tsc.language()))
+    src_c_path = os.path.join(HOST_ZLIB_PATH, f"{module_name}.c")
+    if not os.path.exists(src_c_path):
+        raise FileNotFoundError(f"Required source file does not exist: {src_c_path}")
+    fuzz_dir_path = os.path.join(HOST_ZLIB_PATH, 'fuzz')
+    os.makedirs(fuzz_dir_path, exist_ok=True)
+    os.makedirs(INJECTABLE_FUNCTION_PATH, exist_ok=True)
+    fuzzers_json_path = os.path.join(INJECTABLE_FUNCTION_PATH, f"{module_name}_fuzzers.json")
+
+    with open(src_c_path, 'r') as f:
+        original_code = f.read()
+    public_functions = [func for func in get_function_info(src_c_path, parser) if is_public_function(func['signature'])]
+    converter = initialize_llm(llm_mode, llm_archive_path, signature=FunctionToFuzzHarness)
+
+    fuzzers = []
+    for i, func in enumerate(public_functions, 1):
+        function_name = func['name']
+        function_name_clean = re.sub(r'[^0-9a-zA-Z_]', '_', function_name)
+        print(f"\n[{i}/{len(public_functions)}] Processing function: {function_name}")
+
+        test_path = os.path.join(HOST_ZLIB_PATH, 'tests', f"tests_{module_name}_{function_name_clean}.c")
+        unity_tests = ""
+        if os.path.exists(test_path):
+            with open(test_path, 'r') as f:
+                unity_tests = f.read()
+
+        fuzz_c = generate_fuzz_harness_with_llm(converter, module_name, original_code, func['signature'], unity_tests)
+        fuzz_filename = f"fuzz_{module_name}_{function_name_clean}.c"
+        if fuzz_c:
+            fuzz_path = os.path.join(fuzz_dir_path, fuzz_filename)
+            print(f"  ✓ Writing generated fuzz harness to {fuzz_path}")
+            with open(fuzz_path, "w") as f:
+                f.write(fuzz_c)
+        else:
+            print(f"  ✗ Failed to generate a fuzz harness for function: {function_name}")
+
+        fuzzers.append({
+            "function_name": function_name,
+            "function_signature": func['signature'],
+            "fuzz_filename": fuzz_filename if fuzz_c else None
+        })
+        with open(fuzzers_json_path, "w") as f:
+            json.dump(fuzzers, f, indent=2)
+
+    print(f"Generated fuzz harnesses for {sum(1 for z in fuzzers if z['fuzz_filename'])}/{len(public_functions)} public functions")
+
 if __name__ == "__main__":
     module_name = "trees"
     generate_tests_for_one_zlib_file(module_name)
\ No newline at end of file
@@ -0,0 +1,238 @@
+/*
+ * Counting allocator for zlib, linked into test and benchmark binaries with ALLOC_PROFILE=1
+ * (see patch_makefile.py):
+ *
+ *   -Wl,--wrap=zcalloc -Wl,--wrap=zcfree -Wl,--wrap=deflateInit2_ ...
+ *
+ * zlib allocates through zcalloc/zcfree (zutil.c) whenever a z_stream has no zalloc/zfree of
+ * its own. Every allocation is attributed to the deflateInit2_/inflateInit2_ configuration of
+ * the stream being worked on: the wrapped entry points bind a stream to its configuration and
+ * mark it as current while they run (inflate allocates its window lazily, gz* streams are
+ * initialized inside gzlib). deflateInit_/inflateInit_ are reported as the deflateInit2_/
+ * inflateInit2_ configuration they expand to. Allocations outside any tracked stream are
+ * counted under "other"; memory from user-supplied zalloc functions is not seen.
+ *
+ * --wrap only redirects references between objects, which is what every call into the
+ * library from a test or between zlib's source files is.
+ *
+ * At exit one line per configuration (and a total) is printed to stderr:
+ *   ALLOC config=... streams=... allocs=... frees=... bytes=... peak_bytes=...
+ */
+#include <stddef.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include "zlib.h"
+
+#define MAX_CONFIGS 64
+#define MAX_STREAMS 256
+#define CONFIG_NAME 96
+
+typedef struct {
+    char name[CONFIG_NAME];
+    unsigned long streams, allocs, frees;
+    unsigned long long bytes;
+    size_t current, peak;
+} config_stats;
+
+/* keeps size and configuration in front of every block with malloc's alignment */
+typedef union {
+    struct {
+        size_t size;
+        int config;
+    } h;
+    max_align_t align;
+} alloc_header;
+
+static config_stats configs[MAX_CONFIGS] = {{"other"}};
+static int config_count = 1;
+static config_stats total = {"total"};
+
+static struct {
+    z_streamp strm;
+    int config;
+} streams[MAX_STREAMS];
+static z_streamp current_stream;
+
+static int config_index(const char *name) {
+    int k;
+    for (k = 0; k < config_count; k++)
+        if (strcmp(configs[k].name, name) == 0)
+            return k;
+    if (config_count == MAX_CONFIGS)
+        return 0;
+    snprintf(configs[config_count].name, CONFIG_NAME, "%s", name);
+    return config_count++;
+}
+
+static void bind_stream(z_streamp strm, const char *name) {
+    int k, slot = -1, config = config_index(name);
+    configs[config].streams++;
+    for (k = 0; k < MAX_STREAMS; k++) {
+        if (streams[k].strm == strm) {
+            slot = k;
+            break;
+        }
+        if (slot < 0 && streams[k].strm == NULL)
+            slot = k;
+    }
+    if (slot < 0)
+        slot = (int)(((size_t)strm >> 4) % MAX_STREAMS); /* table full: evict one */
+    streams[slot].strm = strm;
+    streams[slot].config = config;
+}
+
+static int stream_config(z_streamp strm) {
+    int k;
+    for (k = 0; strm != NULL && k < MAX_STREAMS; k++)
+        if (streams[k].strm == strm)
+            return streams[k].config;
+    return 0;
+}
+
+static z_streamp enter(z_streamp strm) {
+    z_streamp previous = current_stream;
+    current_stream = strm;
+    return previous;
+}
+
+voidpf __wrap_zcalloc(voidpf opaque, unsigned items, unsigned size) {
+    size_t bytes = (size_t)items * size;
+    alloc_header *block = malloc(sizeof(alloc_header) + bytes);
+    config_stats *stats;
+    (void)opaque;
+    if (block == NULL)
+        return NULL;
+    block->h.size = bytes;
+    block->h.config = stream_config(current_stream);
+    stats = &configs[block->h.config];
+    stats->allocs++;
+    stats->bytes += bytes;
+    stats->current += bytes;
+    if (stats->current > stats->peak)
+        stats->peak = stats->current;
+    total.allocs++;
+    total.bytes += bytes;
+    total.current += bytes;
+    if (total.current > total.peak)
+        total.peak = total.current;
+    return (voidpf)(block + 1);
+}
+
+void __wrap_zcfree(voidpf opaque, voidpf ptr) {
+    alloc_header *block;
+    (void)opaque;
+    if (ptr == NULL)
+        return;
+    block = (alloc_header *)ptr - 1;
+    configs[block->h.config].frees++;
+    configs[block->h.config].current -= block->h.size;
+    total.frees++;
+    total.current -= block->h.size;
+    free(block);
+}
+
+int __real_deflateInit_(z_streamp strm, int level, const char *version, int stream_size);
+int __real_deflateInit2_(z_streamp strm, int level, int method, int windowBits, int memLevel, int strategy,
+                         const char *version, int stream_size);
+int __real_inflateInit_(z_streamp strm, const char *version, int stream_size);
+int __real_inflateInit2_(z_streamp strm, int windowBits, const char *version, int stream_size);
+int __real_deflate(z_streamp strm, int flush);
+int __real_inflate(z_streamp strm, int flush);
+int __real_deflateEnd(z_streamp strm);
+int __real_inflateEnd(z_streamp strm);
+
+int __wrap_deflateInit2_(z_streamp strm, int level, int method, int windowBits, int memLevel, int strategy,
+                         const char *version, int stream_size) {
+    char name[CONFIG_NAME];
+    z_streamp previous;
+    int ret;
+    snprintf(name, sizeof(name), "deflateInit2_(level=%d,windowBits=%d,memLevel=%d,strategy=%d)",
+             level, windowBits, memLevel, strategy);
+    bind_stream(strm, name);
+    previous = enter(strm);
+    ret = __real_deflateInit2_(strm, level, method, windowBits, memLevel, strategy, version, stream_size);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_deflateInit_(z_streamp strm, int level, const char *version, int stream_size) {
+    char name[CONFIG_NAME];
+    z_streamp previous;
+    int ret;
+    /* what deflateInit_ passes on to deflateInit2_ */
+    snprintf(name, sizeof(name), "deflateInit2_(level=%d,windowBits=%d,memLevel=%d,strategy=%d)",
+             level, MAX_WBITS, MAX_MEM_LEVEL >= 8 ? 8 : MAX_MEM_LEVEL, Z_DEFAULT_STRATEGY);
+    bind_stream(strm, name);
+    previous = enter(strm);
+    ret = __real_deflateInit_(strm, level, version, stream_size);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_inflateInit2_(z_streamp strm, int windowBits, const char *version, int stream_size) {
+    char name[CONFIG_NAME];
+    z_streamp previous;
+    int ret;
+    snprintf(name, sizeof(name), "inflateInit2_(windowBits=%d)", windowBits);
+    bind_stream(strm, name);
+    previous = enter(strm);
+    ret = __real_inflateInit2_(strm, windowBits, version, stream_size);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_inflateInit_(z_streamp strm, const char *version, int stream_size) {
+    char name[CONFIG_NAME];
+    z_streamp previous;
+    int ret;
+    snprintf(name, sizeof(name), "inflateInit2_(windowBits=%d)", MAX_WBITS);
+    bind_stream(strm, name);
+    previous = enter(strm);
+    ret = __real_inflateInit_(strm, version, stream_size);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_deflate(z_streamp strm, int flush) {
+    z_streamp previous = enter(strm);
+    int ret = __real_deflate(strm, flush);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_inflate(z_streamp strm, int flush) {
+    z_streamp previous = enter(strm);
+    int ret = __real_inflate(strm, flush);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_deflateEnd(z_streamp strm) {
+    z_streamp previous = enter(strm);
+    int ret = __real_deflateEnd(strm);
+    current_stream = previous;
+    return ret;
+}
+
+int __wrap_inflateEnd(z_streamp strm) {
+    z_streamp previous = enter(strm);
+    int ret = __real_inflateEnd(strm);
+    current_stream = previous;
+    return ret;
+}
+
+static void print_stats(const config_stats *stats) {
+    fprintf(stderr, "ALLOC config=%s streams=%lu allocs=%lu frees=%lu bytes=%llu peak_bytes=%zu\n",
+            stats->name, stats->streams, stats->allocs, stats->frees, stats->bytes, stats->peak);
+}
+
+__attribute__((destructor)) static void report_allocations(void) {
+    int k;
+    for (k = 0; k < config_count; k++) {
+        total.streams += configs[k].streams;
+        if (configs[k].allocs)
+            print_stats(&configs[k]);
+    }
+    print_stats(&total);
+}
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Generate a deterministic compression corpus (runs inside the container).
+
+Kinds:
+  text        word-based pseudo prose with punctuation and line breaks
+  binary      packed records of small integers, timestamps and floats
+  compressed  already-deflated data (barely compressible)
+  repetitive  a few short patterns repeated with sparse edits
+
+Each file is built from a seeded 4 MiB block written repeatedly (with a per-block edit) until the
+requested size is reached. Deflate's window is at most 32 KiB, so repeating the block does not
+change the compression statistics, and multi-GB files are cheap to produce.
+
+Files are named <kind>-<bytes>-s<seed>.bin and reused when they already exist.
+
+Usage:
+    python3 harness/make_corpus.py --out /tmp/zlib-corpus --size 64M --kinds text,binary
+"""
+
+import argparse
+import os
+import random
+import struct
+import zlib
+
+BLOCK_SIZE = 4 * 1024 * 1024
+KINDS = ("text", "binary", "compressed", "repetitive")
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which but have an "
+    "they you were her she there been one all we their has would when if so no what up out who them some "
+    "could into time more other these only new two may first then do any like my now over such our man "
+    "compression window stream buffer deflate inflate header checksum block literal length distance"
+).split()
+
+
+def parse_size(text):
+    """'64M' -> 67108864; accepts K, M and G suffixes."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def text_block(rng, size):
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 18)))
+        sentence = sentence.capitalize() + rng.choice((". ", ". ", "? ", "! ", ".\n", ",\n"))
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts).encode("ascii")[:size]
+
+
+def binary_block(rng, size):
+    out = bytearray()
+    timestamp = 1_600_000_000
+    while len(out) < size:
+        timestamp += rng.randint(0, 5)
+        out += struct.pack("<IHhf", timestamp, rng.randint(0, 1024), rng.randint(-50, 50), rng.gauss(0, 1))
+    return bytes(out[:size])
+
+
+def compressed_block(rng, size):
+    out = bytearray()
+    while len(out) < size:
+        out += zlib.compress(text_block(rng, 256 * 1024), 9)
+    return bytes(out[:size])
+
+
+def repetitive_block(rng, size):
+    patterns = [bytes(rng.randrange(256) for _ in range(rng.randint(3, 40))) for _ in range(4)]
+    out = bytearray()
+    while len(out) < size:
+        out += rng.choice(patterns) * rng.randint(1, 64)
+        if rng.random() < 0.01:
+            out += bytes([rng.randrange(256)])
+    return bytes(out[:size])
+
+
+BUILDERS = {"text": text_block, "binary": binary_block, "compressed": compressed_block, "repetitive": repetitive_block}
+
+
+def corpus_filename(kind, size, seed):
+    return f"{kind}-{size}-s{seed}.bin"
+
+
+def write_corpus_file(path, kind, size, seed):
+    rng = random.Random(f"{kind}:{seed}")
+    block = bytearray(BUILDERS[kind](rng, min(size, BLOCK_SIZE)))
+    written = 0
+    with open(path, "wb") as f:
+        while written < size:
+            n = min(len(block), size - written)
+            f.write(block[:n])
+            written += n
+            # vary each repetition slightly so blocks are not byte-identical
+            block[rng.randrange(len(block))] = rng.randrange(256)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--size", default="16M", help="bytes per file (K/M/G suffixes allowed)")
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    size = parse_size(args.size)
+    for kind in args.kinds.split(","):
+        path = os.path.join(args.out, corpus_filename(kind, size, args.seed))
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            print(f"{path} exists, reusing")
+            continue
+        write_corpus_file(path, kind, size, args.seed)
+        print(f"wrote {path} ({size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Execute selected Mull mutants of an instrumented test binary (runs inside the container).
+
+Mull embeds every mutant in the binary and activates it through an environment variable
+named after the mutant identifier, so a single mutant can be executed by running the test
+binary with `<mutant_id>=1`. A mutant is killed when the test exits non-zero, crashes or
+times out. Each run gets its own process group, so a timed-out test is killed together with
+anything it spawned.
+
+Usage:
+    python3 harness/run_mutants.py ./tests_x --mutants ids.txt --output results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def limit_memory(memory_mb):
+    """preexec_fn capping the child's address space."""
+    def apply():
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return apply if memory_mb else None
+
+
+def run_mutant(binary, mutant_id, timeout, memory_mb=None):
+    env = dict(os.environ)
+    env[mutant_id] = "1"
+    # don't let every mutant run write (and fight over) default.profraw
+    env["LLVM_PROFILE_FILE"] = "/dev/null"
+    # private TMPDIR per mutant: concurrent runs of the same test must not share scratch files
+    scratch = tempfile.mkdtemp(prefix="mutant_")
+    env["TMPDIR"] = scratch
+    start = time.perf_counter()
+    p = subprocess.Popen([binary], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                         start_new_session=True, preexec_fn=limit_memory(memory_mb))
+    try:
+        returncode = p.wait(timeout=timeout)
+        status = "survived" if returncode == 0 else "killed"
+    except subprocess.TimeoutExpired:
+        os.killpg(p.pid, signal.SIGKILL)
+        p.wait()
+        returncode = None
+        status = "killed"
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "mutant_id": mutant_id,
+        "status": status,
+        "returncode": returncode,
+        "duration": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("binary")
+    parser.add_argument("--mutants", required=True, help="file with one mutant identifier per line")
+    parser.add_argument("--output", required=True, help="JSON file to write per-mutant results to")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--memory-mb", type=int, default=None, help="address-space limit per mutant run")
+    args = parser.parse_args()
+
+    with open(args.mutants) as f:
+        mutant_ids = [line.strip() for line in f if line.strip()]
+
+    binary = os.path.abspath(args.binary)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(lambda m: run_mutant(binary, m, args.timeout, args.memory_mb), mutant_ids))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    killed = sum(1 for r in results if r["status"] == "killed")
+    print(f"{killed}/{len(results)} mutants killed")
+
+
+if __name__ == "__main__":
+    main()
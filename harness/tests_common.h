@@ -0,0 +1,17 @@
+/* Includes shared by the generated Unity test harnesses.
+ * Precompiled into tests_common.h.pch and force-included into every tests_%.o
+ * when building with TESTS_PCH=tests_common.h.pch (clang only, see patch_makefile.py).
+ */
+#ifndef TESTS_COMMON_H
+#define TESTS_COMMON_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "zlib.h"
+#include "zutil.h"
+#include "deflate.h"
+#include "unity/unity.h"
+
+#endif /* TESTS_COMMON_H */
@@ -0,0 +1,257 @@
+/*
+ * Deflate/inflate throughput, ratio and memory for one parameter combination over one corpus file.
+ *
+ * Compression and decompression run in lockstep over fixed-size chunks: every piece of deflate
+ * output is fed straight into inflate and the result is compared with the input. Memory stays
+ * bounded for multi-GB corpora and only the zlib calls themselves are timed.
+ *
+ * usage: zlib_matrix_bench FILE LEVEL WINDOWBITS MEMLEVEL STRATEGY [GOOD LAZY NICE CHAIN] [-r REPEATS]
+ *
+ * Prints one line (median over the repeats):
+ *   MATRIX bytes=... compressed=... ratio=... comp_mb_s=... decomp_mb_s=...
+ *          deflate_peak_bytes=... inflate_peak_bytes=... maxrss_kb=...
+ */
+#include <fcntl.h>
+#include <stddef.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/resource.h>
+#include <sys/stat.h>
+#include <time.h>
+#include <unistd.h>
+#include "zlib.h"
+
+/* older zlib releases (swept by perf_sweep.py) predate z_const */
+#ifndef z_const
+#define z_const
+#endif
+
+#define CHUNK (256 * 1024)
+#define MAX_REPEATS 64
+
+typedef struct {
+    size_t current;
+    size_t peak;
+} alloc_stats;
+
+/* keeps the block size in front of every allocation with zlib's required alignment */
+typedef union {
+    size_t size;
+    max_align_t align;
+} alloc_header;
+
+static voidpf counting_alloc(voidpf opaque, uInt items, uInt size) {
+    alloc_stats *stats = (alloc_stats *)opaque;
+    size_t bytes = (size_t)items * size;
+    alloc_header *block = malloc(sizeof(alloc_header) + bytes);
+    if (block == NULL)
+        return Z_NULL;
+    block->size = bytes;
+    stats->current += bytes;
+    if (stats->current > stats->peak)
+        stats->peak = stats->current;
+    return (voidpf)(block + 1);
+}
+
+static void counting_free(voidpf opaque, voidpf address) {
+    alloc_stats *stats = (alloc_stats *)opaque;
+    alloc_header *block = (alloc_header *)address - 1;
+    stats->current -= block->size;
+    free(block);
+}
+
+static double now_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec * 1e9 + (double)ts.tv_nsec;
+}
+
+static int compare_doubles(const void *a, const void *b) {
+    double x = *(const double *)a, y = *(const double *)b;
+    return (x > y) - (x < y);
+}
+
+static double median(double *values, int n) {
+    qsort(values, n, sizeof(double), compare_doubles);
+    return n % 2 ? values[n / 2] : (values[n / 2 - 1] + values[n / 2]) / 2;
+}
+
+typedef struct {
+    int level, window_bits, mem_level, strategy;
+    int tune, good, lazy, nice, chain;
+} params;
+
+typedef struct {
+    size_t compressed;
+    double comp_ns, decomp_ns;
+    alloc_stats deflate_mem, inflate_mem;
+} round_trip;
+
+static unsigned char cbuf[CHUNK];
+static unsigned char dbuf[CHUNK];
+
+/* one compress+decompress pass; returns 0 on success */
+static int run_round_trip(const unsigned char *data, size_t size, const params *p, round_trip *r) {
+    z_stream d, i;
+    int ret, iret = Z_OK, flush;
+    size_t pos = 0, verified = 0;
+    double t0;
+
+    memset(r, 0, sizeof(*r));
+    memset(&d, 0, sizeof(d));
+    memset(&i, 0, sizeof(i));
+    d.zalloc = i.zalloc = counting_alloc;
+    d.zfree = i.zfree = counting_free;
+    d.opaque = &r->deflate_mem;
+    i.opaque = &r->inflate_mem;
+
+    t0 = now_ns();
+    ret = deflateInit2(&d, p->level, Z_DEFLATED, p->window_bits, p->mem_level, p->strategy);
+    if (ret == Z_OK && p->tune)
+        ret = deflateTune(&d, p->good, p->lazy, p->nice, p->chain);
+    r->comp_ns += now_ns() - t0;
+    if (ret != Z_OK) {
+        fprintf(stderr, "deflateInit2/deflateTune failed: %d\n", ret);
+        return 1;
+    }
+    t0 = now_ns();
+    ret = inflateInit2(&i, p->window_bits);
+    r->decomp_ns += now_ns() - t0;
+    if (ret != Z_OK) {
+        fprintf(stderr, "inflateInit2 failed: %d\n", ret);
+        deflateEnd(&d);
+        return 1;
+    }
+
+    do {
+        size_t n = size - pos < CHUNK ? size - pos : CHUNK;
+        flush = pos + n >= size ? Z_FINISH : Z_NO_FLUSH;
+        d.next_in = (z_const Bytef *)(data + pos);
+        d.avail_in = (uInt)n;
+        pos += n;
+        do {
+            size_t have;
+            d.next_out = cbuf;
+            d.avail_out = CHUNK;
+            t0 = now_ns();
+            ret = deflate(&d, flush);
+            r->comp_ns += now_ns() - t0;
+            if (ret == Z_STREAM_ERROR) {
+                fprintf(stderr, "deflate failed\n");
+                goto fail;
+            }
+            have = CHUNK - d.avail_out;
+            r->compressed += have;
+
+            i.next_in = cbuf;
+            i.avail_in = (uInt)have;
+            do {
+                size_t out;
+                i.next_out = dbuf;
+                i.avail_out = CHUNK;
+                t0 = now_ns();
+                iret = inflate(&i, Z_NO_FLUSH);
+                r->decomp_ns += now_ns() - t0;
+                if (iret != Z_OK && iret != Z_STREAM_END && iret != Z_BUF_ERROR) {
+                    fprintf(stderr, "inflate failed: %d\n", iret);
+                    goto fail;
+                }
+                out = CHUNK - i.avail_out;
+                if (verified + out > size || memcmp(dbuf, data + verified, out) != 0) {
+                    fprintf(stderr, "round trip mismatch at offset %zu\n", verified);
+                    goto fail;
+                }
+                verified += out;
+            } while (i.avail_out == 0 && iret != Z_STREAM_END);
+        } while (d.avail_out == 0);
+    } while (flush != Z_FINISH);
+
+    deflateEnd(&d);
+    inflateEnd(&i);
+    if (iret != Z_STREAM_END || verified != size) {
+        fprintf(stderr, "incomplete round trip: %zu of %zu bytes\n", verified, size);
+        return 1;
+    }
+    return 0;
+
+fail:
+    deflateEnd(&d);
+    inflateEnd(&i);
+    return 1;
+}
+
+int main(int argc, char **argv) {
+    params p;
+    int repeats = 3, positional = 0, k;
+    const char *path = NULL;
+    char *args[10];
+    double comp_ns[MAX_REPEATS], decomp_ns[MAX_REPEATS];
+    round_trip r;
+    size_t deflate_peak = 0, inflate_peak = 0;
+    struct stat st;
+    struct rusage usage;
+    unsigned char *data;
+    int fd;
+
+    for (k = 1; k < argc; k++) {
+        if (strcmp(argv[k], "-r") == 0 && k + 1 < argc)
+            repeats = atoi(argv[++k]);
+        else if (positional < 10)
+            args[positional++] = argv[k];
+    }
+    if (positional != 5 && positional != 9) {
+        fprintf(stderr, "usage: %s FILE LEVEL WINDOWBITS MEMLEVEL STRATEGY [GOOD LAZY NICE CHAIN] [-r REPEATS]\n", argv[0]);
+        return 2;
+    }
+    if (repeats < 1 || repeats > MAX_REPEATS)
+        repeats = 3;
+    path = args[0];
+    memset(&p, 0, sizeof(p));
+    p.level = atoi(args[1]);
+    p.window_bits = atoi(args[2]);
+    p.mem_level = atoi(args[3]);
+    p.strategy = atoi(args[4]);
+    if (positional == 9) {
+        p.tune = 1;
+        p.good = atoi(args[5]);
+        p.lazy = atoi(args[6]);
+        p.nice = atoi(args[7]);
+        p.chain = atoi(args[8]);
+    }
+
+    fd = open(path, O_RDONLY);
+    if (fd < 0 || fstat(fd, &st) != 0 || st.st_size == 0) {
+        fprintf(stderr, "cannot read %s\n", path);
+        return 2;
+    }
+    data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    if (data == MAP_FAILED) {
+        fprintf(stderr, "cannot map %s\n", path);
+        return 2;
+    }
+
+    for (k = 0; k < repeats; k++) {
+        if (run_round_trip(data, (size_t)st.st_size, &p, &r) != 0)
+            return 1;
+        comp_ns[k] = r.comp_ns;
+        decomp_ns[k] = r.decomp_ns;
+        if (r.deflate_mem.peak > deflate_peak)
+            deflate_peak = r.deflate_mem.peak;
+        if (r.inflate_mem.peak > inflate_peak)
+            inflate_peak = r.inflate_mem.peak;
+    }
+    getrusage(RUSAGE_SELF, &usage);
+
+    printf("MATRIX bytes=%lld compressed=%zu ratio=%.4f comp_mb_s=%.2f decomp_mb_s=%.2f "
+           "deflate_peak_bytes=%zu inflate_peak_bytes=%zu maxrss_kb=%ld\n",
+           (long long)st.st_size, r.compressed, (double)st.st_size / (double)r.compressed,
+           (double)st.st_size / median(comp_ns, repeats) * 1e3,
+           (double)st.st_size / median(decomp_ns, repeats) * 1e3,
+           deflate_peak, inflate_peak, usage.ru_maxrss);
+
+    munmap(data, (size_t)st.st_size);
+    close(fd);
+    return 0;
+}
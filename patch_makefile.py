@@ -16,14 +16,45 @@ example_exe_block = r"""example\$\(EXE\): example\.o \$\(STATICLIB\)
 
 # Text to insert after each block
 insert_after_example_o = """
+# Precompiled header for the includes shared by the test harnesses
+# (opt-in with TESTS_PCH=tests_common.h.pch, requires CC=clang)
+TESTS_PCH ?=
+tests_common.h.pch: $(SRCDIR)harness/tests_common.h $(SRCDIR)zlib.h zconf.h $(SRCDIR)zutil.h $(SRCDIR)deflate.h unity/unity.h
+\t$(CC) $(CFLAGS) $(UNITY_CFLAGS) $(ZINCOUT) -x c-header -o $@ $<
+
+# Unity with per-test execution times ("file:line:test:PASS (N ms)"); the define changes
+# Unity's internal state, so the harness objects and Unity must agree on it
+UNITY_CFLAGS = -DUNITY_INCLUDE_EXEC_TIME
+unity/unity_timed.o: unity/unity.c unity/unity.h unity/unity_internals.h
+\t$(CC) -c -fPIC $(UNITY_CFLAGS) -Iunity -o $@ unity/unity.c
+
+# Counting zcalloc/zcfree allocator (opt-in with ALLOC_PROFILE=1, see harness/alloc_profile.c);
+# built without $(CFLAGS) so it never carries Mull or coverage instrumentation. The object goes
+# before $(STATICLIB) on the link line so its __real_ references pull in the library objects.
+ALLOC_PROFILE ?=
+ALLOC_WRAPPED = zcalloc zcfree deflateInit_ deflateInit2_ inflateInit_ inflateInit2_ deflate inflate deflateEnd inflateEnd
+ALLOC_OBJ = $(if $(ALLOC_PROFILE),alloc_profile.o)
+ALLOC_LDFLAGS = $(if $(ALLOC_PROFILE),$(foreach f,$(ALLOC_WRAPPED),-Wl,--wrap=$(f)))
+alloc_profile.o: $(SRCDIR)harness/alloc_profile.c $(SRCDIR)zlib.h zconf.h
+\t$(CC) -c -O2 $(ZINCOUT) -o $@ $<
+
 # Build the object for a test harness in test/
-tests_%.o: $(SRCDIR)tests/tests_%.c $(SRCDIR)zlib.h zconf.h
+tests_%.o: $(SRCDIR)tests/tests_%.c $(SRCDIR)zlib.h zconf.h $(TESTS_PCH)
+\t$(CC) $(CFLAGS) $(UNITY_CFLAGS) $(if $(TESTS_PCH),-include-pch $(TESTS_PCH)) $(ZINCOUT) -c -o $@ $<
+
+# Build the object for a micro-benchmark in benchmarks/ (meant for an uninstrumented build,
+# see data_pipeline/benchmark_runner.py)
+bench_%.o: $(SRCDIR)benchmarks/bench_%.c $(SRCDIR)zlib.h zconf.h
 \t$(CC) $(CFLAGS) $(ZINCOUT) -c -o $@ $<"""
 
 insert_after_example_exe = """
 # Pattern rule for test harnesses
-tests_%: tests_%.o $(STATICLIB) unity/unity.o
-\t$(CC) $(CFLAGS) $(LDFLAGS) -o $@ $< $(STATICLIB) unity/unity.o"""
+tests_%: tests_%.o $(STATICLIB) unity/unity_timed.o $(ALLOC_OBJ)
+\t$(CC) $(CFLAGS) $(LDFLAGS) $(ALLOC_LDFLAGS) -o $@ $< $(ALLOC_OBJ) $(STATICLIB) unity/unity_timed.o
+
+# Pattern rule for micro-benchmarks
+bench_%: bench_%.o $(STATICLIB) $(ALLOC_OBJ)
+\t$(CC) $(CFLAGS) $(LDFLAGS) $(ALLOC_LDFLAGS) -o $@ $< $(ALLOC_OBJ) $(STATICLIB)"""
 
 # Function to insert text after a matched block
 def insert_after_block(pattern, text, content):